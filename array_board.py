@@ -0,0 +1,331 @@
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from board import ScrabbleBoard
+from enums import Direction, SquareType
+from exceptions import InvalidBoardPositionError, NoTileError, SquareOccupiedError
+from lexicon import Lexicon
+from square import ScrabbleSquare
+from tile import ScrabbleTile, intern_tile
+
+EMPTY = 0
+SQUARE_TYPES = tuple(SquareType)
+SQUARE_TYPE_CODES = {square_type: code for code, square_type in enumerate(SQUARE_TYPES)}
+
+# Cross-check masks have bit n set when letter chr(ord('a') + n) is allowed
+NO_CROSS_WORD = 0xFFFFFFFF
+_MASK_SETS: Dict[int, FrozenSet[str]] = {}
+
+
+def letters_to_mask(letters: Iterable[str]) -> int:
+    mask = 0
+    for letter in letters:
+        mask |= 1 << (ord(letter) - 97)
+    return mask
+
+
+def mask_to_letters(mask: int) -> FrozenSet[str]:
+    letters = _MASK_SETS.get(mask)
+    if letters is None:
+        letters = _MASK_SETS[mask] = frozenset(chr(97 + n) for n in range(26) if mask >> n & 1)
+    return letters
+
+
+class ArraySquare(ScrabbleSquare):
+    """A view of one square of an `ArrayBoard`. Reads and writes go straight to the board's arrays."""
+
+    def __init__(self, board: 'ArrayBoard', row: int, col: int) -> None:
+        self._array_board = board
+        self._row = row
+        self._col = col
+
+    @property
+    def tile(self) -> Optional[ScrabbleTile]:
+        return self._array_board.tile_at(self._row, self._col)
+
+    @tile.setter
+    def tile(self, new_tile: ScrabbleTile) -> None:
+        self._array_board.place_tile(self._row, self._col, new_tile)
+
+    @property
+    def square_type(self) -> SquareType:
+        return self._array_board.square_type_at(self._row, self._col)
+
+    @property
+    def _square_type(self) -> SquareType:
+        return self.square_type
+
+    def remove_tile(self) -> ScrabbleTile:
+        return self._array_board.remove_tile(self._row, self._col)
+
+    def __repr__(self) -> str:
+        return f'ArraySquare({self.square_type}, {self.tile})'
+
+
+class ArrayBoard(ScrabbleBoard):
+    """
+    A Scrabble board kept in flat byte arrays instead of square and tile objects.
+
+    Letters are stored twice, row-major in `letters` and column-major in `columns`,
+    so a scan along either direction reads contiguous memory; `index(row, col)`
+    and `column_index(row, col)` give the offsets. An empty square holds 0.
+    `blanks`, `values` and `premiums` are row-major. Squares and tiles are
+    materialised on access, so the board can stand in for a `ScrabbleBoard`,
+    while copies cost a few hundred bytes. Every write goes through `place_tile`
+    and `remove_tile`, so the text of each row is cached until one changes it.
+    """
+
+    def __init__(self, default_board_layout: List[List[str]], lexicon: Optional[Lexicon] = None):
+        self.rows = len(default_board_layout)
+        self.cols = len(default_board_layout[0])
+        size = self.rows * self.cols
+        self.letters = bytearray(size)
+        self.columns = bytearray(size)
+        self.blanks = bytearray(size)
+        self.values = bytearray(size)
+        self.premiums = bytearray(SQUARE_TYPE_CODES[SquareType(square)] for row in default_board_layout for square in row)
+        self._tiles: Dict[int, ScrabbleTile] = {}
+        self._lexicon = lexicon
+        self._lexicon_source = None
+        self._cross_checks: Optional[Dict[Direction, array]] = None
+        self._cross_sums: Optional[Dict[Direction, array]] = None
+        self._anchors: Optional[Dict[Direction, bytearray]] = None
+        self._row_text: Dict[int, str] = {}
+
+    @classmethod
+    def from_board(cls, board: ScrabbleBoard) -> 'ArrayBoard':
+        """Build an array board holding the same squares and tiles as `board`."""
+        squares = board.board
+        array_board = cls([[square.square_type.value for square in row] for row in squares], board._lexicon)
+        array_board._lexicon_source = board._lexicon_source
+        array_board.board = squares
+        return array_board
+
+    def copy(self) -> 'ArrayBoard':
+        """Return an independent copy sharing only the (immutable) lexicon."""
+        clone = ArrayBoard.__new__(ArrayBoard)
+        clone.rows, clone.cols = self.rows, self.cols
+        clone.letters = self.letters[:]
+        clone.columns = self.columns[:]
+        clone.blanks = self.blanks[:]
+        clone.values = self.values[:]
+        clone.premiums = self.premiums
+        clone._tiles = {}
+        clone._row_text = self._row_text.copy()
+        clone._lexicon = self._lexicon
+        clone._lexicon_source = self._lexicon_source
+        if self._cross_checks is None:
+            clone._cross_checks = clone._cross_sums = clone._anchors = None
+        else:
+            clone._cross_checks = {direction: checks[:] for direction, checks in self._cross_checks.items()}
+            clone._cross_sums = {direction: sums[:] for direction, sums in self._cross_sums.items()}
+            clone._anchors = {direction: anchors[:] for direction, anchors in self._anchors.items()}
+        return clone
+
+    def __copy__(self) -> 'ArrayBoard':
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> 'ArrayBoard':
+        return self.copy()
+
+    def index(self, row: int, col: int) -> int:
+        """Offset of a square in the row-major arrays."""
+        return row * self.cols + col
+
+    def column_index(self, row: int, col: int) -> int:
+        """Offset of a square in the column-major `columns` array."""
+        return col * self.rows + row
+
+    def row_letters(self, row: int) -> memoryview:
+        """The letter codes of one row, left to right, without copying."""
+        return memoryview(self.letters)[row * self.cols:(row + 1) * self.cols]
+
+    def column_letters(self, col: int) -> memoryview:
+        """The letter codes of one column, top to bottom, without copying."""
+        return memoryview(self.columns)[col * self.rows:(col + 1) * self.rows]
+
+    def _check_position(self, row: int, col: int) -> int:
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        raise InvalidBoardPositionError('Row or column out of bounds')
+
+    def get_square(self, row: int, col: int) -> ArraySquare:
+        """Get a view of the square at the specified row and column."""
+        self._check_position(row, col)
+        return ArraySquare(self, row, col)
+
+    def has_tile(self, row: int, col: int) -> bool:
+        """Check whether a tile sits at the specified row and column. Positions off the board hold no tile."""
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.letters[row * self.cols + col] != EMPTY
+
+    def square_type_at(self, row: int, col: int) -> SquareType:
+        return SQUARE_TYPES[self.premiums[self._check_position(row, col)]]
+
+    def tile_at(self, row: int, col: int) -> Optional[ScrabbleTile]:
+        """The tile at row and column, materialised from the arrays on first access, or None."""
+        index = self._check_position(row, col)
+        code = self.letters[index]
+        if code == EMPTY:
+            return None
+        tile = self._tiles.get(index)
+        if tile is None:
+            if self.blanks[index]:
+                tile = ScrabbleTile('#', 0)
+                tile.letter = chr(code)
+            else:
+                tile = intern_tile(chr(code), self.values[index])
+            self._tiles[index] = tile
+        return tile
+
+    def place_tile(self, row: int, col: int, tile: ScrabbleTile) -> None:
+        """Write a tile into the arrays. Raises if the square is already occupied."""
+        index = self._check_position(row, col)
+        if self.letters[index] != EMPTY:
+            raise SquareOccupiedError()
+        code = ord(tile.letter)
+        self.letters[index] = code
+        self.columns[col * self.rows + row] = code
+        self.blanks[index] = tile.value == 0
+        self.values[index] = tile.value
+        self._tiles[index] = tile
+        self._row_text.pop(row, None)
+
+    def remove_tile(self, row: int, col: int) -> ScrabbleTile:
+        """Remove and return the tile at row and column. Cached cross-checks are not refreshed."""
+        tile = self.tile_at(row, col)
+        if tile is None:
+            raise NoTileError()
+        index = row * self.cols + col
+        self.letters[index] = EMPTY
+        self.columns[col * self.rows + row] = EMPTY
+        self.blanks[index] = 0
+        self.values[index] = 0
+        del self._tiles[index]
+        self._row_text.pop(row, None)
+        return tile
+
+    @property
+    def board(self) -> List[List[ArraySquare]]:
+        """Get the board as rows of square views."""
+        return [self[row] for row in range(self.rows)]
+
+    @board.setter
+    def board(self, new_board: List[List[ScrabbleSquare]]) -> None:
+        """Load the squares and tiles of another board's rows."""
+        for array_ in (self.letters, self.columns, self.blanks, self.values):
+            array_[:] = bytes(len(array_))
+        self._tiles = {}
+        self._row_text = {}
+        self.premiums = bytearray(SQUARE_TYPE_CODES[square.square_type] for squares in new_board for square in squares)
+        for row, squares in enumerate(new_board):
+            for col, square in enumerate(squares):
+                if square.tile is not None:
+                    self.place_tile(row, col, square.tile)
+        self._cross_checks = None
+
+    def cross_check(self, row: int, col: int, direction: Direction) -> Optional[FrozenSet[str]]:
+        mask = self.cross_check_mask(row, col, direction)
+        return None if mask == NO_CROSS_WORD else mask_to_letters(mask)
+
+    def cross_check_mask(self, row: int, col: int, direction: Direction) -> int:
+        """Cross-check as a bit mask over 'a'..'z', or NO_CROSS_WORD when no perpendicular word is formed."""
+        self._ensure_cross_checks()
+        return self._cross_checks[direction][row * self.cols + col]
+
+    def cross_sum(self, row: int, col: int, direction: Direction) -> int:
+        self._ensure_cross_checks()
+        return self._cross_sums[direction][row * self.cols + col]
+
+    def is_anchor(self, row: int, col: int, direction: Direction) -> bool:
+        self._ensure_cross_checks()
+        return bool(self._anchors[direction][row * self.cols + col])
+
+    def update_cross_checks(self, positions: Iterable[Tuple[int, int]]) -> None:
+        if self._cross_checks is None:
+            return
+        positions = list(positions)
+        rows = {row for row, _ in positions}
+        cols = {col for _, col in positions}
+        for row in rows:
+            for col in range(self.cols):
+                self._update_square(row, col)
+        for col in cols:
+            for row in range(self.rows):
+                if row not in rows:
+                    self._update_square(row, col)
+
+    def _ensure_cross_checks(self) -> None:
+        if self._cross_checks is not None:
+            return
+        if self.lexicon is None:
+            raise ValueError('No lexicon attached to the board.')
+        size = self.rows * self.cols
+        self._cross_checks = {direction: array('I', [NO_CROSS_WORD]) * size for direction in Direction}
+        self._cross_sums = {direction: array('H', [0]) * size for direction in Direction}
+        self._anchors = {direction: bytearray(size) for direction in Direction}
+        for row in range(self.rows):
+            for col in range(self.cols):
+                self._update_square(row, col)
+
+    def _update_square(self, row: int, col: int) -> None:
+        index = row * self.cols + col
+        if self.letters[index] != EMPTY:
+            for direction in Direction:
+                self._cross_checks[direction][index] = NO_CROSS_WORD
+                self._cross_sums[direction][index] = 0
+                self._anchors[direction][index] = False
+            return
+        start = self.premiums[index] == SQUARE_TYPE_CODES[SquareType.START]
+        # A horizontal play is checked against the column, which is contiguous in `columns`
+        vertical_word = self._run(self.columns, self.rows, col * self.rows, row, col, self.cols)
+        horizontal_word = self._run(self.letters, self.cols, row * self.cols, col, row * self.cols, 1)
+        for direction, (before, after, total), (in_line_before, in_line_after, _) in (
+                (Direction.HORIZONTAL, vertical_word, horizontal_word),
+                (Direction.VERTICAL, horizontal_word, vertical_word)):
+            if before or after:
+                mask = letters_to_mask(self._lexicon.hooks(before, after))
+                adjacent = True
+            else:
+                mask = NO_CROSS_WORD
+                adjacent = start or bool(in_line_before or in_line_after)
+            self._cross_checks[direction][index] = mask
+            self._cross_sums[direction][index] = total
+            self._anchors[direction][index] = adjacent and mask != 0
+
+    def _run(self, line: bytearray, length: int, offset: int, pos: int, value_offset: int, value_step: int) -> Tuple[str, str, int]:
+        """
+        Letters before and after position `pos` of the line starting at `offset` in `line`,
+        and the total value of those tiles (read from `values` at value_offset + i * value_step).
+        """
+        values = self.values
+        start = pos
+        while start > 0 and line[offset + start - 1] != EMPTY:
+            start -= 1
+        end = pos + 1
+        while end < length and line[offset + end] != EMPTY:
+            end += 1
+        before = line[offset + start:offset + pos].decode('latin-1').lower()
+        after = line[offset + pos + 1:offset + end].decode('latin-1').lower()
+        total = sum(values[value_offset + i * value_step] for i in range(start, end) if i != pos)
+        return before, after, total
+
+    def __getitem__(self, index: int) -> List[ArraySquare]:
+        """Allow indexing to retrieve rows of square views."""
+        if not 0 <= index < self.rows:
+            raise IndexError('Row out of bounds')
+        return [ArraySquare(self, index, col) for col in range(self.cols)]
+
+    def __repr__(self):
+        return f'ArrayBoard(rows={self.rows}, cols={self.cols})'
+
+    def __str__(self):
+        headers = '   ' + ' '.join([f'{i:2}' for i in range(self.cols)])
+        border = '   ' + '+--' * self.cols + '+'
+        rows = [self._render_row(i) for i in range(self.rows)]
+        return '\n'.join([headers, border] + [val for pair in zip(rows, [border] * len(rows)) for val in pair])
+
+    def _render_row(self, index: int) -> str:
+        text = self._row_text.get(index)
+        if text is None:
+            text = self._row_text[index] = f'{index:2} |' + '|'.join([str(square) for square in self[index]]) + '|'
+        return text
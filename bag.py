@@ -1,33 +1,98 @@
 import random
+from copy import copy
+from typing import Dict, Optional
 
-from exceptions import EmptyBagError
+from exceptions import EmptyBagError, TileNotInBagError
 from settings_manager import SettingsManager
-from tile import ScrabbleTile
+from tile import TILE_LETTERS, ScrabbleTile, intern_tile
 
 class ScrabbleBag:
     """
     Represents a bag of Scrabble tiles.
     Allows drawing and depositing tiles, shuffling the tiles, and checking the count.
+    Draws come from the bag's own random generator, so a bag created with a seeded
+    `random.Random` always deals the same tiles. Drawing swaps the chosen tile with the
+    last one before popping it, and a count per letter is kept alongside the tiles,
+    so draws, deposits and letter counts are O(1). Counts go by tile code, so a blank
+    counts as '#' whatever letter it was given.
     """
 
-    def __init__(self, settings_manager: SettingsManager):
+    def __init__(self, settings_manager: SettingsManager, rng: Optional[random.Random] = None):
         letter_scores = settings_manager.tile_scoring.letter_scores
         tiles = settings_manager.tile_scoring.tile_distribution
 
-        self._tiles = [ScrabbleTile(letter, letter_scores[letter]) for letter, quantity in tiles.items() for _ in range(quantity)]
-        self._tiles = self._tiles
-        random.shuffle(self._tiles)       
-        # self._tiles = self._tiles[:20] # For testing purposes
+        self._rng = rng or random.Random()
+        self._tiles = [intern_tile(letter, letter_scores[letter]) for letter, quantity in tiles.items() for _ in range(quantity)]
+        self._counts = {letter.upper(): quantity for letter, quantity in tiles.items() if quantity}
+
+    @property
+    def rng(self) -> random.Random:
+        """The random generator tiles are drawn with."""
+        return self._rng
 
     def draw_tile(self) -> ScrabbleTile:
         """Draw a random tile from the bag. Raises an error if the bag is empty."""
-        if not self._tiles:
+        tiles = self._tiles
+        if not tiles:
             raise EmptyBagError('Bag is empty')
-        return self._tiles.pop(random.randint(0, len(self._tiles) - 1))
+        index = self._rng.randrange(len(tiles))
+        tiles[index], tiles[-1] = tiles[-1], tiles[index]
+        tile = tiles.pop()
+        self._counts[TILE_LETTERS[tile.code]] -= 1
+        return tile
+
+    def take_tile(self, letter: str) -> ScrabbleTile:
+        """Take a tile with `letter` ('#' for a blank) out of the bag. Raises an error if the bag holds none."""
+        letter = letter.upper()
+        if not self._counts.get(letter):
+            raise TileNotInBagError(f"No '{letter}' left in the bag")
+        tiles = self._tiles
+        index = next(index for index, tile in enumerate(tiles) if TILE_LETTERS[tile.code] == letter)
+        tiles[index], tiles[-1] = tiles[-1], tiles[index]
+        self._counts[letter] -= 1
+        return tiles.pop()
 
     def deposit_tile(self, tile: ScrabbleTile) -> None:
-        """Deposit a tile back into the bag and shuffle."""
+        """Deposit a tile back into the bag."""
         self._tiles.append(tile)
+        letter = TILE_LETTERS[tile.code]
+        self._counts[letter] = self._counts.get(letter, 0) + 1
+
+    def replace_tiles(self, tiles: list[ScrabbleTile]) -> None:
+        """Make `tiles`, in this order, the contents of the bag."""
+        self._tiles = list(tiles)
+        self._counts = {}
+        for tile in self._tiles:
+            letter = TILE_LETTERS[tile.code]
+            self._counts[letter] = self._counts.get(letter, 0) + 1
+
+    def shuffle(self) -> None:
+        """Shuffle the tiles with the bag's generator. Draws are random either way."""
+        self._rng.shuffle(self._tiles)
+
+    def count(self, letter: str) -> int:
+        """Number of tiles with `letter` ('#' for blanks) in the bag."""
+        return self._counts.get(letter.upper(), 0)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Get a copy of the number of tiles per letter in the bag, blanks counted under '#'."""
+        return {letter: count for letter, count in self._counts.items() if count}
+
+    def clone(self, rng: Optional[random.Random] = None) -> 'ScrabbleBag':
+        """
+        Copy the bag for a rollout. The copy has blanks of its own (other tiles never change and
+        are shared), and draws with `rng`, or with a copy of this bag's generator (so both deal
+        the same tiles) when omitted.
+        """
+        clone = ScrabbleBag.__new__(ScrabbleBag)
+        clone._tiles = [copy(tile) for tile in self._tiles]
+        clone._counts = self._counts.copy()
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self._rng.getstate())
+        clone._rng = rng
+        return clone
 
     @property
     def tiles(self) -> list[ScrabbleTile]:
@@ -36,4 +101,4 @@ class ScrabbleBag:
 
     def __len__(self) -> int:
         """Return the number of tiles in the bag."""
-        return len(self._tiles)
\ No newline at end of file
+        return len(self._tiles)
@@ -0,0 +1,154 @@
+from typing import Iterable, List, NamedTuple
+
+import numpy as np
+
+from board import ScrabbleBoard
+from enums import Direction
+from settings_manager import SettingsManager
+from tile import TILE_LETTERS
+
+HORIZONTAL = 0
+VERTICAL = 1
+
+
+class BoardArrays(NamedTuple):
+    """
+    The parts of a position batch scoring needs, as (rows, cols) grids.
+    Index 0 of `cross_sums` and `has_cross_word` is for horizontal plays, index 1 for vertical ones.
+    """
+    values: np.ndarray
+    occupied: np.ndarray
+    cross_sums: np.ndarray
+    has_cross_word: np.ndarray
+
+
+class Candidates(NamedTuple):
+    """
+    A batch of N candidate plays, each placing up to K tiles. Unused tile slots hold -1 in
+    `rows` and `cols`. `values` are the face values of the placed tiles (0 for blanks) and
+    `start_row`, `start_col`, `length` and `direction` describe each main word.
+    """
+    rows: np.ndarray
+    cols: np.ndarray
+    values: np.ndarray
+    start_row: np.ndarray
+    start_col: np.ndarray
+    length: np.ndarray
+    direction: np.ndarray
+
+
+class BatchScores(NamedTuple):
+    """Scores of a batch of candidates, one entry per candidate."""
+    main: np.ndarray
+    cross: np.ndarray
+    bingo: np.ndarray
+    total: np.ndarray
+
+
+class BatchScorer:
+    """
+    Scores thousands of candidate plays at once with NumPy. Letter and word
+    multiplier grids are built once from the board layout; per position, the
+    tile values and the board's cross-sums are read into arrays once.
+    """
+
+    def __init__(self, settings_manager: SettingsManager) -> None:
+        rules = settings_manager.ruleset
+        self.letter_multipliers = np.array(rules.letter_multipliers, dtype=np.int32)
+        self.word_multipliers = np.array(rules.word_multipliers, dtype=np.int32)
+        self.letter_scores = dict(zip(TILE_LETTERS, rules.letter_scores))
+        self.rack_size = rules.max_rack_size
+        self.bingo_bonus = rules.bingo_bonus
+
+    def board_arrays(self, board: ScrabbleBoard) -> BoardArrays:
+        """Read the tile values and cross-sums of a position."""
+        rows, cols = self.letter_multipliers.shape
+        values = np.zeros((rows, cols), dtype=np.int32)
+        occupied = np.zeros((rows, cols), dtype=bool)
+        cross_sums = np.zeros((2, rows, cols), dtype=np.int32)
+        has_cross_word = np.zeros((2, rows, cols), dtype=bool)
+        for row in range(rows):
+            for col in range(cols):
+                if board.has_tile(row, col):
+                    values[row, col] = board.get_square(row, col).tile.value
+                    occupied[row, col] = True
+                    continue
+                for index, direction in ((HORIZONTAL, Direction.HORIZONTAL), (VERTICAL, Direction.VERTICAL)):
+                    if board.cross_check(row, col, direction) is not None:
+                        has_cross_word[index, row, col] = True
+                        cross_sums[index, row, col] = board.cross_sum(row, col, direction)
+        return BoardArrays(values, occupied, cross_sums, has_cross_word)
+
+    def encode(self, placements: Iterable, position: BoardArrays) -> Candidates:
+        """Encode move generator `Placement`s (or anything with the same fields) as a candidate batch."""
+        placements = list(placements)
+        width = max([self.rack_size] + [len(placement.tiles) for placement in placements])
+        count = len(placements)
+        rows = np.full((count, width), -1, dtype=np.int32)
+        cols = np.full((count, width), -1, dtype=np.int32)
+        values = np.zeros((count, width), dtype=np.int32)
+        start_row = np.empty(count, dtype=np.int32)
+        start_col = np.empty(count, dtype=np.int32)
+        length = np.empty(count, dtype=np.int32)
+        direction = np.empty(count, dtype=np.int8)
+        occupied = position.occupied
+        for n, placement in enumerate(placements):
+            vertical = placement.direction == Direction.VERTICAL
+            start_row[n], start_col[n], length[n] = placement.row, placement.col, len(placement.word)
+            direction[n] = VERTICAL if vertical else HORIZONTAL
+            slot = 0
+            for index, letter in enumerate(placement.word):
+                row = placement.row + index * vertical
+                col = placement.col + index * (not vertical)
+                if occupied[row, col]:
+                    continue
+                rows[n, slot], cols[n, slot] = row, col
+                values[n, slot] = 0 if index in placement.blanks else self.letter_scores.get(letter.upper(), 0)
+                slot += 1
+        return Candidates(rows, cols, values, start_row, start_col, length, direction)
+
+    def score(self, candidates: Candidates, position: BoardArrays) -> BatchScores:
+        """Score every candidate: main word, cross-words and bingo bonus."""
+        used = candidates.rows >= 0
+        rows = np.where(used, candidates.rows, 0)
+        cols = np.where(used, candidates.cols, 0)
+        letter_multipliers = np.where(used, self.letter_multipliers[rows, cols], 0)
+        word_multipliers = np.where(used, self.word_multipliers[rows, cols], 1)
+        tile_scores = candidates.values * letter_multipliers
+
+        existing = self._existing_sums(candidates, position.values)
+        main = (tile_scores.sum(axis=1) + existing) * word_multipliers.prod(axis=1)
+
+        direction = candidates.direction[:, None].astype(np.intp)
+        has_cross_word = used & position.has_cross_word[direction, rows, cols]
+        cross_sums = position.cross_sums[direction, rows, cols]
+        cross = np.where(has_cross_word, (cross_sums + tile_scores) * word_multipliers, 0).sum(axis=1)
+
+        bingo = np.where(used.sum(axis=1) == self.rack_size, self.bingo_bonus, 0)
+        return BatchScores(main, cross, bingo, main + cross + bingo)
+
+    @staticmethod
+    def _existing_sums(candidates: Candidates, values: np.ndarray) -> np.ndarray:
+        """Sum of the values of tiles already on the board inside each main word, via prefix sums."""
+        rows, cols = values.shape
+        by_row = np.zeros((rows, cols + 1), dtype=np.int32)
+        by_row[:, 1:] = np.cumsum(values, axis=1)
+        by_col = np.zeros((cols, rows + 1), dtype=np.int32)
+        by_col[:, 1:] = np.cumsum(values.T, axis=1)
+
+        start_row, start_col, length = candidates.start_row, candidates.start_col, candidates.length
+        vertical = candidates.direction == VERTICAL
+        line = np.where(vertical, start_col, start_row)
+        start = np.where(vertical, start_row, start_col)
+        horizontal_sums = by_row[np.where(vertical, 0, line), np.where(vertical, 0, start + length)] - \
+            by_row[np.where(vertical, 0, line), np.where(vertical, 0, start)]
+        vertical_sums = by_col[np.where(vertical, line, 0), np.where(vertical, start + length, 0)] - \
+            by_col[np.where(vertical, line, 0), np.where(vertical, start, 0)]
+        return np.where(vertical, vertical_sums, horizontal_sums)
+
+
+def score_placements(placements: List, board: ScrabbleBoard, settings_manager: SettingsManager) -> BatchScores:
+    """Score a list of move generator placements on `board` in one batch."""
+    scorer = BatchScorer(settings_manager)
+    position = scorer.board_arrays(board)
+    return scorer.score(scorer.encode(placements, position), position)
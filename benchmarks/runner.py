@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import Dict, List, NamedTuple, Optional
+
+from benchmarks.suite import BENCHMARKS, BENCHMARK_DIR, Context, record_positions
+
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+
+class Regression(NamedTuple):
+    """A benchmark that got slower than the baseline allows."""
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def run_benchmarks(context: Context, names: Optional[List[str]] = None) -> dict:
+    """Run the selected benchmarks (all by default) and return the results: best seconds per operation for each."""
+    results = {}
+    for bench in BENCHMARKS:
+        if names and bench.name not in names:
+            continue
+        op = bench.setup(context)
+        op()  # Warm caches before timing
+        best = min(timeit.Timer(op).repeat(bench.repeat, bench.number)) / bench.number
+        results[bench.name] = {
+            'seconds': best,
+            'ops_per_second': 1 / best if best else float('inf'),
+            'number': bench.number,
+            'repeat': bench.repeat,
+        }
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Benchmarks more than `threshold` (a fraction) slower than in `baseline`. Benchmarks missing on either side are skipped."""
+    regressions = []
+    for name, result in results['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        if result['seconds'] > reference['seconds'] * (1 + threshold):
+            regressions.append(Regression(name, reference['seconds'], result['seconds']))
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f'{seconds:.2f}s'
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.2f}ms'
+    return f'{seconds * 1e6:.2f}us'
+
+
+def _report(results: dict, baseline: Optional[dict]) -> None:
+    reference: Dict[str, dict] = baseline['results'] if baseline else {}
+    for name, result in results['results'].items():
+        line = f'{name:28} {_format_seconds(result["seconds"]):>10}  {result["ops_per_second"]:>12,.1f}/s'
+        if name in reference:
+            change = result['seconds'] / reference[name]['seconds'] - 1
+            line += f'  {change:+.1%} vs baseline'
+        print(line)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the engine hot paths')
+    parser.add_argument('names', nargs='*', help='benchmarks to run (all by default)')
+    parser.add_argument('--lexicon', default='enable.txt', help='word list, one word per line')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='slowdown, as a fraction, that counts as a regression')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--record-positions', action='store_true', help='re-record the benchmark board positions')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(bench.name)
+        return
+    if args.record_positions:
+        from packed_lexicon import load_lexicon
+        record_positions(load_lexicon(args.lexicon))
+
+    results = run_benchmarks(Context(args.lexicon), args.names)
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    _report(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+            f.write('\n')
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+            f.write('\n')
+        print(f'Saved baseline to {args.baseline}')
+    elif baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression.name}: {_format_seconds(regression.baseline)} -> '
+                  f'{_format_seconds(regression.current)} ({regression.slowdown:+.1%})')
+        if regressions:
+            sys.exit(1)
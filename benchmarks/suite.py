@@ -0,0 +1,236 @@
+import json
+import os
+import random
+from itertools import cycle
+from typing import Callable, Dict, List, NamedTuple
+
+from board import ScrabbleBoard
+from bag import ScrabbleBag
+from enums import Direction
+from game import Game
+from lexicon import Lexicon
+from move import Move
+from move_generator import MoveGenerator
+from packed_lexicon import PackedLexicon, load_lexicon
+from settings_manager import SettingsManager
+from simulate import play_game
+from tile import ScrabbleTile, intern_tile
+from word import Word
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+POSITIONS_PATH = os.path.join(BENCHMARK_DIR, 'positions.json')
+SEED = 20240601
+
+
+class Context:
+    """What the benchmarks share: the word list path and the lexicon loaded from it."""
+
+    def __init__(self, lexicon_path: str) -> None:
+        self.lexicon_path = lexicon_path
+        self.lexicon: Lexicon = load_lexicon(lexicon_path)
+        with open(POSITIONS_PATH) as f:
+            self.positions: Dict[str, dict] = json.load(f)
+
+
+class Benchmark(NamedTuple):
+    """
+    A timed operation. `setup` prepares everything outside the timing and returns the
+    operation, which is called `number` times per repeat; the best repeat counts.
+    """
+    name: str
+    setup: Callable[[Context], Callable[[], None]]
+    number: int
+    repeat: int = 5
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, number: int, repeat: int = 5):
+    def register(setup: Callable[[Context], Callable[[], None]]):
+        BENCHMARKS.append(Benchmark(name, setup, number, repeat))
+        return setup
+    return register
+
+
+def build_position(context: Context, position: dict):
+    """
+    A game set up on a recorded position: its tiles on the board and its rack for the player to move.
+    Boards are recorded one string per row, '.' for empty squares and lower case for blanks.
+    """
+    settings_manager = SettingsManager(context.lexicon)
+    board = ScrabbleBoard(settings_manager.board_settings.default_board_layout, context.lexicon)
+    letter_scores = settings_manager.tile_scoring.letter_scores
+    for row, letters in enumerate(position['board']):
+        for col, letter in enumerate(letters):
+            if letter == '.':
+                continue
+            if letter.islower():
+                tile = ScrabbleTile('#', 0)
+                tile.letter = letter.upper()
+            else:
+                tile = intern_tile(letter, letter_scores[letter])
+            board.get_square(row, col).tile = tile
+    game = Game(context.lexicon, board=board, rng=random.Random(SEED))
+    player = game.current_player
+    player.rack.replace_tiles([intern_tile(letter, letter_scores[letter]) for letter in position['rack']])
+    return game, player
+
+
+def position_move(position: dict, player) -> Move:
+    move = position['move']
+    return Move(move['row'], move['col'], move['word'], Direction(move['direction']), player, move['blanks'])
+
+
+@benchmark('lexicon_build', number=1, repeat=1)
+def lexicon_build(context: Context):
+    def op():
+        Lexicon.from_file(context.lexicon_path)
+    return op
+
+
+@benchmark('lexicon_open', number=1, repeat=3)
+def lexicon_open(context: Context):
+    # The context compiled the word list next to it when it loaded the lexicon
+    compiled = os.path.splitext(context.lexicon_path)[0] + '.lex'
+
+    def op():
+        PackedLexicon.open(compiled).close()
+    return op
+
+
+@benchmark('is_valid_word', number=20000)
+def is_valid_word(context: Context):
+    rng = random.Random(SEED)
+    with open(context.lexicon_path) as f:
+        words = rng.sample(f.read().split(), 500)
+    probes = words + [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(len(word))) for word in words]
+    settings_manager = SettingsManager(context.lexicon)
+    probes = cycle(probes)
+
+    def op():
+        settings_manager.is_valid_word(next(probes))
+    return op
+
+
+@benchmark('bag_draw_all', number=200)
+def bag_draw_all(context: Context):
+    bag = ScrabbleBag(SettingsManager(context.lexicon), random.Random(SEED))
+
+    def op():
+        rollout = bag.clone()
+        while len(rollout):
+            rollout.draw_tile()
+    return op
+
+
+def _validate(name: str):
+    def setup(context: Context):
+        position = context.positions[name]
+        game, player = build_position(context, position)
+
+        def op():
+            position_move(position, player).validate_move(game.board, game.settings_manager)
+        return op
+    return setup
+
+
+def _apply(name: str):
+    def setup(context: Context):
+        position = context.positions[name]
+        game, player = build_position(context, position)
+        rack = list(player.rack.tiles)
+        result = position_move(position, player).evaluate(game.board, game.settings_manager)
+
+        def op():
+            move = position_move(position, player)
+            move.apply_move(game.board, game.settings_manager, result)
+            move.undo(game.board)
+            player.rack.replace_tiles(rack)
+        return op
+    return setup
+
+
+for _name in ('empty', 'mid', 'dense'):
+    benchmark(f'validate_move_{_name}', number=500)(_validate(_name))
+    benchmark(f'apply_undo_move_{_name}', number=500)(_apply(_name))
+
+
+@benchmark('word_calculate_score', number=5000)
+def word_calculate_score(context: Context):
+    position = context.positions['dense']
+    game, _ = build_position(context, position)
+    row, col, direction = position['word']
+    word = Word(row, col, Direction(direction), game.board, game.settings_manager)
+
+    def op():
+        word.calculate_score(game.board)
+    return op
+
+
+@benchmark('move_generation_mid', number=20)
+def move_generation(context: Context):
+    position = context.positions['mid']
+    game, player = build_position(context, position)
+    generator = MoveGenerator(game.settings_manager)
+
+    def op():
+        for _ in generator.generate(game.board, player.rack):
+            pass
+    return op
+
+
+@benchmark('headless_game', number=1, repeat=3)
+def headless_game(context: Context):
+    def op():
+        play_game(context.lexicon, ['greedy', 'greedy'], SEED)
+    return op
+
+
+def record_positions(lexicon: Lexicon, path: str = POSITIONS_PATH, seed: int = SEED) -> None:
+    """
+    Record the benchmark positions from a greedy self-play game: the empty board, the board after
+    eight turns and the board once the bag runs out, each with the rack and best play of the player to move.
+    """
+    game = Game(lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    positions = {}
+    turn = 0
+    while not game.is_over and 'dense' not in positions:
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if not placements:
+            game.pass_turn()
+            continue
+        best = max(placements, key=lambda placement: placement.score)
+        name = 'empty' if turn == 0 else 'mid' if turn == 8 else 'dense' if not len(game.bag) else None
+        if name is not None:
+            positions[name] = _snapshot(game, best)
+        game.make(Move.from_placement(best, game.current_player))
+        turn += 1
+    with open(path, 'w') as f:
+        json.dump(positions, f, indent=1)
+        f.write('\n')
+
+
+def _snapshot(game: Game, best) -> dict:
+    """A position as stored in positions.json. `word` locates the first word on the board, for word scoring."""
+    rows = []
+    word = None
+    for row, squares in enumerate(game.board.board):
+        letters = []
+        for col, square in enumerate(squares):
+            tile = square.tile
+            if tile is None:
+                letters.append('.')
+                continue
+            letters.append(tile.letter.lower() if tile.value == 0 else tile.letter.upper())
+            if word is None:
+                word = [row, col, (Direction.HORIZONTAL if game.board.has_tile(row, col + 1) else Direction.VERTICAL).value]
+        rows.append(''.join(letters))
+    return {
+        'board': rows,
+        'word': word,
+        'rack': ''.join(tile.letter for tile in game.current_player.rack),
+        'move': {'row': best.row, 'col': best.col, 'word': best.word, 'direction': best.direction.value,
+                 'blanks': list(best.blanks)},
+    }
@@ -1,23 +1,36 @@
-from typing import List
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from enums import SquareType
+from enums import Direction, SquareType
 from exceptions import InvalidBoardPositionError
+from lexicon import Lexicon
 from square import ScrabbleSquare
 
 class ScrabbleBoard:
     """
     Represents a Scrabble game board.
     Allows retrieving and validating squares based on row and column.
+    Once a lexicon is attached, the board also keeps, for every empty square and
+    play direction, the cross-check (letters allowed by the perpendicular word),
+    the cross-sum (value of the perpendicular tiles) and whether it is an anchor.
     """
 
-    def __init__(self, default_board_layout: List[List[str]]):
+    def __init__(self, default_board_layout: List[List[str]], lexicon: Optional[Lexicon] = None):
         self._board = [[ScrabbleSquare(SquareType(square)) for square in row] for row in default_board_layout]
+        self._lexicon = lexicon
+        self._lexicon_source: Optional[Callable[[], Lexicon]] = None
+        self._cross_checks: Optional[Dict[Direction, List[List[Optional[FrozenSet[str]]]]]] = None
+        self._cross_sums: Optional[Dict[Direction, List[List[int]]]] = None
+        self._anchors: Optional[Dict[Direction, List[List[bool]]]] = None
 
     def get_square(self, row: int, col: int) -> ScrabbleSquare:
         """Get the square at the specified row and column."""
         if 0 <= row < len(self._board) and 0 <= col < len(self._board[0]):
             return self._board[row][col]
         raise InvalidBoardPositionError('Row or column out of bounds')
+
+    def has_tile(self, row: int, col: int) -> bool:
+        """Check whether a tile sits at the specified row and column. Positions off the board hold no tile."""
+        return 0 <= row < len(self._board) and 0 <= col < len(self._board[0]) and self._board[row][col].tile is not None
     
     @property
     def board(self) -> List[List[ScrabbleSquare]]:
@@ -28,6 +41,122 @@ class ScrabbleBoard:
     def board(self, new_board: List[List[ScrabbleSquare]]) -> None:
         """Set the board to a new board."""
         self._board = new_board
+        self._cross_checks = None
+
+    @property
+    def lexicon(self) -> Optional[Lexicon]:
+        """The lexicon cross-checks are computed with, taken from the source given to `attach_lexicon_later` on first use."""
+        if self._lexicon is None and self._lexicon_source is not None:
+            self._lexicon = self._lexicon_source()
+            self._lexicon_source = None
+        return self._lexicon
+
+    @lexicon.setter
+    def lexicon(self, lexicon: Optional[Lexicon]) -> None:
+        self._lexicon = lexicon
+        self._lexicon_source = None
+        self._cross_checks = None
+
+    def attach_lexicon_later(self, source: Callable[[], Lexicon]) -> None:
+        """
+        Unless a lexicon is attached already, attach the one `source` returns when it is first needed,
+        so the board can be set up while the lexicon is still being built or loaded.
+        """
+        if self._lexicon is None and self._lexicon_source is None:
+            self._lexicon_source = source
+            self._cross_checks = None
+
+    def cross_check(self, row: int, col: int, direction: Direction) -> Optional[FrozenSet[str]]:
+        """
+        Letters (lower case) that a play in `direction` may put on the empty square at row and column
+        without forming an invalid perpendicular word. None when no perpendicular word would be formed.
+        """
+        self._ensure_cross_checks()
+        return self._cross_checks[direction][row][col]
+
+    def cross_sum(self, row: int, col: int, direction: Direction) -> int:
+        """Total value of the tiles in the perpendicular word a play in `direction` would extend at row and column."""
+        self._ensure_cross_checks()
+        return self._cross_sums[direction][row][col]
+
+    def is_anchor(self, row: int, col: int, direction: Direction) -> bool:
+        """Whether a play in `direction` can start growing from the empty square at row and column."""
+        self._ensure_cross_checks()
+        return self._anchors[direction][row][col]
+
+    def update_cross_checks(self, positions: Iterable[Tuple[int, int]]) -> None:
+        """
+        Refresh the cached cross-checks after tiles were placed on or lifted from `positions`. A square's
+        entry depends only on the runs of tiles next to it, so besides the squares themselves only the
+        first empty square past the run of tiles in each of the four directions from them can change.
+        """
+        if self._cross_checks is None:
+            return
+        rows, cols = len(self._board), len(self._board[0])
+        stale = set()
+        for row, col in positions:
+            stale.add((row, col))
+            for step_r, step_c in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                r, c = row + step_r, col + step_c
+                while self.has_tile(r, c):
+                    r += step_r
+                    c += step_c
+                if 0 <= r < rows and 0 <= c < cols:
+                    stale.add((r, c))
+        for row, col in stale:
+            self._update_square(row, col)
+
+    def _ensure_cross_checks(self) -> None:
+        if self._cross_checks is not None:
+            return
+        if self.lexicon is None:
+            raise ValueError('No lexicon attached to the board.')
+        rows, cols = len(self._board), len(self._board[0])
+        self._cross_checks = {direction: [[None] * cols for _ in range(rows)] for direction in Direction}
+        self._cross_sums = {direction: [[0] * cols for _ in range(rows)] for direction in Direction}
+        self._anchors = {direction: [[False] * cols for _ in range(rows)] for direction in Direction}
+        for row in range(rows):
+            for col in range(cols):
+                self._update_square(row, col)
+
+    def _update_square(self, row: int, col: int) -> None:
+        square = self._board[row][col]
+        occupied = square.tile is not None
+        start = square.square_type == SquareType.START
+        for direction in Direction:
+            if occupied:
+                self._cross_checks[direction][row][col] = None
+                self._cross_sums[direction][row][col] = 0
+                self._anchors[direction][row][col] = False
+                continue
+            step_r, step_c = (1, 0) if direction == Direction.HORIZONTAL else (0, 1)
+            before, before_sum = self._collect(row, col, -step_r, -step_c)
+            after, after_sum = self._collect(row, col, step_r, step_c)
+            if before or after:
+                checks = frozenset(self._lexicon.hooks(before, after))
+                adjacent = True
+            else:
+                checks = None
+                adjacent = start or self.has_tile(row + step_c, col + step_r) or self.has_tile(row - step_c, col - step_r)
+            self._cross_checks[direction][row][col] = checks
+            self._cross_sums[direction][row][col] = before_sum + after_sum
+            self._anchors[direction][row][col] = adjacent and (checks is None or bool(checks))
+
+    def _collect(self, row: int, col: int, step_r: int, step_c: int) -> Tuple[str, int]:
+        """Letters (in reading order) and total value of the run of tiles next to row and column in one direction."""
+        letters = []
+        total = 0
+        row += step_r
+        col += step_c
+        while self.has_tile(row, col):
+            tile = self._board[row][col].tile
+            letters.append(tile.letter.lower())
+            total += tile.value
+            row += step_r
+            col += step_c
+        if step_r < 0 or step_c < 0:
+            letters.reverse()
+        return ''.join(letters), total
         
     def __repr__(self):
         return f'ScrabbleBoard(rows={len(self._board)}, cols={len(self._board[0])})'
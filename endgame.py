@@ -0,0 +1,292 @@
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from game import Game
+from move import Move
+from move_generator import LineCache, MoveGenerator, Placement
+from tile import TILE_LETTERS
+
+EXACT, LOWER, UPPER = 0, 1, 2
+COMPLETE_DEPTH = 1 << 16  # Depth stored for results that saw every line through to the end of the game
+INFINITY = 1 << 30
+MOVE_CACHE_SIZE = 1 << 14  # Positions whose generated plays a search keeps for its later iterations
+LINE_CACHE_SIZE = 1 << 16  # Board lines whose plays a search keeps; the cache starts over when full
+
+
+class EndgameResult(NamedTuple):
+    """
+    Outcome of an endgame search. `spread` is the final spread for the player to move
+    under best play by both sides, `moves` the principal variation (None for a pass).
+    `complete` tells whether every line was searched to the end of the game.
+    """
+    spread: int
+    moves: Tuple[Optional[Placement], ...]
+    depth: int
+    complete: bool
+    nodes: int
+    seconds: float
+
+
+class _Entry(NamedTuple):
+    key: int
+    depth: int
+    value: int
+    bound: int
+    move: Optional[Placement]
+    age: int
+
+
+class TranspositionTable:
+    """
+    A fixed number of slots indexed by the low bits of the position hash. A slot is
+    replaced by a result from a newer search or by one searched at least as deep.
+    """
+
+    def __init__(self, size_bits: int = 18) -> None:
+        self._mask = (1 << size_bits) - 1
+        self._slots: List[Optional[_Entry]] = [None] * (1 << size_bits)
+        self._age = 0
+
+    def new_search(self) -> None:
+        """Mark existing entries as stale so they give way to the next search's results."""
+        self._age += 1
+
+    def probe(self, key: int) -> Optional[_Entry]:
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: int, bound: int, move: Optional[Placement]) -> None:
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is None or entry.key == key or entry.age != self._age or depth >= entry.depth:
+            self._slots[index] = _Entry(key, depth, value, bound, move, self._age)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class _Timeout(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    Solves two-player positions with an empty bag, where both racks are known. Negamax
+    with alpha-beta pruning over every generated play and the pass, playing them on the
+    game itself with `Game.make` and `Game.unmake`. Results are cached in a
+    transposition table keyed by the game's Zobrist hash, and the search deepens iteratively
+    until it has seen every line through or runs out of time. Plays are tried best first
+    (see `_moves`), and the plays of each position and each board line are generated once
+    per search, so the cutoffs come early and the deeper iterations mostly reuse work.
+
+    With a time limit, the clock is checked at every node; an iteration still running when
+    it expires is abandoned, so `solve` can overrun the limit by about one move generation.
+    The result is then the deepest finished iteration, marked incomplete, and its spread only
+    looks that many turns ahead. When not even the first iteration finished, it is the highest
+    scoring play. Endgames where both racks are nearly empty are usually solved exhaustively
+    within a second; full racks with many plays rarely are within seconds.
+
+    Values are the points the player to move gains on the opponent from the current
+    position on, including the end-of-game rack penalties, so transpositions reached
+    with different scores share their entries.
+    """
+
+    def __init__(self, game: Game, table: Optional[TranspositionTable] = None,
+                 generator: Optional[MoveGenerator] = None) -> None:
+        self.game = game
+        self.table = table or TranspositionTable()
+        self.generator = generator or MoveGenerator(game.settings_manager)
+        rules = game.settings_manager.ruleset
+        self._letter_scores = dict(zip(TILE_LETTERS, rules.letter_scores))
+        self._zero_turn_limit = rules.zero_score_turns_before_game_end
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._cut = False
+        self._move_cache: Dict[int, List[Placement]] = {}
+        self._line_cache: LineCache = {}
+
+    def solve(self, time_limit: Optional[float] = None, max_depth: Optional[int] = None) -> EndgameResult:
+        """Search the current position, deepening until the result is exact, `max_depth` is reached or time runs out.
+
+        :param time_limit: Seconds the search may take. None searches without a limit. See the class
+                           for what is returned when it runs out.
+        :param max_depth: Deepest iteration, in turns. None deepens until every line reaches the end of the game.
+
+        :raises: ValueError if the bag still holds tiles or the game does not have two players.
+
+        :return: The EndgameResult of the deepest completed iteration."""
+        game = self.game
+        if len(game.bag):
+            raise ValueError('The bag still holds tiles.')
+        if len(game.players) != 2:
+            raise ValueError('Endgames are solved for two players.')
+        start = time.perf_counter()
+        self._deadline = None if time_limit is None else start + time_limit
+        self.nodes = 0
+        self.table.new_search()
+        self._move_cache = {}
+        self._line_cache = {}
+        key = game.position_hash
+        spread = game.current_player.score - self._opponent().score
+
+        best = None
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            depth += 1
+            self._cut = False
+            try:
+                value = self._search(depth, -INFINITY, INFINITY, key)
+            except _Timeout:
+                break
+            complete = not self._cut
+            best = EndgameResult(spread + value, self._principal_variation(key, depth), depth, complete,
+                                 self.nodes, time.perf_counter() - start)
+            if complete:
+                break
+        if best is None:
+            move = max(self.generator.generate(game.board, game.current_player.rack),
+                       key=lambda placement: placement.score, default=None)
+            best = EndgameResult(spread + (move.score if move else 0), (move,), 0, False,
+                                 self.nodes, time.perf_counter() - start)
+        self._move_cache = {}
+        self._line_cache = {}
+        return best._replace(nodes=self.nodes, seconds=time.perf_counter() - start)
+
+    def _opponent(self):
+        players = self.game.players
+        return players[1] if players[0] is self.game.current_player else players[0]
+
+    def _rack_spread(self) -> int:
+        """Points the player to move gains on the opponent from the rack penalties if the game ended now."""
+        return sum(tile.value for tile in self._opponent().rack) - sum(tile.value for tile in self.game.current_player.rack)
+
+    def _moves(self, key: int, entry: Optional[_Entry]) -> List[Optional[Placement]]:
+        """
+        Plays for the player to move, best first: the best play stored in `entry`, then by score plus the value
+        of the tiles played (what the play gains at the horizon), plays going out first among equals,
+        and the pass last. Every iteration revisits the positions of the one before, so the sorted
+        plays of a position are generated once per search.
+        """
+        placements = self._move_cache.get(key)
+        if placements is None:
+            game = self.game
+            rack_size = len(game.current_player.rack)
+            letter_scores = self._letter_scores
+            if len(self._line_cache) > LINE_CACHE_SIZE:
+                self._line_cache.clear()
+            placements = sorted(
+                self.generator.generate(game.board, game.current_player.rack, self._line_cache),
+                key=lambda placement: (-placement.score - sum(letter_scores.get(letter, 0) for letter in placement.tiles),
+                                       len(placement.tiles) != rack_size))
+            if len(self._move_cache) < MOVE_CACHE_SIZE:
+                self._move_cache[key] = placements
+        moves: List[Optional[Placement]] = [*placements, None]
+        if entry is not None and entry.move != moves[0]:
+            try:
+                moves.remove(entry.move)
+            except ValueError:
+                pass
+            else:
+                moves.insert(0, entry.move)
+        return moves
+
+    def _play(self, placement: Optional[Placement]) -> Tuple[int, int]:
+        """Play a move on the game and return its score and the new position's hash."""
+        game = self.game
+        move = None if placement is None else Move.from_placement(placement, game.current_player)
+        result = game.make(move)
+        return (0 if result is None else result.score), game.position_hash
+
+    def _last_turn_value(self, placement: Optional[Placement]) -> int:
+        """
+        Value of a play at the search horizon, without playing it: its score plus the rack spread
+        afterwards, which is also the exact value when the play ends the game.
+        """
+        game = self.game
+        rack = game.current_player.rack
+        own = sum(tile.value for tile in rack)
+        opponent = sum(tile.value for tile in self._opponent().rack)
+        if placement is None:
+            if game.zero_score_streak + 1 < self._zero_turn_limit:
+                self._cut = True
+            return opponent - own
+        if len(placement.tiles) < len(rack) and (placement.score or game.zero_score_streak + 1 < self._zero_turn_limit):
+            self._cut = True
+        played = sum(self._letter_scores.get(letter, 0) for letter in placement.tiles)
+        return placement.score + opponent - (own - played)
+
+    def _search(self, depth: int, alpha: int, beta: int, key: int) -> int:
+        self.nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _Timeout
+        game = self.game
+        if game.is_over:
+            return self._rack_spread()
+
+        entry = self.table.probe(key)
+        if entry is not None and entry.depth >= depth:
+            if entry.depth < COMPLETE_DEPTH:
+                self._cut = True
+            if entry.bound == EXACT:
+                return entry.value
+            if entry.bound == LOWER and entry.value >= beta:
+                return entry.value
+            if entry.bound == UPPER and entry.value <= alpha:
+                return entry.value
+        if depth == 0:
+            self._cut = True
+            return self._rack_spread()
+
+        outer_cut, self._cut = self._cut, False
+        original_alpha = alpha
+        best_value = -INFINITY
+        best_move = None
+        for placement in self._moves(key, entry):
+            if depth == 1:
+                value = self._last_turn_value(placement)
+            else:
+                score, child_key = self._play(placement)
+                try:
+                    value = score - self._search(depth - 1, score - beta, score - alpha, child_key)
+                finally:
+                    game.unmake()
+            if value > best_value:
+                best_value, best_move = value, placement
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, depth if self._cut else COMPLETE_DEPTH, best_value, bound, best_move)
+        self._cut = outer_cut or self._cut
+        return best_value
+
+    def _principal_variation(self, key: int, depth: int) -> Tuple[Optional[Placement], ...]:
+        """Follow the best plays stored in the table from the root, for at most `depth` turns."""
+        moves = []
+        played = 0
+        try:
+            while played < depth and not self.game.is_over:
+                entry = self.table.probe(key)
+                if entry is None:
+                    break
+                moves.append(entry.move)
+                _, key = self._play(entry.move)
+                played += 1
+        finally:
+            for _ in range(played):
+                self.game.unmake()
+        return tuple(moves)
+
+
+def solve_endgame(game: Game, time_limit: Optional[float] = None, max_depth: Optional[int] = None) -> EndgameResult:
+    """Solve the endgame of `game` for the player to move."""
+    return EndgameSolver(game).solve(time_limit, max_depth)
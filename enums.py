@@ -12,6 +12,14 @@ class Direction(Enum):
                 else Direction.VERTICAL if self == Direction.HORIZONTAL 
                 else None)
 
+class EventType(Enum):
+    """The kinds of entries in a game's history."""
+    MOVE = 'move'
+    EXCHANGE = 'exchange'
+    PASS = 'pass'
+    RESIGN = 'resign'
+    PENALTY = 'penalty'
+
 class SquareType(Enum):
     """
     Represents different types of squares on the Scrabble board with their multipliers.
@@ -31,4 +39,8 @@ class SquareType(Enum):
 
     def __str__(self) -> str:
         """Returns the string representation of the SquareType."""
-        return self.value
\ No newline at end of file
+        return self.value
+
+
+LETTER_MULTIPLIERS = {SquareType.DOUBLE_LETTER: 2, SquareType.TRIPLE_LETTER: 3}
+WORD_MULTIPLIERS = {SquareType.DOUBLE_WORD: 2, SquareType.TRIPLE_WORD: 3, SquareType.START: 2}
@@ -8,6 +8,10 @@ class EmptyBagError(ScrabbleError):
     """Raised when attempting to draw from an empty Scrabble bag."""
     pass
 
+class TileNotInBagError(ScrabbleError):
+    """Raised when a specific tile is asked of the bag but the bag holds none."""
+    pass
+
 # Board exceptions
 class InvalidBoardPositionError(ScrabbleError):
     """Raised when an invalid row or column is accessed on the board."""
@@ -78,3 +82,35 @@ class InvalidValueError(ScrabbleError):
 class NonBlankTileError(ScrabbleError):
     """Raised when trying to modify a non-blank tile."""
     pass
+
+# Lexicon exceptions
+class LexiconFormatError(ScrabbleError):
+    """Raised when a compiled lexicon is truncated, corrupt or of an unsupported version."""
+    pass
+
+# Leave table exceptions
+class LeaveTableFormatError(ScrabbleError):
+    """Raised when a leave table file is truncated, corrupt or of an unsupported version."""
+    pass
+
+# Snapshot exceptions
+class SnapshotFormatError(ScrabbleError):
+    """Raised when a game snapshot is truncated, corrupt or of an unsupported version."""
+    pass
+
+class SnapshotMismatchError(ScrabbleError):
+    """Raised when a game snapshot is restored with a different lexicon or settings than it was taken with."""
+    pass
+
+# Server exceptions
+class ProtocolError(ScrabbleError):
+    """Raised when a server request is malformed or names an unknown command."""
+    pass
+
+class UnknownGameError(ScrabbleError):
+    """Raised when a server request names a game that is not hosted."""
+    pass
+
+class NotPlayersTurnError(ScrabbleError):
+    """Raised when a player acts out of turn."""
+    pass
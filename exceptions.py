@@ -0,0 +1 @@
+errors.py
\ No newline at end of file
@@ -1,31 +1,70 @@
-from typing import Optional, Set
+import random
+from collections import Counter
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Iterable, List, NamedTuple, Optional, Set, Union
 
 from settings_manager import SettingsManager
 from board import ScrabbleBoard
 from bag import ScrabbleBag
 from player import Player
-from exceptions import PlayerCountMismatchError, TileDistributionError
-from enums import Direction
-from move import Move
+from exceptions import PlayerCountMismatchError, TileDistributionError, TileNotInBagError
+from enums import Direction, EventType
+from move import Move, MoveResult
+from lexicon import Lexicon
+from tile import ScrabbleTile
+from zobrist import ZobristKeys, position_hash
+import instrumentation
+
+class _TurnRecord(NamedTuple):
+    """What `Game.make` changed, so `Game.unmake` can put it back."""
+    move: Optional[Move]
+    player: Player
+    rack: List[ScrabbleTile]
+    drawn: List[ScrabbleTile]
+    zero_score_streak: int
+    current_player: Player
+    is_over: bool
+    hash: int
+
+class GameEvent(NamedTuple):
+    """
+    An entry of a game's history: a turn as it was played or an end of game rack penalty.
+    `rack` holds the player's tiles before it, blanks as '#', and `total` their score after it.
+    """
+    type: EventType
+    player: str
+    rack: str
+    score: int
+    total: int
+    result: Optional[MoveResult] = None
+    exchanged: str = ''
+
+def _rack_letters(tiles: Iterable[ScrabbleTile]) -> str:
+    return ''.join(tile.letter for tile in tiles)
 
 class Game:
-    def __init__(self, word_set: Set[str], settings_dict: Optional[dict] = None,
+    def __init__(self, word_set: Union[Set[str], Lexicon, 'Future[Lexicon]'], settings_dict: Optional[dict] = None,
                  player_names: Optional[list[str]] = None, board: Optional[ScrabbleBoard] = None,
-                 bag: Optional[ScrabbleBag] = None):
+                 bag: Optional[ScrabbleBag] = None, rng: Optional[random.Random] = None,
+                 settings_manager: Optional[SettingsManager] = None):
         
-        self.settings_manager = SettingsManager(word_set, settings_dict)
+        # Games hosted side by side can share one settings manager, and with it one lexicon
+        self.settings_manager = settings_manager or SettingsManager(word_set, settings_dict)
     
+        rules = self.settings_manager.ruleset
         if player_names is None:
             player_names = []
-            for i in range(self.settings_manager.game_mechanics.player_count):
+            for i in range(rules.player_count):
                 player_names.append(f'Player {i + 1}')
-        if len(player_names) != self.settings_manager.game_mechanics.player_count:
+        if len(player_names) != rules.player_count:
             raise PlayerCountMismatchError('Number of player names does not match number of players.')
 
         self.board = board or ScrabbleBoard(self.settings_manager.board_settings.default_board_layout)
-        self.bag = bag or ScrabbleBag(self.settings_manager)
+        self._attach_lexicon_later(self.board, self.settings_manager)
+        self.bag = bag or ScrabbleBag(self.settings_manager, rng)
 
-        if len(self.bag) < self.settings_manager.game_mechanics.max_rack_size * self.settings_manager.game_mechanics.player_count:
+        if len(self.bag) < rules.max_rack_size * rules.player_count:
             raise TileDistributionError('Tile distribution is not large enough for the number of players.')
 
         self.players = [Player(name, self.bag, self.settings_manager) for name in player_names]
@@ -34,10 +73,52 @@ class Game:
         self.current_player = self.players[0]
         self.zero_score_streak = 0
         self.is_over = self.has_ended()
+        self._journal: List[_TurnRecord] = []
+        self.history: List[GameEvent] = []
+        self.zobrist = ZobristKeys.for_game(self)
+        self._hash = position_hash(self, self.zobrist)
+
+    @classmethod
+    def from_state(cls, settings_manager: SettingsManager, board: ScrabbleBoard, bag: ScrabbleBag,
+                   players: List[Player], current_player: Player, zero_score_streak: int) -> 'Game':
+        """Resume a game from its parts, for instance when restoring a saved position.
+
+        :param settings_manager: The settings the game is played with.
+        :param board: The board, with the tiles played so far.
+        :param bag: The bag, holding the tiles not yet drawn.
+        :param players: The players in turn order, with their racks and scores.
+        :param current_player: The player to move.
+        :param zero_score_streak: The number of consecutive zero-score turns.
+
+        :return: The Game, with no turns to take back and an empty history."""
+        game = cls.__new__(cls)
+        game.settings_manager = settings_manager
+        game.board = board
+        cls._attach_lexicon_later(board, settings_manager)
+        game.bag = bag
+        game.players = list(players)
+        game.current_player = current_player
+        game.zero_score_streak = zero_score_streak
+        game.is_over = game.has_ended()
+        game._journal = []
+        game.history = []
+        game.zobrist = ZobristKeys.for_game(game)
+        game._hash = position_hash(game, game.zobrist)
+        return game
+
+    @staticmethod
+    def _attach_lexicon_later(board: ScrabbleBoard, settings_manager: SettingsManager) -> None:
+        # Building or loading the lexicon can take seconds, so it waits for the first cross-check or move
+        board.attach_lexicon_later(lambda: settings_manager.lexicon)
+
+    @property
+    def position_hash(self) -> int:
+        """64-bit Zobrist hash of the board, the racks, the player to move and the zero-score streak."""
+        return self._hash
 
     def has_ended(self) -> bool:
         if any([
-            self.zero_score_streak >= self.settings_manager.game_mechanics.zero_score_turns_before_game_end,
+            self.zero_score_streak >= self.settings_manager.ruleset.zero_score_turns_before_game_end,
             len(self.players) == 1,
             any(len(player.rack) == 0 for player in self.players)
         ]):
@@ -52,10 +133,27 @@ class Game:
 
     def _end_turn_operations(self):
         """Operations to be performed at the end of every turn."""
+        collector = instrumentation.collector
+        if collector is not None:
+            started = perf_counter()
+        previous_player = self.current_player
         self._rotate_to_next_player()
         self.is_over = self.has_ended()
+        self._hash ^= self.zobrist.turn(self.players.index(previous_player)) ^ \
+            self.zobrist.turn(self.players.index(self.current_player))
+        if collector is not None:
+            collector.record(instrumentation.END_OF_TURN, perf_counter() - started)
 
-    def make_move(self, row: int, col: int, word: str, direction: Direction, current_player: Player = None):
+    def _rehash_rack(self, player: Player, before: List[int]) -> None:
+        """Update the hash for a rack that held `before` letter counts."""
+        self._hash ^= self.zobrist.rack_change(self.players.index(player), before, player.rack.counts)
+
+    def _set_zero_score_streak(self, streak: int) -> None:
+        self._hash ^= self.zobrist.streak(self.zero_score_streak) ^ self.zobrist.streak(streak)
+        self.zero_score_streak = streak
+
+    def make_move(self, row: int, col: int, word: str, direction: Direction, current_player: Player = None,
+                  blanks: Iterable[int] = ()) -> MoveResult:
         """Make a move on the board.
         
         :param row: The row to start the word at.
@@ -63,26 +161,73 @@ class Game:
         :param word: The word to place on the board.
         :param direction: The direction to place the word in.
         :param current_player: The player making the move. Defaults to the current player.
+        :param blanks: Indices of letters in the word to be played with blank tiles.
         
         :raises: InvalidWordError if the word is not in the word set.
         :raises: InvalidMoveError if the move is not valid.
         :raises: InvalidMoveError if the move is not connected to any other tiles on the board.
         :raises: InvalidMoveError if the move is not in a straight line.
         
-        :return: None"""
+        :return: The MoveResult with the words formed and their scores."""
         current_player = current_player or self.current_player
-        old_player_score = current_player.score
+        return self.make(Move(row, col, word, direction, current_player, blanks))
+
+    def make(self, move: Optional[Move] = None) -> Optional[MoveResult]:
+        """Play a move (or pass when `move` is None) and record it so that `unmake` can take it back.
 
-        move = Move(row, col, word, direction, current_player)
-        move.validate_move(self.board, self.settings_manager)
-        move.execute(self.board, self.settings_manager)
+        The board, racks and scores are changed in place; nothing is copied. Tiles drawn to refill
+        the rack go back into the bag on `unmake`.
 
-        current_player.rack.refill(self.bag)
-        if current_player.score == old_player_score:
-            self.zero_score_streak += 1
+        :param move: The move to play, for its player. None passes the current player's turn.
+
+        :raises: ScrabbleError subclasses as `make_move`, in which case nothing is changed.
+
+        :return: The MoveResult of the move, or None for a pass."""
+        player = move.player if move is not None else self.current_player
+        record = _TurnRecord(move, player, list(player.rack.tiles), [], self.zero_score_streak,
+                             self.current_player, self.is_over, self._hash)
+        result = None
+        rack = _rack_letters(record.rack)
+        if move is None:
+            self._set_zero_score_streak(self.zero_score_streak + 1)
+            self.history.append(GameEvent(EventType.PASS, player.name, rack, 0, player.score))
         else:
-            self.zero_score_streak = 0
+            before = player.rack.counts
+            result = move.execute(self.board, self.settings_manager)
+            self._hash ^= self.zobrist.tiles(result.tiles)
+
+            collector = instrumentation.collector
+            if collector is not None:
+                started = perf_counter()
+            record.drawn.extend(player.rack.refill(self.bag))
+            self._rehash_rack(player, before)
+            if collector is not None:
+                collector.record(instrumentation.RACK_REFILL, perf_counter() - started)
+            self._set_zero_score_streak(self.zero_score_streak + 1 if move.score == 0 else 0)
+            self.history.append(GameEvent(EventType.MOVE, player.name, rack, result.score, player.score, result))
+        self._journal.append(record)
         self._end_turn_operations()
+        return result
+
+    def unmake(self) -> None:
+        """Take back the last turn played through `make` or `make_move`.
+
+        Exchanges and resignations cannot be taken back and clear the record of earlier turns.
+
+        :raises: IndexError if there is no turn to take back.
+
+        :return: None"""
+        record = self._journal.pop()
+        self.history.pop()
+        for tile in reversed(record.drawn):
+            self.bag.deposit_tile(tile)
+        if record.move is not None:
+            record.move.undo(self.board)
+        record.player.rack.replace_tiles(record.rack)
+        self.zero_score_streak = record.zero_score_streak
+        self.current_player = record.current_player
+        self.is_over = record.is_over
+        self._hash = record.hash
 
     def exchange_tiles(self, tiles: str, current_player: Player = None):
         """Exchange tiles from the player's rack.
@@ -90,33 +235,84 @@ class Game:
         :param tiles: The tiles to exchange.
         :param current_player: The player exchanging the tiles. Defaults to the current player.
 
-        :raises: InsufficientTilesError if the player does not have enough tiles to exchange.
-        :raises: InvalidTileError if the player is trying to exchange a tile that is not in their rack.
-        :raises: InvalidTileError if the player is trying to exchange a tile that is not in the bag.
+        :raises: RackSizeError if the player is trying to exchange more tiles than a rack holds.
+        :raises: TileNotInRackError if the player is trying to exchange a tile that is not in their rack.
+        :raises: InsufficientTilesError if the bag holds fewer tiles than the player is trying to exchange.
+        :raises: InvalidLetterError if a tile is not a tile letter.
+        Nothing changes when an error is raised.
         
         :return: None"""
         
         current_player = current_player or self.current_player
-        current_player.exchange_tiles(tiles, self.bag, self.settings_manager)
-        self.zero_score_streak += 1
+        before = current_player.rack.counts
+        rack = _rack_letters(current_player.rack)
+        current_player.exchange_tiles(tiles, self.bag)
+        self.history.append(GameEvent(EventType.EXCHANGE, current_player.name, rack, 0, current_player.score,
+                                      exchanged=tiles.upper()))
+        self._rehash_rack(current_player, before)
+        self._journal.clear()
+        self._set_zero_score_streak(self.zero_score_streak + 1)
         self._end_turn_operations()
 
        
     def pass_turn(self, current_player: Player = None):
         current_player = current_player or self.current_player
-        self.zero_score_streak += 1
-        self._end_turn_operations()
+        self.make()
 
     def resign(self, current_player: Player = None):
         current_player = current_player or self.current_player
+        self.history.append(GameEvent(EventType.RESIGN, current_player.name, _rack_letters(current_player.rack),
+                                      0, current_player.score))
         self.players.remove(current_player)
+        self._journal.clear()
         self.current_player = self.players[0]
         self.is_over = self.has_ended()
+        self._hash = position_hash(self, self.zobrist)
+
+    def unseen_tiles(self, player: Player = None) -> Counter:
+        """Count, per letter ('#' for blanks), the tiles `player` cannot see: the bag and the other racks.
+
+        :param player: The player whose view is taken. Defaults to the current player.
+
+        :return: A Counter of unseen tiles by letter."""
+        player = player or self.current_player
+        unseen = Counter(self.bag.counts)
+        for other in self.players:
+            if other is not player:
+                unseen.update(tile.letter.upper() for tile in other.rack)
+        return unseen
+
+    def set_rack(self, letters: str, player: Player = None) -> None:
+        """Give a player exactly the tiles `letters` ('#' for blanks) from the bag, after returning their rack to it.
+        Used to replay recorded games, where every rack is known.
+
+        :param letters: The letters of the new rack.
+        :param player: The player whose rack is set. Defaults to the current player.
+
+        :raises: TileNotInBagError if the bag and the player's rack together lack the tiles, in which case nothing is changed.
+
+        :return: None"""
+        player = player or self.current_player
+        available = Counter(self.bag.counts)
+        available.update(tile.letter.upper() for tile in player.rack)
+        missing = Counter(letters.upper()) - available
+        if missing:
+            raise TileNotInBagError(f"No '{next(iter(missing))}' left for the rack")
+        before = player.rack.counts
+        for tile in player.rack.tiles:
+            self.bag.deposit_tile(tile)
+        player.rack.replace_tiles([self.bag.take_tile(letter) for letter in letters])
+        self._rehash_rack(player, before)
+        self._journal.clear()
 
     def apply_end_game_penalties(self) -> None:
         for player in self.players:
-            for tile in player.rack:
-                player.score -= tile.value
+            if not len(player.rack):
+                continue
+            penalty = sum(tile.value for tile in player.rack)
+            player.score -= penalty
+            self.history.append(GameEvent(EventType.PENALTY, player.name, _rack_letters(player.rack),
+                                          -penalty, player.score))
     
     def __str__(self):
         current_player = self.current_player
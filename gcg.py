@@ -0,0 +1,173 @@
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from enums import Direction, EventType
+from game import Game, GameEvent
+from tile import BLANK
+
+# Game records in GCG, the move log format of Scrabble analysis tools:
+#
+#   #player1 nick Full Name
+#   >nick: RACK 8D WORD +score total      a move; 8D is row 8 column D across, D8 down
+#   >nick: RACK -ABC +0 total             an exchange
+#   >nick: RACK - +0 total                a pass
+#   >nick: (RACK) -value total            the rack left at the end of the game
+#
+# Tiles already on the board are written '.' in words, letters played with a blank are lower
+# case and blanks on a rack are '?'. A resignation, which GCG has no turn for, is written as
+# the `#resign nick` pragma; programs that do not know it skip it like any other pragma.
+
+GCG_BLANK = '?'
+COLUMNS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+_TURN = re.compile(r'>(?P<nick>[^:\s]+):\s+(?P<rest>.*)$')
+_HORIZONTAL = re.compile(r'(\d+)([A-Z])$')
+_VERTICAL = re.compile(r'([A-Z])(\d+)$')
+
+
+class GcgTurn(NamedTuple):
+    """A parsed turn line. `word` keeps the record's notation; `rack` and `exchanged` use '#' for blanks."""
+    line: int
+    type: EventType
+    nick: str
+    rack: str
+    score: int
+    total: int
+    row: int = -1
+    col: int = -1
+    direction: Optional[Direction] = None
+    word: str = ''
+    exchanged: str = ''
+
+
+class GcgRecord(NamedTuple):
+    """A parsed game record: the players, as (nick, name) in turn order, and the turns."""
+    players: List[Tuple[str, str]]
+    turns: List[GcgTurn]
+
+
+def nickname(name: str) -> str:
+    return '_'.join(name.split()) or '_'
+
+
+def coordinates(row: int, col: int, direction: Direction) -> str:
+    if direction == Direction.HORIZONTAL:
+        return f'{row + 1}{COLUMNS[col]}'
+    return f'{COLUMNS[col]}{row + 1}'
+
+
+def _rack(letters: str) -> str:
+    return letters.upper().replace(BLANK, GCG_BLANK)
+
+
+def _played_word(event: GameEvent) -> str:
+    """The main word of a move with the tiles already on the board as '.' and blanks in lower case."""
+    word = event.result.main_word
+    placed = {(tile.row, tile.col): tile for tile in event.result.tiles}
+    step_r, step_c = (0, 1) if word.direction == Direction.HORIZONTAL else (1, 0)
+    letters = []
+    for index in range(len(word.word)):
+        tile = placed.get((word.row + index * step_r, word.col + index * step_c))
+        letters.append('.' if tile is None else tile.letter.lower() if tile.blank else tile.letter.upper())
+    return ''.join(letters)
+
+
+def format_event(event: GameEvent) -> str:
+    """The record line of a history entry."""
+    nick = nickname(event.player)
+    if event.type == EventType.RESIGN:
+        return f'#resign {nick}'
+    if event.type == EventType.PENALTY:
+        return f'>{nick}: ({_rack(event.rack)}) {event.score:+d} {event.total}'
+    if event.type == EventType.MOVE:
+        word = event.result.main_word
+        play = f'{coordinates(word.row, word.col, word.direction)} {_played_word(event)}'
+    elif event.type == EventType.EXCHANGE:
+        play = f'-{_rack(event.exchanged)}'
+    else:
+        play = '-'
+    return f'>{nick}: {_rack(event.rack)} {play} {event.score:+d} {event.total}'
+
+
+def game_players(game: Game) -> List[str]:
+    """Names of everyone who took part in `game`, in turn order, including players who resigned."""
+    names = [event.player for event in game.history]
+    names.extend(player.name for player in game.players)
+    return list(dict.fromkeys(names))
+
+
+def to_gcg(game: Game) -> str:
+    """The record of `game` so far in GCG."""
+    lines = ['#character-encoding UTF-8']
+    lines.extend(f'#player{seat} {nickname(name)} {name}' for seat, name in enumerate(game_players(game), 1))
+    lines.extend(format_event(event) for event in game.history)
+    return '\n'.join(lines) + '\n'
+
+
+def write_gcg(game: Game, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(to_gcg(game))
+
+
+def _parse_position(position: str) -> Tuple[int, int, Direction]:
+    match = _HORIZONTAL.match(position)
+    if match:
+        return int(match.group(1)) - 1, COLUMNS.index(match.group(2)), Direction.HORIZONTAL
+    match = _VERTICAL.match(position)
+    if match:
+        return int(match.group(2)) - 1, COLUMNS.index(match.group(1)), Direction.VERTICAL
+    raise ValueError(f"Bad position '{position}'")
+
+
+def _parse_turn(number: int, line: str) -> GcgTurn:
+    match = _TURN.match(line)
+    if match is None:
+        raise ValueError(f'Line {number}: not a turn')
+    nick = match.group('nick')
+    fields = match.group('rest').split()
+    try:
+        *play, score, total = fields
+        score, total = int(score), int(total)
+    except ValueError:
+        raise ValueError(f'Line {number}: bad score') from None
+    if not play:
+        raise ValueError(f'Line {number}: no rack')
+    rack = play[0]
+    if rack.startswith('(') and rack.endswith(')') and len(play) == 1:
+        return GcgTurn(number, EventType.PENALTY, nick, _letters(rack[1:-1]), score, total)
+    if len(play) != 3 and not (len(play) == 2 and play[1].startswith('-')):
+        raise ValueError(f'Line {number}: unsupported turn')
+    rack = _letters(rack)
+    if len(play) == 2:
+        if play[1] == '-':
+            return GcgTurn(number, EventType.PASS, nick, rack, score, total)
+        return GcgTurn(number, EventType.EXCHANGE, nick, rack, score, total, exchanged=_letters(play[1][1:]))
+    try:
+        row, col, direction = _parse_position(play[1])
+    except ValueError as e:
+        raise ValueError(f'Line {number}: {e}') from None
+    return GcgTurn(number, EventType.MOVE, nick, rack, score, total, row, col, direction, play[2])
+
+
+def _letters(rack: str) -> str:
+    return rack.upper().replace(GCG_BLANK, BLANK)
+
+
+def parse_gcg(lines: Iterable[str]) -> GcgRecord:
+    """Parse a GCG record. Raises ValueError, naming the line, for lines it cannot read."""
+    players: List[Tuple[str, str]] = []
+    turns: List[GcgTurn] = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            pragma, _, value = line[1:].partition(' ')
+            if re.fullmatch(r'player\d+', pragma):
+                nick, _, name = value.strip().partition(' ')
+                players.append((nick, name.strip() or nick))
+            elif pragma == 'resign':
+                turns.append(GcgTurn(number, EventType.RESIGN, value.strip(), '', 0, 0))
+            continue
+        turns.append(_parse_turn(number, line))
+    return GcgRecord(players, turns)
@@ -0,0 +1,117 @@
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+WORD_LOOKUP = 'word_lookup'
+PLACEMENT_VALIDATION = 'placement_validation'
+CROSS_WORDS = 'cross_words'
+SCORING = 'scoring'
+BOARD_UPDATE = 'board_update'
+RACK_REFILL = 'rack_refill'
+END_OF_TURN = 'end_of_turn'
+
+# Upper bounds, in seconds, of the histogram buckets. Slower calls go in a last, open bucket.
+BUCKET_BOUNDS = tuple(scale * 10.0 ** exponent for exponent in range(-6, 1) for scale in (1, 2, 5))
+
+
+def _bucket_label(index: int) -> str:
+    if index == len(BUCKET_BOUNDS):
+        return f'>{BUCKET_BOUNDS[-1]:g}s'
+    return f'<={BUCKET_BOUNDS[index]:g}s'
+
+
+class PhaseStats:
+    """Call count, total, extremes and a log-scale histogram of the durations of one phase."""
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'min_seconds': self.minimum if self.count else 0.0,
+            'max_seconds': self.maximum,
+            'histogram': {_bucket_label(index): count for index, count in enumerate(self.buckets) if count},
+        }
+
+
+class Collector:
+    """
+    Aggregates the wall time of the phases of game turns. The engine records into
+    the module's `collector` while one is enabled; otherwise each phase costs a
+    single check.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.add(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of code as phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """The statistics of every phase recorded so far, as plain data."""
+        return {name: stats.to_dict() for name, stats in self.phases.items()}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def reset(self) -> None:
+        self.phases = {}
+
+
+collector: Optional[Collector] = None
+
+
+def enable(new_collector: Optional[Collector] = None) -> Collector:
+    """Start recording phase timings into `new_collector` (a fresh one by default) and return it."""
+    global collector
+    collector = new_collector or Collector()
+    return collector
+
+
+def disable() -> Optional[Collector]:
+    """Stop recording and return the collector that was in use."""
+    global collector
+    previous, collector = collector, None
+    return previous
+
+
+@contextmanager
+def collecting(new_collector: Optional[Collector] = None) -> Iterator[Collector]:
+    """Record phase timings into `new_collector` (a fresh one by default) within a with block, then restore the one in use before."""
+    global collector
+    previous = collector
+    try:
+        yield enable(new_collector)
+    finally:
+        collector = previous
@@ -0,0 +1,385 @@
+import argparse
+import hashlib
+import json
+import mmap
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations_with_replacement, repeat
+from math import comb
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from exceptions import LeaveTableFormatError
+from game import Game
+from lexicon import Lexicon
+from move_generator import Placement
+from packed_lexicon import SharedLexicon, load_lexicon
+from rack import Rack, letter_code
+from simulate import game_seed, play_game
+from tile import TILE_LETTERS
+
+MAGIC = b'SLVE'
+FORMAT_VERSION = 1
+
+# magic, version, header size, symbol count, largest leave, entry count, sample count, sha256 of the body
+HEADER = struct.Struct('<4sHHHHIQ32s')
+HEADER_SIZE = 64
+
+SYMBOLS = len(TILE_LETTERS)
+DEFAULT_TABLE = 'leaves.lvt'
+
+Samples = Dict[str, List[float]]
+
+
+class LeaveIndex:
+    """
+    Perfect hash of the multisets of at most `max_size` tiles over `symbols` letters
+    (blanks included), onto 0 .. size - 1. Leaves are ranked by size first, then in
+    colexicographic order: a sorted leave c0 <= c1 <= ... maps to the strictly
+    increasing c0, c1 + 1, c2 + 2, ..., whose combinatorial number is its rank.
+    """
+
+    def __init__(self, symbols: int = SYMBOLS, max_size: int = 6) -> None:
+        self.symbols = symbols
+        self.max_size = max_size
+        self._binomials = [[comb(n, k) for k in range(max_size + 1)] for n in range(symbols + max_size)]
+        self.offsets = [comb(symbols + size - 1, size - 1) if size else 0 for size in range(max_size + 2)]
+
+    @property
+    def size(self) -> int:
+        """Number of leaves, from the empty one up to `max_size` tiles."""
+        return self.offsets[self.max_size + 1]
+
+    def rank(self, counts: Sequence[int]) -> int:
+        """Rank of the leave holding `counts[code]` tiles of each letter code."""
+        self._check_size(sum(counts))
+        binomials = self._binomials
+        rank = 0
+        size = 0
+        for code, count in enumerate(counts):
+            for _ in range(count):
+                size += 1
+                rank += binomials[code + size - 1][size]
+        return self.offsets[size] + rank
+
+    def rank_codes(self, codes: Sequence[int]) -> int:
+        """Rank of the leave made of the letter codes `codes`, in ascending order."""
+        self._check_size(len(codes))
+        binomials = self._binomials
+        rank = self.offsets[len(codes)]
+        for position, code in enumerate(codes):
+            rank += binomials[code + position][position + 1]
+        return rank
+
+    def unrank(self, rank: int) -> tuple:
+        """The leave of rank `rank`, as ascending letter codes."""
+        if not 0 <= rank < self.size:
+            raise ValueError(f'Rank {rank} is outside the index')
+        size = next(size for size in range(self.max_size, -1, -1) if self.offsets[size] <= rank)
+        rank -= self.offsets[size]
+        binomials = self._binomials
+        codes = []
+        top = self.symbols + size - 1
+        for position in range(size, 0, -1):
+            while binomials[top][position] > rank:
+                top -= 1
+            rank -= binomials[top][position]
+            codes.append(top - position + 1)
+            top -= 1
+        return tuple(reversed(codes))
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_size:
+            raise ValueError(f'Leave of {size} tiles is larger than the index')
+
+    def key_rank(self, key: str) -> int:
+        """Rank of a leave written as letters, '#' for blanks."""
+        return self.rank_codes(sorted(letter_code(char) for char in key))
+
+    def leaves(self) -> Iterator[tuple]:
+        """Every leave as ascending letter codes, smallest leaves first."""
+        for size in range(self.max_size + 1):
+            yield from combinations_with_replacement(range(self.symbols), size)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def pack_leave_table(values: Sequence[float], max_size: int, sample_count: int = 0) -> bytes:
+    """Serialize leave equities, indexed by `LeaveIndex` rank, into the versioned binary format."""
+    body = array('f', values)
+    if len(body) != LeaveIndex(SYMBOLS, max_size).size:
+        raise ValueError('Leave table does not match the index size')
+    if sys.byteorder != 'little':
+        body.byteswap()
+    body = body.tobytes()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, HEADER_SIZE, SYMBOLS, max_size, len(values), sample_count,
+                         hashlib.sha256(body).digest())
+    return header.ljust(HEADER_SIZE, b'\0') + body
+
+
+class LeaveTable:
+    """
+    Equity of every leave of up to `max_size` tiles, read straight from a packed
+    float32 buffer, typically a read-only memory map. Lookups rank the leave and
+    index the buffer; nothing is built at load time.
+    """
+
+    def __init__(self, buffer, verify: bool = True) -> None:
+        view = memoryview(buffer)
+        if len(view) < HEADER_SIZE:
+            raise LeaveTableFormatError('Leave table file is truncated')
+        magic, version, header_size, symbols, max_size, entry_count, sample_count, checksum = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise LeaveTableFormatError('Not a leave table')
+        if version != FORMAT_VERSION:
+            raise LeaveTableFormatError(f'Unsupported leave table format version {version}')
+        if symbols != SYMBOLS:
+            raise LeaveTableFormatError(f'Leave table is for {symbols} letters, not {SYMBOLS}')
+        self._index = LeaveIndex(symbols, max_size)
+        if entry_count != self._index.size:
+            raise LeaveTableFormatError('Leave table does not match its index size')
+        end = header_size + 4 * entry_count
+        if len(view) < end:
+            raise LeaveTableFormatError('Leave table file is truncated')
+        body = view[header_size:end]
+        if verify and hashlib.sha256(body).digest() != checksum:
+            raise LeaveTableFormatError('Leave table checksum mismatch')
+        if sys.byteorder != 'little':
+            swapped = array('f', body.tobytes())
+            swapped.byteswap()
+            body = memoryview(swapped.tobytes())
+
+        self._values = body.cast('f')
+        self._exports = [self._values, body, view]
+        self._max_size = max_size
+        self._sample_count = sample_count
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def open(cls, path: str, verify: bool = True) -> 'LeaveTable':
+        """Memory-map a leave table file read-only."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        table = cls(mapped, verify)
+        table._mmap = mapped
+        return table
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def sample_count(self) -> int:
+        """Number of self-play leaves the table was trained on."""
+        return self._sample_count
+
+    def value(self, counts: Sequence[int]) -> float:
+        """Equity of the leave holding `counts[code]` tiles of each letter code. Full racks are worth 0."""
+        if sum(counts) > self._max_size:
+            return 0.0
+        return self._values[self._index.rank(counts)]
+
+    def equity(self, rack: Rack, played: str = '') -> float:
+        """Equity of what `rack` keeps after playing the tiles `played` ('#' for blanks)."""
+        counts = rack.counts
+        for char in played:
+            counts[letter_code(char)] -= 1
+        return self.value(counts)
+
+    def close(self) -> None:
+        """Release the buffer. The table cannot be used afterwards."""
+        for export in self._exports:
+            export.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __getitem__(self, key: str) -> float:
+        """Equity of a leave written as letters, '#' for blanks."""
+        if len(key) > self._max_size:
+            return 0.0
+        return self._values[self._index.key_rank(key)]
+
+    def __len__(self) -> int:
+        return self._index.size
+
+    def __enter__(self) -> 'LeaveTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'LeaveTable(max_size={self._max_size}, samples={self._sample_count})'
+
+
+def equity_policy_for(table: LeaveTable):
+    """A move policy that plays the placement with the best score plus leave equity while tiles remain to be drawn."""
+    def equity_policy(game: Game, placements: Iterator[Placement], rng: random.Random) -> Optional[Placement]:
+        if not len(game.bag):
+            return max(placements, key=lambda placement: placement.score, default=None)
+        counts = game.current_player.rack.counts
+        value = table.value
+
+        def equity(placement: Placement) -> float:
+            leave = counts.copy()
+            for char in placement.tiles:
+                leave[letter_code(char)] -= 1
+            return placement.score + value(leave)
+        return max(placements, key=equity, default=None)
+    return equity_policy
+
+
+_default_policy = None
+
+
+def equity_policy(game: Game, placements: Iterator[Placement], rng: random.Random) -> Optional[Placement]:
+    """Equity policy over the leave table in DEFAULT_TABLE, for use as 'leaves:equity_policy'."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = equity_policy_for(LeaveTable.open(DEFAULT_TABLE))
+    return _default_policy(game, placements, rng)
+
+
+_worker_lexicon: Optional[Lexicon] = None
+
+
+def _init_worker(lexicon: SharedLexicon) -> None:
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _sample_game(seed: int, policies: List[str], settings_dict: Optional[dict]) -> Samples:
+    """Play one game and record, for every leave kept while the bag still had tiles, what its owner scored next turn."""
+    pending: Dict[str, str] = {}
+    samples: Samples = {}
+
+    def observe(game: Game, placement: Optional[Placement]) -> None:
+        player = game.current_player
+        leave = pending.pop(player.name, None)
+        if leave is not None:
+            entry = samples.setdefault(leave, [0, 0.0])
+            entry[0] += 1
+            entry[1] += placement.score if placement is not None else 0
+        if placement is not None and len(game.bag):
+            pending[player.name] = player.rack.leave_key(placement.tiles)
+
+    play_game(_worker_lexicon, policies, seed, settings_dict, observe)
+    return samples
+
+
+def collect_samples(games: int, lexicon_path: str = 'enable.txt', settings_dict: Optional[dict] = None,
+                    policies: Sequence[str] = ('greedy', 'greedy'), seed: int = 0,
+                    workers: Optional[int] = None) -> Samples:
+    """Play `games` self-play games across a process pool and merge their leave samples: key -> [count, score total]."""
+    samples: Samples = {}
+    seeds = (game_seed(seed, index) for index in range(games))
+    with SharedLexicon.publish(load_lexicon(lexicon_path)) as lexicon, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(lexicon,)) as executor:
+        for game_samples in executor.map(_sample_game, seeds, repeat(list(policies), games),
+                                          repeat(settings_dict, games), chunksize=16):
+            for key, (count, total) in game_samples.items():
+                entry = samples.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += total
+    return samples
+
+
+def fit_leave_values(samples: Samples, max_size: int, prior: float = 20.0, ridge: float = 1.0) -> array:
+    """
+    Turn leave samples into an equity for every leave, indexed by `LeaveIndex` rank. Equity is the
+    next-turn score above the average. A ridge regression on "n-th copy of a letter" features gives
+    every leave an estimate; leaves seen in self-play blend it with their own mean, weighted by
+    their sample count against `prior`.
+    """
+    import numpy as np
+
+    index = LeaveIndex(SYMBOLS, max_size)
+    features = SYMBOLS * max_size
+    count = sum(entry[0] for entry in samples.values())
+    if not count:
+        raise ValueError('No leave samples to fit')
+    mean = sum(entry[1] for entry in samples.values()) / count
+
+    def feature_indices(codes: Sequence[int]) -> List[int]:
+        indices = []
+        for position, code in enumerate(codes):
+            copy = position - next(i for i, c in enumerate(codes) if c == code)
+            indices.append(code * max_size + copy)
+        return indices
+
+    normal = np.zeros((features, features))
+    target = np.zeros(features)
+    observed = {}
+    for key, (n, total) in samples.items():
+        codes = sorted(letter_code(char) for char in key)
+        if len(codes) > max_size:
+            continue
+        deviation = total / n - mean
+        observed[index.rank_codes(codes)] = (n, deviation)
+        indices = feature_indices(codes)
+        normal[np.ix_(indices, indices)] += n
+        target[indices] += n * deviation
+    weights = np.linalg.solve(normal + ridge * np.eye(features), target).tolist()
+
+    values = array('f', bytes(4 * index.size))
+    for codes in index.leaves():
+        rank = index.rank_codes(codes)
+        estimate = sum(weights[feature] for feature in feature_indices(codes))
+        if rank in observed:
+            n, deviation = observed[rank]
+            estimate = (n * deviation + prior * estimate) / (n + prior)
+        values[rank] = estimate
+    return values
+
+
+def train_leave_table(path: str, games: int, lexicon_path: str = 'enable.txt', settings_dict: Optional[dict] = None,
+                      policies: Sequence[str] = ('greedy', 'greedy'), seed: int = 0, workers: Optional[int] = None,
+                      prior: float = 20.0) -> None:
+    """Collect leave samples from self-play and write the fitted table to `path`."""
+    max_size = (settings_dict or {}).get('max_rack_size', 7) - 1
+    samples = collect_samples(games, lexicon_path, settings_dict, policies, seed, workers)
+    values = fit_leave_values(samples, max_size, prior)
+    with open(path, 'wb') as f:
+        f.write(pack_leave_table(values, max_size, sum(int(entry[0]) for entry in samples.values())))
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Rack leave equity tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    train_parser = commands.add_parser('train', help='train a leave table from self-play')
+    train_parser.add_argument('games', type=int, help='number of self-play games')
+    train_parser.add_argument('--output', default=DEFAULT_TABLE, help='path of the leave table')
+    train_parser.add_argument('--lexicon', default='enable.txt', help='word list, one word per line')
+    train_parser.add_argument('--settings', help='JSON settings file')
+    train_parser.add_argument('--policies', nargs='+', default=['greedy', 'greedy'], help='one policy per seat')
+    train_parser.add_argument('--seed', type=int, default=0, help='seed the per-game seeds are derived from')
+    train_parser.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    train_parser.add_argument('--prior', type=float, default=20.0,
+                              help='samples a leave needs before its own mean outweighs the fitted estimate')
+    lookup_parser = commands.add_parser('lookup', help='print the equity of leaves')
+    lookup_parser.add_argument('leaves', nargs='+', help="leaves written as letters, '#' for blanks")
+    lookup_parser.add_argument('--table', default=DEFAULT_TABLE, help='path of the leave table')
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        settings_dict = {}
+        if args.settings:
+            with open(args.settings) as f:
+                settings_dict = json.load(f)
+        settings_dict['player_count'] = len(args.policies)
+        train_leave_table(args.output, args.games, args.lexicon, settings_dict, args.policies, args.seed,
+                          args.workers, args.prior)
+        with LeaveTable.open(args.output) as table:
+            print(f'Wrote {args.output}: {table!r}')
+    elif args.command == 'lookup':
+        with LeaveTable.open(args.table) as table:
+            for leave in args.leaves:
+                print(f'{leave.upper()}: {table[leave]:+.2f}')
+
+
+if __name__ == '__main__':
+    main()
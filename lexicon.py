@@ -0,0 +1,348 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SEPARATOR = '^'
+ROOT = 0
+
+
+class _GaddagBuilder:
+    """
+    Incrementally builds a minimized automaton from strings fed in sorted order
+    (Daciuk et al., "Incremental construction of minimal acyclic finite-state automata").
+    Nodes that turn out to be duplicates are recycled, so memory stays proportional
+    to the minimized graph plus the current path.
+    """
+
+    def __init__(self) -> None:
+        self.edges: List[Dict[str, int]] = [{}]
+        self.terminal: List[bool] = [False]
+        self._free: List[int] = []
+        self._register: Dict[tuple, int] = {}
+        self._unchecked: List[Tuple[int, str, int]] = []
+        self._previous = ''
+
+    def _new_node(self) -> int:
+        if self._free:
+            node = self._free.pop()
+            self.edges[node] = {}
+            self.terminal[node] = False
+            return node
+        self.edges.append({})
+        self.terminal.append(False)
+        return len(self.edges) - 1
+
+    def insert(self, entry: str) -> None:
+        previous = self._previous
+        if entry <= previous:
+            if entry == previous:
+                return
+            raise ValueError('Entries must be inserted in sorted order')
+        common = 0
+        for a, b in zip(entry, previous):
+            if a != b:
+                break
+            common += 1
+        self._minimize(common)
+
+        node = self._unchecked[-1][2] if self._unchecked else ROOT
+        for letter in entry[common:]:
+            child = self._new_node()
+            self.edges[node][letter] = child
+            self._unchecked.append((node, letter, child))
+            node = child
+        self.terminal[node] = True
+        self._previous = entry
+
+    def _minimize(self, down_to: int) -> None:
+        edges, terminal, register = self.edges, self.terminal, self._register
+        while len(self._unchecked) > down_to:
+            parent, letter, child = self._unchecked.pop()
+            signature = (terminal[child], tuple(edges[child].items()))
+            existing = register.get(signature)
+            if existing is None:
+                register[signature] = child
+            else:
+                edges[parent][letter] = existing
+                edges[child] = None
+                self._free.append(child)
+
+    def finish(self) -> Tuple[List[Dict[str, int]], bytearray]:
+        """Minimize the remaining path and renumber the reachable nodes densely, root first."""
+        self._minimize(0)
+        self._register = {}
+        order = {ROOT: 0}
+        queue = [ROOT]
+        for node in queue:
+            for child in self.edges[node].values():
+                if child not in order:
+                    order[child] = len(queue)
+                    queue.append(child)
+        edges = [{letter: order[child] for letter, child in self.edges[node].items()} for node in queue]
+        terminal = bytearray(self.terminal[node] for node in queue)
+        return edges, terminal
+
+
+def gaddag_entries(word: str) -> Iterator[str]:
+    """
+    Yield the GADDAG paths for a word: for every split point, the reversed prefix,
+    the separator, then the rest of the word. The path for the full reversed word
+    omits the separator. The first-letter path always carries the separator so
+    that the DAWG view can start every word from the same place.
+    """
+    yield word[0] + SEPARATOR + word[1:]
+    for i in range(2, len(word)):
+        yield word[i - 1::-1] + SEPARATOR + word[i:]
+    if len(word) > 1:
+        yield word[::-1]
+
+
+class Lexicon:
+    """
+    A minimized GADDAG over a word list.
+
+    Every word is stored once for each letter it contains, as the path
+    "reversed letters before and including it, separator, letters after it".
+    Starting from any letter, play can therefore be extended leftwards, turned
+    around at the separator and extended rightwards. Nodes are plain integers;
+    `child`, `children` and `is_terminal` are the primitives everything else is
+    built on. Words are stored lower case and queries are case insensitive.
+    """
+
+    def __init__(self, edges: List[Dict[str, int]], terminal: bytearray, word_count: int) -> None:
+        self._edges = edges
+        self._terminal = terminal
+        self._word_count = word_count
+        self._dawg: Optional['Dawg'] = None
+        self._digest: Optional[bytes] = None
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> 'Lexicon':
+        """Build a minimized GADDAG from an iterable of words."""
+        unique = {word.strip().lower() for word in words}
+        unique.discard('')
+        entries = sorted(entry for word in unique for entry in gaddag_entries(word))
+        builder = _GaddagBuilder()
+        for entry in entries:
+            builder.insert(entry)
+        edges, terminal = builder.finish()
+        return cls(edges, terminal, len(unique))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Lexicon':
+        """Build a lexicon from a text file with one word per line."""
+        with open(path) as f:
+            return cls.from_words(f.read().splitlines())
+
+    @property
+    def root(self) -> int:
+        return ROOT
+
+    @property
+    def node_count(self) -> int:
+        return len(self._edges)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self._edges)
+
+    def child(self, node: int, letter: str) -> Optional[int]:
+        """Return the node reached from `node` over `letter`, or None if there is no such edge."""
+        return self._edges[node].get(letter)
+
+    def children(self, node: int) -> Iterable[Tuple[str, int]]:
+        """Return the (letter, node) pairs leaving `node`."""
+        return self._edges[node].items()
+
+    def is_terminal(self, node: int) -> bool:
+        """Whether a complete word ends at `node`."""
+        return bool(self._terminal[node])
+
+    def follow(self, node: Optional[int], letters: str) -> Optional[int]:
+        """Follow a sequence of letters from `node`, returning None as soon as the path breaks."""
+        for letter in letters:
+            if node is None:
+                return None
+            node = self.child(node, letter)
+        return node
+
+    def start(self, letter: str) -> Optional[int]:
+        """Node for a path anchored on `letter`, ready to extend leftwards or turn at the separator."""
+        return self.child(ROOT, letter.lower())
+
+    def extend_left(self, node: int, letter: str) -> Optional[int]:
+        """Prepend a letter to the partial word at `node`. Only valid before the separator."""
+        return self.child(node, letter.lower())
+
+    def turn(self, node: int) -> Optional[int]:
+        """Cross the separator so the partial word can be extended rightwards."""
+        return self.child(node, SEPARATOR)
+
+    def extend_right(self, node: int, letter: str) -> Optional[int]:
+        """Append a letter to the partial word at `node`. Only valid after the separator."""
+        return self.child(node, letter.lower())
+
+    @property
+    def dawg(self) -> 'Dawg':
+        """A left-to-right view of the lexicon, sharing the GADDAG's nodes."""
+        if self._dawg is None:
+            self._dawg = Dawg(self)
+        return self._dawg
+
+    @property
+    def digest(self) -> bytes:
+        """SHA-256 of the compiled form of the lexicon, which identifies its words."""
+        if self._digest is None:
+            import hashlib
+            from packed_lexicon import HEADER_SIZE, pack_lexicon
+            self._digest = hashlib.sha256(pack_lexicon(self)[HEADER_SIZE:]).digest()
+        return self._digest
+
+    def contains(self, word: str) -> bool:
+        """Whether `word` is in the lexicon."""
+        if not word:
+            return False
+        word = word.lower()
+        node = self.follow(ROOT, word[0] + SEPARATOR + word[1:])
+        return node is not None and self.is_terminal(node)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Whether any word starts with `prefix`."""
+        if not prefix:
+            return self._word_count > 0
+        prefix = prefix.lower()
+        return self.follow(ROOT, prefix[0] + SEPARATOR + prefix[1:]) is not None
+
+    def has_suffix(self, suffix: str) -> bool:
+        """
+        Whether any word ends with `suffix`. The reversed suffix also starts the paths of words that
+        merely contain it, so it has to lead on to the end of a fully reversed word, the only paths
+        without a separator, or be a one-letter word itself.
+        """
+        if not suffix:
+            return self._word_count > 0
+        node = self.follow(ROOT, suffix.lower()[::-1])
+        if node is None:
+            return False
+        if len(suffix) == 1:
+            turned = self.turn(node)
+            if turned is not None and self.is_terminal(turned):
+                return True
+        pending = [node]
+        seen = {node}
+        while pending:
+            node = pending.pop()
+            if self.is_terminal(node):
+                return True
+            for letter, child in self.children(node):
+                if letter != SEPARATOR and child not in seen:
+                    seen.add(child)
+                    pending.append(child)
+        return False
+
+    def hooks(self, before: str, after: str) -> str:
+        """
+        Return, in alphabetical order, every letter that completes the word
+        `before + letter + after`. This is the cross-check query for an empty square.
+        The path shared by all candidates is followed once: "reversed before,
+        separator" when there is a `before`, the fully reversed word otherwise.
+        With neither, the candidates are the one-letter words.
+        """
+        before = before.lower()
+        after = after.lower()
+        if before:
+            node = self.follow(ROOT, before[::-1] + SEPARATOR)
+            tail = after
+        elif after:
+            node = self.follow(ROOT, after[::-1])
+            tail = ''
+        else:
+            node = ROOT  # One-letter words end after the separator
+            tail = SEPARATOR
+        if node is None:
+            return ''
+        letters = []
+        for letter, child in self.children(node):
+            if letter == SEPARATOR:
+                continue
+            child = self.follow(child, tail)
+            if child is not None and self.is_terminal(child):
+                letters.append(letter)
+        return ''.join(sorted(letters))
+
+    def words(self) -> Iterator[str]:
+        """Yield every word in alphabetical order."""
+        return self.dawg.words()
+
+    def __contains__(self, word: str) -> bool:
+        return self.contains(word)
+
+    def __len__(self) -> int:
+        return self._word_count
+
+    def __copy__(self) -> 'Lexicon':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Lexicon':
+        """Lexicons are immutable, so copies of boards and settings share them."""
+        return self
+
+    def __repr__(self) -> str:
+        return f'Lexicon(words={self._word_count}, nodes={self.node_count})'
+
+
+class Dawg:
+    """
+    The left-to-right (DAWG) view of a GADDAG. Every word's first-letter path
+    crosses the separator straight away, so that sub-graph reads the word list
+    front to back. The view's root is virtual and is represented by None.
+    """
+
+    def __init__(self, lexicon: Lexicon) -> None:
+        self._lexicon = lexicon
+
+    @property
+    def root(self) -> None:
+        return None
+
+    def child(self, node: Optional[int], letter: str) -> Optional[int]:
+        lexicon = self._lexicon
+        if node is None:
+            first = lexicon.child(lexicon.root, letter)
+            return None if first is None else lexicon.child(first, SEPARATOR)
+        return lexicon.child(node, letter)
+
+    def children(self, node: Optional[int]) -> Iterator[Tuple[str, int]]:
+        lexicon = self._lexicon
+        if node is not None:
+            yield from lexicon.children(node)
+            return
+        for letter, first in lexicon.children(lexicon.root):
+            if letter == SEPARATOR:
+                continue
+            turned = lexicon.child(first, SEPARATOR)
+            if turned is not None:
+                yield letter, turned
+
+    def is_terminal(self, node: Optional[int]) -> bool:
+        return node is not None and self._lexicon.is_terminal(node)
+
+    def follow(self, node: Optional[int], letters: str) -> Optional[int]:
+        for letter in letters:
+            node = self.child(node, letter)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, word: str) -> bool:
+        return self._lexicon.contains(word)
+
+    def has_prefix(self, prefix: str) -> bool:
+        return self._lexicon.has_prefix(prefix)
+
+    def words(self, node: Optional[int] = None, prefix: str = '') -> Iterator[str]:
+        """Yield, in alphabetical order, every word reachable from `node`, prefixed with `prefix`."""
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if self.is_terminal(node):
+                yield prefix
+            stack.extend((child, prefix + letter) for letter, child in reversed(list(self.children(node))))
@@ -3,13 +3,14 @@ import json
 from enums import Direction
 from game import Game
 from errors import ScrabbleError
+from packed_lexicon import load_lexicon_in_background
 
 def main():
-    with open('enable.txt') as f:
-        word_set = set(f.read().splitlines())
+    # The board comes up straight away; the first move waits for the lexicon if it is still loading
+    lexicon = load_lexicon_in_background('enable.txt')
     with open('scrabble_settings.json') as f:
         settings_dict = json.load(f)
-    game = Game(word_set, settings_dict, ['Mac', 'Gyver'])
+    game = Game(lexicon, settings_dict, ['Mac', 'Gyver'])
     while not game.is_over:
         print(game)
         print('Enter 1 to make a move')
@@ -23,9 +24,14 @@ def main():
             word = input('Enter word: ')
             direction = Direction(input('Enter direction (h or v): '))
             try:
-                game.make_move(row, col, word, direction)
+                result = game.make_move(row, col, word, direction)
             except ScrabbleError as e:
                 print(e)
+            else:
+                for formed in result.words:
+                    print(f'{formed.word}: {formed.score}')
+                if result.bingo_bonus:
+                    print(f'Bingo: {result.bingo_bonus}')
 
         elif choice == '2':
             tiles = input('Enter tiles to exchange: ')
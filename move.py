@@ -1,108 +1,270 @@
-from copy import deepcopy
+from time import perf_counter
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import instrumentation
 
 from board import ScrabbleBoard
 from enums import Direction, SquareType
 from settings_manager import SettingsManager
 from player import Player
+from rack import letter_code
+from tile import BLANK_CODE
 from exceptions import InvalidWordError, InvalidPlacementError, TilesNotConnectedError, InsufficientTilesError
-from word import Word
+
+class PlacedTile(NamedTuple):
+    """A tile a move puts on the board."""
+    row: int
+    col: int
+    letter: str
+    blank: bool
+
+class WordScore(NamedTuple):
+    """A word formed by a move, its score and the premium squares the move newly covers in it."""
+    word: str
+    row: int
+    col: int
+    direction: Direction
+    score: int
+    premiums: Tuple[Tuple[int, int, SquareType], ...]
+
+class MoveResult(NamedTuple):
+    """Everything a valid move does, gathered in one pass over the board. The main word comes first."""
+    words: Tuple[WordScore, ...]
+    tiles: Tuple[PlacedTile, ...]
+    bingo_bonus: int
+    score: int
+
+    @property
+    def main_word(self) -> WordScore:
+        return self.words[0]
 
 class Move:
     def __init__(self, row: int, col: int, word: str, direction: Direction, 
-                 player: Player):
+                 player: Player, blanks: Iterable[int] = (), strict: bool = False):
+        """`blanks` are the indexes of letters played with a blank. A letter the rack lacks is played
+        with a blank anyway, unless the move is `strict`: then only the letters at `blanks` may be."""
         self.row = row
         self.col = col
         self.word = word
         self.direction = direction
         self.player = player
+        self.blanks = frozenset(blanks)
+        self.strict = strict
         self.connected = False 
         self.valid_move = False
+        self.result: Optional[MoveResult] = None
+        self.score = 0
+        self.placed_positions = []
+        self.placed_tiles = []
+        self.blank_tiles = []
 
-    def execute(self, board: ScrabbleBoard, settings_manager: SettingsManager):
-        self.validate_move(board, settings_manager)
-        self.apply_move(board, settings_manager)
+    @classmethod
+    def from_placement(cls, placement, player: Player) -> 'Move':
+        """Create the move for a `Placement` found by the move generator."""
+        return cls(placement.row, placement.col, placement.word, placement.direction, player, placement.blanks)
 
+    def execute(self, board: ScrabbleBoard, settings_manager: SettingsManager) -> MoveResult:
+        result = self.evaluate(board, settings_manager)
+        self.apply_move(board, settings_manager, result)
+        return result
 
     def validate_move(self, board: ScrabbleBoard, settings_manager: SettingsManager) -> None:
         """Validate that the word can be placed at the specified location and direction on the board."""
+        self.evaluate(board, settings_manager)
+
+    def evaluate(self, board: ScrabbleBoard, settings_manager: SettingsManager) -> MoveResult:
+        """Validate the move and collect the words it forms, the tiles it places and its score in one scan.
+
+        The board and rack are only read. Perpendicular words are checked and scored from the board's
+        cross-checks and cross-sums.
+
+        :raises: InvalidWordError if the word or a word formed across it is not in the lexicon.
+        :raises: InvalidPlacementError if the word disagrees with tiles on the board or does not cover
+                 the whole run of adjacent tiles.
+        :raises: InsufficientTilesError if the rack lacks the tiles for the move.
+        :raises: TilesNotConnectedError if the move touches neither a tile nor the start square.
+
+        :return: The MoveResult of the move."""
+        collector = instrumentation.collector
+        if collector is not None:
+            started = perf_counter()
         if not settings_manager.is_valid_word(self.word):
             raise InvalidWordError('Invalid word')
+        if collector is not None:
+            looked_up = perf_counter()
+            collector.record(instrumentation.WORD_LOOKUP, looked_up - started)
+            cross_seconds = 0.0
+        self._attach_lexicon(board, settings_manager)
         offset_r = (self.direction == Direction.VERTICAL)
         offset_c = (self.direction == Direction.HORIZONTAL)
-        modifiable_player = deepcopy(self.player)
-        modifiable_board = deepcopy(board)
-        
+        if board.has_tile(self.row - offset_r, self.col - offset_c) or \
+                board.has_tile(self.row + offset_r * len(self.word), self.col + offset_c * len(self.word)):
+            raise InvalidPlacementError('Word must include the tiles adjacent to its ends')
+        rules = settings_manager.ruleset
+        letter_scores = rules.letter_scores
+        letter_multipliers = rules.letter_multipliers
+        word_multipliers = rules.word_multipliers
+        available = self.player.rack.counts
+
+        main_score = 0
+        word_multiplier = 1
+        premiums = []
+        tiles = []
+        cross_words = []
         for index, char in enumerate(self.word):
-            r_offset = (index * offset_r)
-            c_offset = (index * offset_c)
-            square = modifiable_board.get_square(self.row + r_offset, self.col + c_offset)
+            row = self.row + index * offset_r
+            col = self.col + index * offset_c
+            square = board.get_square(row, col)
             if square.tile is not None:
                 if square.tile != char:
                     raise InvalidPlacementError('Invalid placement')
                 self.connected = True
-            else:
-                tile = modifiable_player.rack.get_tile(char)
-                if tile is None:
-                    raise InsufficientTilesError('Insufficient tiles')
-                if square.square_type == SquareType.START:
-                    self.connected = True
-                square.tile = tile
-                self.check_normal_words(self.row + r_offset, self.col + c_offset, self.direction, modifiable_board, settings_manager, False)
+                main_score += square.tile.value
+                continue
+
+            code = self._reserve_tile(available, index, char)
+            blank = code == BLANK_CODE
+            square_type = square.square_type
+            if square_type == SquareType.START:
+                self.connected = True
+            letter_multiplier = letter_multipliers[row][col]
+            multiplier = word_multipliers[row][col]
+            letter_score = 0 if blank else letter_scores[code] * letter_multiplier
+            main_score += letter_score
+            word_multiplier *= multiplier
+            premium = ((row, col, square_type),) if letter_multiplier > 1 or multiplier > 1 else ()
+            premiums.extend(premium)
+            tiles.append(PlacedTile(row, col, char.upper(), blank))
+
+            if collector is not None:
+                cross_started = perf_counter()
+            if self.check_cross_word(row, col, char, board):
+                cross_score = (board.cross_sum(row, col, self.direction) + letter_score) * multiplier
+                cross_words.append(self._cross_word(board, row, col, char, cross_score, premium))
+            if collector is not None:
+                cross_seconds += perf_counter() - cross_started
         if not self.connected:
-            raise TilesNotConnectedError('Tiles not connected')                
+            raise TilesNotConnectedError('Tiles not connected')
+        if not tiles:
+            raise InvalidPlacementError('Move places no tiles')
+        if collector is not None:
+            # Letter scores are summed during the scan, so they count towards placement validation
+            scanned = perf_counter()
+            collector.record(instrumentation.PLACEMENT_VALIDATION, scanned - looked_up - cross_seconds)
+            collector.record(instrumentation.CROSS_WORDS, cross_seconds)
+
+        main_word = WordScore(self.word.upper(), self.row, self.col, self.direction,
+                              main_score * word_multiplier, tuple(premiums))
+        bingo_bonus = rules.bingo_bonus if len(tiles) == rules.max_rack_size else 0
+        words = (main_word,) + tuple(cross_words)
         self.valid_move = True
+        result = MoveResult(words, tuple(tiles), bingo_bonus, sum(word.score for word in words) + bingo_bonus)
+        if collector is not None:
+            collector.record(instrumentation.SCORING, perf_counter() - scanned)
+        return result
 
     def calculate_score(self, board: ScrabbleBoard, settings_manager: SettingsManager) -> int:
-        total_score = 0
-        word_multiplier = 1
+        """Return the score of the move, evaluating it unless it has already been applied."""
+        if self.result is not None:
+            return self.result.score
+        return self.evaluate(board, settings_manager).score
 
-        current_row = self.row
-        current_col = self.col
-        for letter in self.word:
-            current_square = board.get_square(current_row, current_col)
-            tile_score_modifier, tile_multiplier_modifier = current_square.calculate_score()
-            total_score += tile_score_modifier
-            word_multiplier *= tile_multiplier_modifier
-            if current_square.tile.placed_this_turn:
-                self.check_normal_words(current_row, current_col, self.direction, board, settings_manager)
-
-            current_row += (self.direction == Direction.VERTICAL)
-            current_col += (self.direction == Direction.HORIZONTAL)
-        
-        total_score *= word_multiplier
-
-        if len(self.word) == settings_manager.game_mechanics.max_rack_size:
-            total_score += settings_manager.game_mechanics.bingo_bonus
-
-        return total_score
-    
-    def apply_move(self, board: ScrabbleBoard, settings_manager: SettingsManager):
-        current_row = self.row
-        current_col = self.col
-        placed_tiles = []
-        for letter in self.word:
-            current_square = board.get_square(current_row, current_col)
-            if current_square.tile is None:
-                tile = self.player.rack.get_tile(letter)
-                tile.placed_this_turn = True
-                placed_tiles.append(tile)
-                current_square.tile = tile
-                self.player.rack.remove_tile(tile)
-            
-            current_row += (self.direction == Direction.VERTICAL)
-            current_col += (self.direction == Direction.HORIZONTAL)
-        
-        self.player.score += self.calculate_score(board, settings_manager)
-        for tile in placed_tiles:
-            tile.placed_this_turn = False
-
-    def check_normal_words(self, row: int, col: int, direction: Direction, board: ScrabbleBoard, 
-                           settings_manager: SettingsManager, modify_score: bool = True) -> None:
-
-        for delta in [-1, 1]:
-            r_offset = delta if direction == Direction.HORIZONTAL else 0
-            c_offset = delta if direction == Direction.VERTICAL else 0
-            if board.get_square(row + r_offset, col + c_offset).tile:
-                word = Word(row + r_offset, col + c_offset, direction.opposite(), board, settings_manager)
-                self.connected = True
-                self.player.score += word.calculate_score(board) * (modify_score)
\ No newline at end of file
+    def apply_move(self, board: ScrabbleBoard, settings_manager: SettingsManager,
+                   result: Optional[MoveResult] = None) -> MoveResult:
+        """Put the move's tiles on the board and add its score, using `result` from `evaluate` when given."""
+        if result is None:
+            result = self.evaluate(board, settings_manager)
+        collector = instrumentation.collector
+        if collector is not None:
+            started = perf_counter()
+        placed_tiles = self.placed_tiles = []
+        placed_positions = self.placed_positions = []
+        self.blank_tiles = []
+        for placed in result.tiles:
+            tile = self._take_tile(self.player, placed.letter, placed.blank)
+            board.get_square(placed.row, placed.col).tile = tile
+            self.player.rack.remove_tile(tile)
+            placed_tiles.append(tile)
+            placed_positions.append((placed.row, placed.col))
+
+        self.result = result
+        self.score = result.score
+        self.player.score += self.score
+        board.update_cross_checks(placed_positions)
+        if collector is not None:
+            collector.record(instrumentation.BOARD_UPDATE, perf_counter() - started)
+        return result
+
+    def undo(self, board: ScrabbleBoard) -> None:
+        """Take an applied move back: lift its tiles off the board, clear blank letters and remove its score."""
+        for row, col in self.placed_positions:
+            board.get_square(row, col).remove_tile()
+        for tile in self.blank_tiles:
+            tile.reset_blank()
+        self.player.score -= self.score
+        board.update_cross_checks(self.placed_positions)
+        self.placed_positions = []
+        self.placed_tiles = []
+        self.blank_tiles = []
+        self.result = None
+        self.score = 0
+
+    def _reserve_tile(self, available: List[int], index: int, char: str) -> int:
+        """Count off the rack tile the letter at `index` needs, falling back to a blank like `Rack.get_tile`
+        unless the move is strict. `available` holds the rack's letter counts. Returns the code of the tile used."""
+        code = letter_code(char)
+        if index not in self.blanks:
+            if available[code] > 0:
+                available[code] -= 1
+                return code
+            if self.strict:
+                raise InsufficientTilesError(f"No '{char.upper()}' in rack; a blank must be marked as one")
+        if available[BLANK_CODE] > 0:
+            available[BLANK_CODE] -= 1
+            return BLANK_CODE
+        raise InsufficientTilesError(f"No tile in rack to play '{char}'")
+
+    def _take_tile(self, player: Player, letter: str, blank: bool):
+        """Take the rack tile for a placed letter, assigning the letter to a blank when one is used."""
+        if blank:
+            tile = player.rack.get_blank_tile(letter)
+            self.blank_tiles.append(tile)
+            return tile
+        return player.rack.get_exact_tile(letter)
+
+    def check_cross_word(self, row: int, col: int, char: str, board: ScrabbleBoard) -> bool:
+        """Check the perpendicular word formed by playing `char` on the empty square at row and column.
+        Returns whether a perpendicular word is formed."""
+        allowed = board.cross_check(row, col, self.direction)
+        if allowed is None:
+            return False
+        if char.lower() not in allowed:
+            raise InvalidWordError(f"Playing '{char}' at ({row}, {col}) forms an invalid word")
+        self.connected = True
+        return True
+
+    def _cross_word(self, board: ScrabbleBoard, row: int, col: int, char: str, score: int,
+                    premiums: Tuple[Tuple[int, int, SquareType], ...]) -> WordScore:
+        """Spell out the perpendicular word through row and column with `char` played there."""
+        step_r = self.direction == Direction.HORIZONTAL
+        step_c = self.direction == Direction.VERTICAL
+        start_row, start_col = row, col
+        while board.has_tile(start_row - step_r, start_col - step_c):
+            start_row -= step_r
+            start_col -= step_c
+        letters = []
+        current_row, current_col = start_row, start_col
+        while (current_row, current_col) == (row, col) or board.has_tile(current_row, current_col):
+            if (current_row, current_col) == (row, col):
+                letters.append(char.upper())
+            else:
+                letters.append(board.get_square(current_row, current_col).tile.letter.upper())
+            current_row += step_r
+            current_col += step_c
+        return WordScore(''.join(letters), start_row, start_col, self.direction.opposite(), score, premiums)
+
+    @staticmethod
+    def _attach_lexicon(board: ScrabbleBoard, settings_manager: SettingsManager) -> None:
+        """Make sure the board can answer cross-check queries."""
+        if board.lexicon is None:
+            board.lexicon = settings_manager.lexicon
@@ -0,0 +1,236 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from array_board import ArrayBoard, NO_CROSS_WORD, SQUARE_TYPES, mask_to_letters
+from board import ScrabbleBoard
+from enums import LETTER_MULTIPLIERS, WORD_MULTIPLIERS, Direction
+from lexicon import SEPARATOR
+from rack import Rack
+from settings_manager import SettingsManager
+from tile import TILE_LETTERS
+
+
+class Placement(NamedTuple):
+    """
+    A legal play found by the generator. `row`, `col`, `word` and `direction`
+    describe the whole main word (existing letters included) the way `Move`
+    expects it, `blanks` holds the indices of the word played with blank tiles
+    and `tiles` the rack tiles used, blanks written as '#'.
+    """
+    row: int
+    col: int
+    direction: Direction
+    word: str
+    blanks: Tuple[int, ...]
+    tiles: str
+    score: int
+
+
+# Plays found on a line, (start, word, blanks, tiles, score), by the line's contents and the rack
+LineCache = Dict[tuple, List[Tuple[int, str, Tuple[int, ...], str, int]]]
+
+
+class _Line:
+    """One row (or column) of the board as seen by a single generation pass."""
+    __slots__ = ('letters', 'values', 'letter_multipliers', 'word_multipliers', 'cross_checks', 'cross_sums', 'anchors')
+
+    def __init__(self, size: int) -> None:
+        self.letters: List[Optional[str]] = [None] * size
+        self.values = [0] * size
+        self.letter_multipliers = [1] * size
+        self.word_multipliers = [1] * size
+        self.cross_checks: List[Optional[str]] = [None] * size
+        self.cross_sums = [0] * size
+        self.anchors = [False] * size
+
+
+class MoveGenerator:
+    """
+    Enumerates every legal play for a rack, GADDAG style (Gordon's refinement of
+    Appel & Jacobson): each play is grown outwards from its leftmost anchor, an
+    empty square next to a tile or the empty start square, with perpendicular
+    words checked against precomputed cross-checks.
+    """
+
+    def __init__(self, settings_manager: SettingsManager) -> None:
+        self._lexicon = settings_manager.lexicon
+        rules = settings_manager.ruleset
+        self._letter_scores = {letter.lower(): score for letter, score in zip(TILE_LETTERS, rules.letter_scores)}
+        self._rack_size = rules.max_rack_size
+        self._bingo_bonus = rules.bingo_bonus
+
+    def generate(self, board: ScrabbleBoard, rack: Rack, line_cache: Optional[LineCache] = None) -> Iterator[Placement]:
+        """
+        Yield every legal placement of tiles from `rack` on `board`, with its score. With a `line_cache`,
+        the plays found on each line are kept in it, keyed by the line's contents and the rack, and a line
+        a later call finds unchanged is not searched again. Searches that revisit nearly the same board
+        many times (the endgame solver) pass one.
+        """
+        if board.lexicon is None:
+            board.lexicon = self._lexicon
+        squares = board.board
+        counts = {letter.lower(): count for letter, count in zip(TILE_LETTERS, rack.counts) if count}
+        rack_key = tuple(sorted(counts.items())) if line_cache is not None else None
+
+        for r in range(len(squares)):
+            line = self._line(board, [(r, c) for c in range(len(squares[0]))], Direction.HORIZONTAL)
+            for start, word, blanks, tiles, score in self._line_plays(line, counts, (Direction.HORIZONTAL, r, rack_key), line_cache):
+                yield Placement(r, start, Direction.HORIZONTAL, word, blanks, tiles, score)
+        for c in range(len(squares[0])):
+            line = self._line(board, [(r, c) for r in range(len(squares))], Direction.VERTICAL)
+            for start, word, blanks, tiles, score in self._line_plays(line, counts, (Direction.VERTICAL, c, rack_key), line_cache):
+                if len(tiles) == 1 and line.cross_checks[self._placed_at(line, start, word)] is not None:
+                    continue  # The same single tile was already generated as a horizontal play
+                yield Placement(start, c, Direction.VERTICAL, word, blanks, tiles, score)
+
+    def _line_plays(self, line: _Line, counts: Dict[str, int], where: tuple,
+                    line_cache: Optional[LineCache]) -> Iterable[Tuple[int, str, Tuple[int, ...], str, int]]:
+        if line_cache is None:
+            return self._generate_line(line, counts)
+        key = (where, tuple(line.letters), tuple(line.values), tuple(line.cross_checks), tuple(line.cross_sums),
+               tuple(line.anchors))
+        plays = line_cache.get(key)
+        if plays is None:
+            plays = line_cache[key] = list(self._generate_line(line, counts))
+        return plays
+
+    @staticmethod
+    def _line(board: ScrabbleBoard, positions: List[Tuple[int, int]], direction: Direction) -> _Line:
+        """Read one row or column of the board, with the board's cached cross-checks for `direction`."""
+        if isinstance(board, ArrayBoard):
+            return MoveGenerator._array_line(board, positions, direction)
+        line = _Line(len(positions))
+        for i, (r, c) in enumerate(positions):
+            square = board.get_square(r, c)
+            line.letter_multipliers[i] = LETTER_MULTIPLIERS.get(square.square_type, 1)
+            line.word_multipliers[i] = WORD_MULTIPLIERS.get(square.square_type, 1)
+            if square.tile is not None:
+                line.letters[i] = square.tile.letter.lower()
+                line.values[i] = square.tile.value
+                continue
+            line.cross_checks[i] = board.cross_check(r, c, direction)
+            line.cross_sums[i] = board.cross_sum(r, c, direction)
+            line.anchors[i] = board.is_anchor(r, c, direction)
+        return line
+
+    @staticmethod
+    def _array_line(board: ArrayBoard, positions: List[Tuple[int, int]], direction: Direction) -> _Line:
+        """Read one row or column straight from an array board's buffers."""
+        line = _Line(len(positions))
+        letters, values, premiums = board.letters, board.values, board.premiums
+        board.cross_check_mask(*positions[0], direction)
+        checks, sums, anchors = board._cross_checks[direction], board._cross_sums[direction], board._anchors[direction]
+        for i, (r, c) in enumerate(positions):
+            index = r * board.cols + c
+            square_type = SQUARE_TYPES[premiums[index]]
+            line.letter_multipliers[i] = LETTER_MULTIPLIERS.get(square_type, 1)
+            line.word_multipliers[i] = WORD_MULTIPLIERS.get(square_type, 1)
+            if letters[index]:
+                line.letters[i] = chr(letters[index]).lower()
+                line.values[i] = values[index]
+                continue
+            mask = checks[index]
+            line.cross_checks[i] = None if mask == NO_CROSS_WORD else mask_to_letters(mask)
+            line.cross_sums[i] = sums[index]
+            line.anchors[i] = bool(anchors[index])
+        return line
+
+    @staticmethod
+    def _placed_at(line: _Line, start: int, word: str) -> int:
+        """Position of the first newly placed tile of a play found on `line`."""
+        for pos in range(start, start + len(word)):
+            if line.letters[pos] is None:
+                return pos
+        raise ValueError('Play places no tiles')
+
+    def _generate_line(self, line: _Line, counts: Dict[str, int]) -> Iterator[Tuple[int, str, Tuple[int, ...], str, int]]:
+        for anchor, is_anchor in enumerate(line.anchors):
+            if is_anchor:
+                yield from self._generate_from_anchor(line, anchor, counts)
+
+    def _generate_from_anchor(self, line: _Line, anchor: int, counts: Dict[str, int]) -> Iterator[Tuple[int, str, Tuple[int, ...], str, int]]:
+        """Yield (start, word, blanks, tiles, score) for every play whose leftmost anchor is `anchor`."""
+        lexicon = self._lexicon
+        letter_scores = self._letter_scores
+        rack_size = self._rack_size
+        bingo_bonus = self._bingo_bonus
+        letters = line.letters
+        values = line.values
+        letter_multipliers = line.letter_multipliers
+        word_multipliers = line.word_multipliers
+        cross_checks = line.cross_checks
+        cross_sums = line.cross_sums
+        anchors = line.anchors
+        size = len(letters)
+        placed: Dict[int, Tuple[str, bool]] = {}
+
+        def record(start: int, end: int, main: int, multiplier: int, cross: int) -> Tuple[int, str, Tuple[int, ...], str, int]:
+            word = []
+            blanks = []
+            tiles = []
+            for pos in range(start, end + 1):
+                if pos in placed:
+                    letter, blank = placed[pos]
+                    tiles.append('#' if blank else letter.upper())
+                    if blank:
+                        blanks.append(pos - start)
+                else:
+                    letter = letters[pos]
+                word.append(letter)
+            score = main * multiplier + cross + (bingo_bonus if len(placed) == rack_size else 0)
+            return start, ''.join(word).upper(), tuple(blanks), ''.join(tiles), score
+
+        def place_options(pos: int, node: int):
+            """Yield (letter, child, value, blank) for every tile that may be put on the empty square `pos`."""
+            allowed = cross_checks[pos]
+            for letter, child in lexicon.children(node):
+                if letter == SEPARATOR or (allowed is not None and letter not in allowed):
+                    continue
+                if counts.get(letter):
+                    yield letter, child, letter_scores.get(letter, 0), False
+                if counts.get('#'):
+                    yield letter, child, 0, True
+
+        def go_on(pos: int, node: int, left: int, main: int, multiplier: int, cross: int, leftwards: bool):
+            """Continue from the square `pos` that was just covered, reaching `node`."""
+            if not leftwards:
+                if lexicon.is_terminal(node) and not occupied(pos + 1):
+                    yield record(left, pos, main, multiplier, cross)
+                if pos + 1 < size:
+                    yield from extend(pos + 1, node, left, main, multiplier, cross, False)
+                return
+            if lexicon.is_terminal(node) and anchor > left and not occupied(left - 1) and not occupied(anchor + 1):
+                yield record(left, anchor, main, multiplier, cross)
+            if left > 0 and (letters[left - 1] is not None or not anchors[left - 1]):
+                yield from extend(left - 1, node, left - 1, main, multiplier, cross, True)
+            if anchor + 1 < size and not occupied(left - 1):
+                turned = lexicon.child(node, SEPARATOR)
+                if turned is not None:
+                    yield from extend(anchor + 1, turned, left, main, multiplier, cross, False)
+
+        def occupied(pos: int) -> bool:
+            return 0 <= pos < size and letters[pos] is not None
+
+        def extend(pos: int, node: int, left: int, main: int, multiplier: int, cross: int, leftwards: bool):
+            """Cover square `pos` with the tile already there or with each playable rack tile."""
+            existing = letters[pos]
+            if existing is not None:
+                child = lexicon.child(node, existing)
+                if child is not None:
+                    yield from go_on(pos, child, left, main + values[pos], multiplier, cross, leftwards)
+                return
+            if len(placed) == rack_size:
+                return
+            for letter, child, value, blank in place_options(pos, node):
+                key = '#' if blank else letter
+                counts[key] -= 1
+                placed[pos] = (letter, blank)
+                letter_score = value * letter_multipliers[pos]
+                word_multiplier = word_multipliers[pos]
+                cross_score = cross
+                if cross_checks[pos] is not None:
+                    cross_score += (cross_sums[pos] + letter_score) * word_multiplier
+                yield from go_on(pos, child, left, main + letter_score, multiplier * word_multiplier, cross_score, leftwards)
+                del placed[pos]
+                counts[key] += 1
+
+        yield from extend(anchor, lexicon.root, anchor, 0, 1, 0, True)
@@ -0,0 +1,289 @@
+import atexit
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Tuple, Union
+
+from exceptions import LexiconFormatError
+from lexicon import Lexicon, SEPARATOR
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+# multiprocessing and argparse are imported where they are used: interactive programs that
+# only open a lexicon should not pay for them at startup
+
+MAGIC = b'SLEX'
+FORMAT_VERSION = 1
+
+# magic, version, header size, node count, edge count, word count, sha256 of the body
+HEADER = struct.Struct('<4sHHIII32s')
+HEADER_SIZE = 64
+
+# Node word: first edge index << 6 | terminal << 5 | edge count
+# Edge word: target node << 5 | letter code
+COUNT_MASK = 0x1F
+TERMINAL_BIT = 0x20
+FIRST_EDGE_SHIFT = 6
+CODE_MASK = 0x1F
+TARGET_SHIFT = 5
+
+LETTERS = SEPARATOR + 'abcdefghijklmnopqrstuvwxyz'
+CODES = {letter: code for code, letter in enumerate(LETTERS)}
+
+
+def pack_lexicon(lexicon: Lexicon) -> bytes:
+    """Serialize a lexicon into the versioned binary format: header, node array, edge array."""
+    nodes = array('I')
+    edges = array('I')
+    for node in range(lexicon.node_count):
+        children = sorted((CODES[letter], child) for letter, child in lexicon.children(node))
+        terminal = TERMINAL_BIT if lexicon.is_terminal(node) else 0
+        nodes.append(len(edges) << FIRST_EDGE_SHIFT | terminal | len(children))
+        edges.extend(child << TARGET_SHIFT | code for code, child in children)
+    if sys.byteorder != 'little':
+        nodes.byteswap()
+        edges.byteswap()
+    body = nodes.tobytes() + edges.tobytes()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, HEADER_SIZE, len(nodes), len(edges), len(lexicon),
+                         hashlib.sha256(body).digest())
+    return header.ljust(HEADER_SIZE, b'\0') + body
+
+
+def compile_lexicon(source: Union[str, Iterable[str], Lexicon], path: str) -> None:
+    """Compile a word list file, an iterable of words or a lexicon into a binary lexicon file."""
+    if isinstance(source, str):
+        source = Lexicon.from_file(source)
+    elif not isinstance(source, Lexicon):
+        source = Lexicon.from_words(source)
+    with open(path, 'wb') as f:
+        f.write(pack_lexicon(source))
+
+
+def load_lexicon(path: str) -> Lexicon:
+    """
+    Load the word list at `path` through its compiled form (same name, `.lex` extension).
+    The compiled file is (re)built when it is missing, older than the word list or unreadable.
+    """
+    compiled = os.path.splitext(path)[0] + '.lex'
+    try:
+        if os.path.getmtime(compiled) >= os.path.getmtime(path):
+            return PackedLexicon.open(compiled)
+    except (OSError, LexiconFormatError):
+        pass
+    lexicon = Lexicon.from_file(path)
+    try:
+        compile_lexicon(lexicon, compiled)
+    except OSError:
+        return lexicon
+    return PackedLexicon.open(compiled)
+
+
+def load_lexicon_in_background(path: str) -> 'Future[Lexicon]':
+    """
+    Start loading the word list at `path` like `load_lexicon`, on a daemon thread, and return the
+    Future of the lexicon. A SettingsManager given the Future only waits for it on first use.
+    """
+    future: 'Future[Lexicon]' = Future()
+    future.set_running_or_notify_cancel()
+
+    def load() -> None:
+        try:
+            future.set_result(load_lexicon(path))
+        except BaseException as e:
+            future.set_exception(e)
+    threading.Thread(target=load, name=f'load {path}', daemon=True).start()
+    return future
+
+
+class PackedLexicon(Lexicon):
+    """
+    A lexicon answering queries straight from a compiled buffer, typically a
+    read-only memory map. Nodes are indices into the packed node array, so no
+    Python objects are created per word or per node.
+    """
+
+    def __init__(self, buffer, verify: bool = True) -> None:
+        view = memoryview(buffer)
+        if len(view) < HEADER_SIZE:
+            raise LexiconFormatError('Lexicon file is truncated')
+        magic, version, header_size, node_count, edge_count, word_count, checksum = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise LexiconFormatError('Not a compiled lexicon')
+        if version != FORMAT_VERSION:
+            raise LexiconFormatError(f'Unsupported lexicon format version {version}')
+        end = header_size + 4 * (node_count + edge_count)
+        if len(view) < end:
+            raise LexiconFormatError('Lexicon file is truncated')
+        body = view[header_size:end]
+        if verify and hashlib.sha256(body).digest() != checksum:
+            raise LexiconFormatError('Lexicon checksum mismatch')
+        if sys.byteorder != 'little':
+            body = memoryview(_byteswapped(body))
+
+        words = body.cast('I')
+        self._nodes = words[:node_count]
+        self._edges = words[node_count:]
+        self._buffer = buffer
+        self._exports = [self._nodes, self._edges, words, body, view]
+        self._node_count = node_count
+        self._edge_count = edge_count
+        self._word_count = word_count
+        self._dawg = None
+        self._digest = checksum
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def open(cls, path: str, verify: bool = True) -> 'PackedLexicon':
+        """Memory-map a compiled lexicon file read-only."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        lexicon = cls(mapped, verify)
+        lexicon._mmap = mapped
+        return lexicon
+
+    @property
+    def node_count(self) -> int:
+        return self._node_count
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    def child(self, node: int, letter: str) -> Optional[int]:
+        code = CODES.get(letter)
+        if code is None:
+            return None
+        word = self._nodes[node]
+        first = word >> FIRST_EDGE_SHIFT
+        edges = self._edges
+        for index in range(first, first + (word & COUNT_MASK)):
+            edge = edges[index]
+            edge_code = edge & CODE_MASK
+            if edge_code == code:
+                return edge >> TARGET_SHIFT
+            if edge_code > code:
+                return None
+        return None
+
+    def children(self, node: int) -> Iterator[Tuple[str, int]]:
+        word = self._nodes[node]
+        first = word >> FIRST_EDGE_SHIFT
+        edges = self._edges
+        for index in range(first, first + (word & COUNT_MASK)):
+            edge = edges[index]
+            yield LETTERS[edge & CODE_MASK], edge >> TARGET_SHIFT
+
+    def is_terminal(self, node: int) -> bool:
+        return bool(self._nodes[node] & TERMINAL_BIT)
+
+    def close(self) -> None:
+        """Release the buffer. The lexicon cannot be used afterwards."""
+        for export in self._exports:
+            export.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'PackedLexicon':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'PackedLexicon(words={self._word_count}, nodes={self._node_count})'
+
+
+class SharedLexicon(PackedLexicon):
+    """
+    A packed lexicon in a named shared memory block, so that worker processes query one
+    copy of it instead of each holding their own. One process `publish`es the lexicon and
+    owns the block: it is unlinked when the owner closes the lexicon or exits. Workers
+    `attach` by name and see the block read-only. Pickling a shared lexicon sends only
+    its name, so it can be passed to pool initializers as is.
+    """
+
+    def __init__(self, memory: 'SharedMemory', owner: bool, verify: bool = True) -> None:
+        super().__init__(memory.buf.toreadonly(), verify)
+        self._exports.append(self._buffer)
+        self._memory: Optional['SharedMemory'] = memory
+        self._owner = owner
+
+    @classmethod
+    def publish(cls, lexicon: Lexicon, name: Optional[str] = None) -> 'SharedLexicon':
+        """Copy `lexicon`, packed, into a new shared memory block (named `name`, or a fresh name)."""
+        from multiprocessing.shared_memory import SharedMemory
+        data = lexicon._buffer if isinstance(lexicon, PackedLexicon) else pack_lexicon(lexicon)
+        memory = SharedMemory(name, create=True, size=len(data))
+        memory.buf[:len(data)] = data
+        shared = cls(memory, owner=True, verify=False)
+        atexit.register(shared.close)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, verify: bool = False) -> 'SharedLexicon':
+        """Attach to the lexicon another process published as `name`."""
+        from multiprocessing import resource_tracker
+        from multiprocessing.shared_memory import SharedMemory
+        try:
+            memory = SharedMemory(name, track=False)
+        except TypeError:  # Before Python 3.13 attaching always registers the block with a resource tracker
+            inherited = resource_tracker._resource_tracker._fd is not None
+            memory = SharedMemory(name)
+            if not inherited:
+                # A tracker of this process's own would unlink the block when this process exits.
+                # Workers started by multiprocessing share the owner's tracker and leave it be.
+                resource_tracker.unregister(memory._name, 'shared_memory')
+        return cls(memory, owner=False, verify=verify)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def close(self) -> None:
+        """Detach from the shared block, and unlink it when this process published it."""
+        if self._memory is None:
+            return
+        super().close()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            atexit.unregister(self.close)
+        self._memory = None
+
+    def __reduce__(self):
+        return SharedLexicon.attach, (self.name,)
+
+    def __repr__(self) -> str:
+        return f'SharedLexicon(name={self._memory.name if self._memory else None!r}, words={self._word_count})'
+
+
+def _byteswapped(body: memoryview) -> bytes:
+    words = array('I', body.tobytes())
+    words.byteswap()
+    return words.tobytes()
+
+
+def main(argv: Optional[list] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description='Scrabble lexicon tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser('compile-lexicon', help='compile a word list into a binary lexicon')
+    compile_parser.add_argument('source', help='word list, one word per line')
+    compile_parser.add_argument('output', help='path of the compiled lexicon')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile-lexicon':
+        compile_lexicon(args.source, args.output)
+        with PackedLexicon.open(args.output) as lexicon:
+            print(f'Wrote {args.output}: {lexicon!r}')
+
+
+if __name__ == '__main__':
+    main()
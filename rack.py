@@ -1,12 +1,29 @@
 from bag import ScrabbleBag
 from settings_manager import SettingsManager
-from tile import ScrabbleTile
-from exceptions import RackSizeError, TileNotInRackError
+from tile import BLANK, BLANK_CODE, LETTER_CODES, TILE_LETTERS, ScrabbleTile
+from exceptions import InsufficientTilesError, InvalidLetterError, RackSizeError, TileNotInRackError
+
+def tile_code(tile: ScrabbleTile) -> int:
+    """Index of the tile in TILE_LETTERS. Blanks count as blanks even after they were given a letter."""
+    return tile.code
+
+def letter_code(char: str) -> int:
+    try:
+        return LETTER_CODES[char.upper()]
+    except KeyError:
+        raise InvalidLetterError(f"'{char}' is not a tile letter") from None
 
 class Rack:
+    """
+    The tiles a player holds. Next to the tiles the rack keeps a count per letter
+    (indexed like TILE_LETTERS, blanks last), so availability checks, subset tests
+    and leave keys never scan the tiles.
+    """
+
     def __init__(self, bag: ScrabbleBag, settings_manager: SettingsManager) -> None:
-        self._max_rack_size = settings_manager.game_mechanics.max_rack_size
+        self._max_rack_size = settings_manager.ruleset.max_rack_size
         self._tiles: list[ScrabbleTile] = []
+        self._counts = [0] * len(TILE_LETTERS)
         self.refill(bag)
 
     @property
@@ -17,55 +34,126 @@ class Rack:
     def max_rack_size(self) -> int:
         return self._max_rack_size
 
-    def refill(self, bag: ScrabbleBag) -> None:
-        for _ in range(min(len(bag), self.max_rack_size - len(self))):
-            self._tiles.append(bag.draw_tile())
+    @property
+    def counts(self) -> list[int]:
+        """Get a copy of the number of tiles per letter, indexed like TILE_LETTERS."""
+        return self._counts.copy()
+
+    def refill(self, bag: ScrabbleBag) -> list[ScrabbleTile]:
+        """Draw from `bag` until the rack is full or the bag is empty. Returns the tiles drawn."""
+        drawn = [bag.draw_tile() for _ in range(min(len(bag), self.max_rack_size - len(self)))]
+        for tile in drawn:
+            self._tiles.append(tile)
+            self._counts[tile.code] += 1
         self.sort()
+        return drawn
 
     def exchange_tiles(self, tiles: str, bag: ScrabbleBag) -> None:
+        """
+        Put `tiles` ('#' for blanks) back in `bag` and draw as many. The whole exchange is checked
+        first, so on an error neither the rack nor the bag has changed.
+        """
         if len(tiles) > self.max_rack_size:
             raise RackSizeError('Cannot exchange more tiles than the rack can hold')
-        for tile in tiles:
-            storedTile = self.get_exact_tile(tile)
-            if storedTile is None:
-                raise TileNotInRackError(f"Tile '{tile}' not found in rack")
-            self._tiles.remove(storedTile)
+        needed = [0] * len(TILE_LETTERS)
+        for char in tiles:
+            needed[letter_code(char)] += 1
+        for code, count in enumerate(needed):
+            if count > self._counts[code]:
+                raise TileNotInRackError(f"Tile '{TILE_LETTERS[code]}' not found in rack")
+        if len(tiles) > len(bag):
+            raise InsufficientTilesError(f'Cannot exchange {len(tiles)} tiles with {len(bag)} left in the bag')
+        for char in tiles:
+            storedTile = self.get_exact_tile(char)
+            self.remove_tile(storedTile)
             bag.deposit_tile(storedTile)
         self.refill(bag)
 
+    def count(self, char: str) -> int:
+        """Number of tiles with the letter `char` ('#' for blanks)."""
+        return self._counts[letter_code(char)]
+
     def has_tile(self, char: str) -> bool:
-        return any(tile == char or (tile == '#' and char != '#') for tile in self._tiles)
-    
+        code = letter_code(char)
+        return self._counts[code] > 0 or (code != BLANK_CODE and self._counts[BLANK_CODE] > 0)
+
     def has_exact_tile(self, char: str) -> bool:
-        return any(tile == char for tile in self._tiles)
+        return self._counts[letter_code(char)] > 0
+
+    def can_make(self, letters: str) -> bool:
+        """Whether the rack holds the tiles to play `letters`, using blanks for missing letters. '#' asks for a blank."""
+        needed = [0] * len(TILE_LETTERS)
+        for char in letters:
+            needed[letter_code(char)] += 1
+        counts = self._counts
+        blanks = counts[BLANK_CODE] - needed[BLANK_CODE]
+        for code in range(BLANK_CODE):
+            if needed[code] > counts[code]:
+                blanks -= needed[code] - counts[code]
+        return blanks >= 0
+
+    def leave_key(self, played: str = '') -> str:
+        """
+        The tiles left after playing `played` ('#' for blanks), in TILE_LETTERS order: a canonical
+        key for the leave. Raises TileNotInRackError if the rack does not hold `played`.
+        """
+        counts = self._counts.copy()
+        for char in played:
+            code = letter_code(char)
+            if counts[code] == 0:
+                raise TileNotInRackError(f"Tile '{char}' not found in rack")
+            counts[code] -= 1
+        return ''.join(letter * count for letter, count in zip(TILE_LETTERS, counts))
 
     def sort(self) -> None:
         self._tiles.sort()
 
     def pop(self, index: int) -> ScrabbleTile:
-        return self._tiles.pop(index)
+        tile = self._tiles.pop(index)
+        self._counts[tile_code(tile)] -= 1
+        return tile
 
     def get_tile(self, char: str) -> ScrabbleTile:
-        for tile in self._tiles:
-            if tile == char:
-                return tile
-        for tile in self._tiles:
-            if tile == '#':
-                tile.letter = char
-                return tile
+        if self._counts[letter_code(char)] > 0:
+            return self.get_exact_tile(char)
+        if char != BLANK and self._counts[BLANK_CODE] > 0:
+            return self.get_blank_tile(char)
         raise TileNotInRackError(f"Tile '{char}' not found in rack")
-    
+
+    def get_blank_tile(self, char: str) -> ScrabbleTile:
+        if self._counts[BLANK_CODE] > 0:
+            for tile in self._tiles:
+                if tile == BLANK:
+                    tile.letter = char
+                    return tile
+        raise TileNotInRackError(f"No blank tile in rack to play as '{char}'")
+
     def get_exact_tile(self, char: str) -> ScrabbleTile:
-        for tile in self._tiles:
-            if tile == char:
-                return tile
+        code = letter_code(char)
+        if self._counts[code] > 0:
+            for tile in self._tiles:
+                if tile_code(tile) == code:
+                    return tile
         raise TileNotInRackError(f"Tile '{char}' not found in rack")
 
+    def replace_tiles(self, tiles: list[ScrabbleTile]) -> None:
+        if len(tiles) > self.max_rack_size:
+            raise RackSizeError('Cannot hold more tiles than the rack size')
+        self._tiles = list(tiles)
+        self._counts = [0] * len(TILE_LETTERS)
+        for tile in self._tiles:
+            self._counts[tile_code(tile)] += 1
+
     def remove_tile(self, tile: ScrabbleTile) -> None:
-        try:
-            self._tiles.remove(tile)
-        except ValueError:
-            raise TileNotInRackError('Tile not in rack')
+        for index, held in enumerate(self._tiles):
+            if held is tile:
+                break
+        else:
+            try:
+                index = self._tiles.index(tile)
+            except ValueError:
+                raise TileNotInRackError('Tile not in rack')
+        self._counts[tile_code(self._tiles.pop(index))] -= 1
 
     def __lt__(self, other: 'Rack') -> bool:
         if not isinstance(other, Rack):
@@ -87,4 +175,4 @@ class Rack:
         return f'Rack({self._tiles})'
 
     def __str__(self):
-        return ' '.join(str(tile) for tile in self._tiles)
\ No newline at end of file
+        return ' '.join(str(tile) for tile in self._tiles)
@@ -0,0 +1,296 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bag import ScrabbleBag
+from board import ScrabbleBoard
+from enums import Direction, EventType
+from exceptions import ScrabbleError, TileNotInBagError
+from game import Game
+from gcg import GcgRecord, GcgTurn, parse_gcg
+from lexicon import Lexicon
+from move import Move
+from packed_lexicon import SharedLexicon, load_lexicon
+from player import Player
+from settings_manager import SettingsManager
+from tile import BLANK
+
+
+class Divergence(NamedTuple):
+    """Where a replayed record first disagrees with the engine."""
+    line: int
+    message: str
+
+
+class ReplayResult(NamedTuple):
+    """The outcome of replaying one record file."""
+    path: str
+    turns: int
+    divergence: Optional[Divergence]
+    seconds: float
+
+
+class _ScriptedBag(ScrabbleBag):
+    """A bag that deals the tiles it is told to, in order, before drawing at random."""
+
+    def __init__(self, settings_manager: SettingsManager) -> None:
+        super().__init__(settings_manager, random.Random(0))
+        self.script: List[str] = []
+
+    def draw_tile(self):
+        if self.script:
+            return self.take_tile(self.script.pop())
+        return super().draw_tile()
+
+
+class _Mismatch(Exception):
+    pass
+
+
+def _next_racks(turns: List[GcgTurn]) -> List[Optional[str]]:
+    """For every turn, the rack its player holds at their next turn (or end of game penalty), if any."""
+    following: List[Optional[str]] = [None] * len(turns)
+    latest: Dict[str, str] = {}
+    for index in range(len(turns) - 1, -1, -1):
+        turn = turns[index]
+        following[index] = latest.get(turn.nick)
+        if turn.type != EventType.RESIGN:
+            latest[turn.nick] = turn.rack
+    return following
+
+
+def _draws(leave: Counter, next_rack: Optional[str]) -> List[str]:
+    """Letters to deal after a turn so that its player ends up with `next_rack`, last one first."""
+    if next_rack is None:
+        return []
+    return list((Counter(next_rack) - leave).elements())[::-1]
+
+
+def _check(condition: bool, message: str) -> None:
+    if not condition:
+        raise _Mismatch(message)
+
+
+def _word(game: Game, turn: GcgTurn) -> Move:
+    """The move of a turn line, with the '.' squares filled in from the board. Only lower-case letters may be blanks."""
+    step_r, step_c = (1, 0) if turn.direction == Direction.VERTICAL else (0, 1)
+    letters = []
+    blanks = []
+    for index, letter in enumerate(turn.word):
+        if letter == '.':
+            tile = game.board.get_square(turn.row + index * step_r, turn.col + index * step_c).tile
+            _check(tile is not None, f"'.' at {index + 1} of {turn.word} is an empty square")
+            letter = tile.letter
+        elif letter.islower():
+            blanks.append(index)
+        letters.append(letter.upper())
+    return Move(turn.row, turn.col, ''.join(letters), turn.direction, game.current_player, blanks, strict=True)
+
+
+def replay_record(record: GcgRecord, lexicon: Lexicon, settings_dict: Optional[dict] = None,
+                  settings_manager: Optional[SettingsManager] = None) -> Tuple[int, Optional[Divergence]]:
+    """
+    Re-execute a game record and check every turn: the player to move, their rack against the tiles
+    left, the legality of each move under the lexicon and settings, every score and running total and
+    the end of game penalties. The bag deals each player the tiles their next recorded rack shows.
+    Returns the number of turns replayed and the first Divergence, or None when the record checks out.
+    """
+    settings_manager = settings_manager or SettingsManager(lexicon, settings_dict)
+    turns = record.turns
+    following = _next_racks(turns)
+    replayed = 0
+    try:
+        _check(bool(record.players), 'No players')
+        bag = _ScriptedBag(settings_manager)
+        board = ScrabbleBoard(settings_manager.board_settings.default_board_layout, settings_manager.lexicon)
+        players = [Player(name, bag, settings_manager) for _, name in record.players]
+        by_nick = {nick: player for (nick, _), player in zip(record.players, players)}
+        game = Game.from_state(settings_manager, board, bag, players, players[0], 0)
+        first_racks = {}
+        for turn in turns:
+            if turn.type != EventType.RESIGN:
+                first_racks.setdefault(turn.nick, turn.rack)
+        for player in players:
+            game.set_rack('', player)
+        for nick, rack in first_racks.items():
+            _check(nick in by_nick, f"Unknown player '{nick}'")
+            try:
+                game.set_rack(rack, by_nick[nick])
+            except ScrabbleError as e:
+                raise _Mismatch(f'Opening rack {rack}: {e}') from None
+    except _Mismatch as e:
+        return 0, Divergence(turns[0].line if turns else 0, str(e))
+
+    penalised = False
+    for turn, next_rack in zip(turns, following):
+        try:
+            _check(turn.nick in by_nick, f"Unknown player '{turn.nick}'")
+            player = by_nick[turn.nick]
+            if turn.type == EventType.PENALTY:
+                if not penalised:
+                    _check(game.is_over, 'Penalty before the end of the game')
+                    game.apply_end_game_penalties()
+                    penalised = True
+                held = ''.join(tile.letter for tile in player.rack)
+                _check(Counter(held) == Counter(turn.rack), f'Rack is {held}, record has {turn.rack}')
+                penalty = -sum(tile.value for tile in player.rack)
+                _check(turn.score == penalty, f'Penalty is {penalty}, record has {turn.score}')
+                _check(turn.total == player.score, f'Total is {player.score}, record has {turn.total}')
+                replayed += 1
+                continue
+            _check(not game.is_over, 'Turn after the end of the game')
+            _check(player is game.current_player, f'{game.current_player.name} is to move, not {player.name}')
+            if turn.type == EventType.RESIGN:
+                game.resign(player)
+                replayed += 1
+                continue
+            held = ''.join(tile.letter for tile in player.rack)
+            _check(Counter(held) == Counter(turn.rack), f'Rack is {held}, record has {turn.rack}')
+            leave = Counter(turn.rack)
+            if turn.type == EventType.MOVE:
+                leave -= Counter(BLANK if letter.islower() else letter for letter in turn.word if letter != '.')
+            elif turn.type == EventType.EXCHANGE:
+                leave -= Counter(turn.exchanged)
+            bag.script = _draws(leave, next_rack)
+            try:
+                if turn.type == EventType.MOVE:
+                    score = game.make(_word(game, turn)).score
+                elif turn.type == EventType.EXCHANGE:
+                    game.exchange_tiles(turn.exchanged, player)
+                    score = 0
+                else:
+                    game.pass_turn(player)
+                    score = 0
+            except TileNotInBagError as e:
+                raise _Mismatch(f'Cannot draw the next rack {next_rack}: {e}') from None
+            except ScrabbleError as e:
+                raise _Mismatch(f'Illegal {turn.type.value}: {e}') from None
+            finally:
+                bag.script = []
+            _check(score == turn.score, f'Score is {score}, record has {turn.score}')
+            _check(player.score == turn.total, f'Total is {player.score}, record has {turn.total}')
+            replayed += 1
+        except _Mismatch as e:
+            return replayed, Divergence(turn.line, str(e))
+    return replayed, None
+
+
+def replay_file(path: str, settings_manager: SettingsManager) -> ReplayResult:
+    """Replay the GCG record at `path`. Unreadable records count as diverging at line 0."""
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8') as f:
+            record = parse_gcg(f)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return ReplayResult(path, 0, Divergence(0, str(e)), time.perf_counter() - start)
+    turns, divergence = replay_record(record, settings_manager.lexicon, settings_manager=settings_manager)
+    return ReplayResult(path, turns, divergence, time.perf_counter() - start)
+
+
+def find_records(paths: Iterable[str]) -> Iterator[str]:
+    """The given record files, and the .gcg files under the given directories in sorted order."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.gcg'):
+                    yield os.path.join(root, name)
+
+
+_worker_settings: Optional[SettingsManager] = None
+
+
+def _init_worker(lexicon: SharedLexicon, settings_dict: Optional[dict]) -> None:
+    global _worker_settings
+    _worker_settings = SettingsManager(lexicon, settings_dict)
+
+
+def _replay_batch(paths: List[str]) -> List[ReplayResult]:
+    return [replay_file(path, _worker_settings) for path in paths]
+
+
+def _batches(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def replay_corpus(paths: Iterable[str], lexicon_path: str = 'enable.txt', settings_dict: Optional[dict] = None,
+                  workers: Optional[int] = None, batch_size: int = 64) -> Iterator[ReplayResult]:
+    """
+    Replay record files across a process pool, `batch_size` files per task, yielding the results in
+    the order of `paths` as they come in. Only a few batches per worker are in flight at a time, so
+    `paths` may be a lazy stream of any length.
+    """
+    workers = workers or os.cpu_count() or 1
+    with SharedLexicon.publish(load_lexicon(lexicon_path)) as lexicon, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(lexicon, settings_dict)) as executor:
+        running: Deque = deque()
+        for batch in _batches(paths, batch_size):
+            running.append(executor.submit(_replay_batch, batch))
+            if len(running) >= workers * 4:
+                yield from running.popleft().result()
+        while running:
+            yield from running.popleft().result()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Replay GCG game records and check them against the engine')
+    parser.add_argument('paths', nargs='+', help='GCG files, or directories to search for .gcg files')
+    parser.add_argument('--lexicon', default='enable.txt', help='word list, one word per line')
+    parser.add_argument('--settings', help='JSON settings file')
+    parser.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    parser.add_argument('--batch-size', type=int, default=64, help='records per worker task')
+    parser.add_argument('--output', help='write one JSON line per record to this file')
+    args = parser.parse_args(argv)
+
+    settings_dict = None
+    if args.settings:
+        with open(args.settings) as f:
+            settings_dict = json.load(f)
+    games = turns = diverged = 0
+    first: Optional[ReplayResult] = None
+    start = time.perf_counter()
+    out = open(args.output, 'w') if args.output else None
+    try:
+        for result in replay_corpus(find_records(args.paths), args.lexicon, settings_dict,
+                                    args.workers, args.batch_size):
+            games += 1
+            turns += result.turns
+            if result.divergence is not None:
+                diverged += 1
+                first = first or result
+            if out is not None:
+                record = {'path': result.path, 'turns': result.turns, 'seconds': round(result.seconds, 6)}
+                if result.divergence is not None:
+                    record.update(line=result.divergence.line, divergence=result.divergence.message)
+                out.write(json.dumps(record) + '\n')
+    finally:
+        if out is not None:
+            out.close()
+    seconds = time.perf_counter() - start
+    print(f'Replayed {games} games, {turns} turns in {seconds:.1f}s '
+          f'({games / seconds:,.1f} games/s, {turns / seconds:,.1f} turns/s)')
+    if first is None:
+        print('All records check out')
+        return
+    print(f'{diverged} records diverge; first: {first.path}:{first.divergence.line}: {first.divergence.message}')
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
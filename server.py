@@ -0,0 +1,607 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import exceptions
+from endgame import solve_endgame
+from enums import Direction
+from exceptions import NotPlayersTurnError, ProtocolError, ScrabbleError, UnknownGameError
+from game import Game
+from lexicon import Lexicon
+from move import MoveResult
+from move_generator import MoveGenerator, Placement
+from packed_lexicon import load_lexicon
+from player import Player
+from settings_manager import SettingsManager
+from snapshot import restore, snapshot
+from spectators import GameBroadcaster, closed_message, snapshot_message
+from tile import BLANK
+from word_search import AnagramIndex, match_pattern
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 64 * 1024
+MAX_WORDS = 1000
+MAX_NAME_LENGTH = 64
+# Word queries run on the analysis executor, and anagrams of many letters with blanks take seconds
+MAX_QUERY_LETTERS = 15
+MAX_PARTIAL_LETTERS = 12
+MAX_QUERY_BLANKS = 2
+MAX_TIME = 60.0
+# Spectators whose connection has this much unsent data stop being sent turns
+MAX_WATCH_BACKLOG = 1024 * 1024
+_REQUIRED = object()
+
+
+class HostedGame:
+    """
+    A game served by a GameServer. Commands on one game run one at a time, in arrival order.
+    Turns are pushed to the connections in `watchers`, each encoded once for all of them.
+    """
+    __slots__ = ('id', 'game', 'lock', 'finished', 'broadcaster', 'watchers')
+
+    def __init__(self, game_id: str, game: Game) -> None:
+        self.id = game_id
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.finished = False
+        self.watchers: Set['_Connection'] = set()
+        self.broadcaster = GameBroadcaster(game)
+        self.broadcaster.subscribe(self._push)
+
+    def watch_line(self, message: dict) -> bytes:
+        return json.dumps({'watch': self.id, **message}).encode() + b'\n'
+
+    def _push(self, message: dict) -> None:
+        if not self.watchers:
+            return
+        line = self.watch_line(message)
+        for connection in list(self.watchers):
+            writer = connection.writer
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_WATCH_BACKLOG:
+                self.unwatch(connection)
+            else:
+                writer.write(line)
+
+    def unwatch(self, connection: '_Connection') -> None:
+        self.watchers.discard(connection)
+        connection.watching.discard(self)
+
+    def close(self) -> None:
+        """Tell the watchers the game is no longer hosted and stop sending them anything."""
+        line = self.watch_line(closed_message(self.game))
+        for connection in list(self.watchers):
+            if not connection.writer.is_closing():
+                connection.writer.write(line)
+            self.unwatch(connection)
+
+
+class _Connection:
+    """A client connection, and the games it watches."""
+    __slots__ = ('writer', 'watching')
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.watching: Set[HostedGame] = set()
+
+
+def game_state(game: Game) -> dict:
+    """
+    The position of `game` as plain data. Boards are given one string per row, '.' for
+    empty squares and lower case for blanks; blanks on racks are '#'.
+    """
+    rows = []
+    for squares in game.board.board:
+        letters = []
+        for square in squares:
+            tile = square.tile
+            if tile is None:
+                letters.append('.')
+            else:
+                letters.append(tile.letter.lower() if tile.value == 0 else tile.letter.upper())
+        rows.append(''.join(letters))
+    return {
+        'board': rows,
+        'players': [{'name': player.name, 'score': player.score,
+                     'rack': ''.join(tile.letter for tile in player.rack)} for player in game.players],
+        'current_player': game.current_player.name,
+        'bag': len(game.bag),
+        'zero_score_streak': game.zero_score_streak,
+        'is_over': game.is_over,
+    }
+
+
+def _result_data(result: MoveResult) -> dict:
+    return {
+        'score': result.score,
+        'words': [{'word': word.word, 'score': word.score} for word in result.words],
+        'bingo_bonus': result.bingo_bonus,
+    }
+
+
+def _placement_data(placement: Optional[Placement]) -> Optional[dict]:
+    if placement is None:
+        return None
+    return {'row': placement.row, 'col': placement.col, 'direction': placement.direction.value,
+            'word': placement.word, 'blanks': list(placement.blanks), 'tiles': placement.tiles,
+            'score': placement.score}
+
+
+def _param(request: dict, name: str, kind: type, default: Any = _REQUIRED, item: Optional[type] = None) -> Any:
+    """The `name` parameter of `request`, checked to be a `kind` (of `item`s, for lists)."""
+    value = request.get(name, default)
+    if value is _REQUIRED:
+        raise ProtocolError(f"'{name}' is required")
+    if value is not default:
+        if not isinstance(value, kind) or (item is not None and not all(isinstance(entry, item) for entry in value)):
+            kinds = kind if isinstance(kind, tuple) else (kind,)
+            raise ProtocolError(f"'{name}' must be of type {' or '.join(k.__name__ for k in kinds)}" +
+                                (f' of {item.__name__}' if item is not None else ''))
+    return value
+
+
+class GameServer:
+    """
+    Hosts many games over a JSON-lines protocol on a TCP or Unix socket.
+
+    Each request is a JSON object on one line naming a `command`; an optional `id` is
+    echoed in the response, `{"id": ..., "ok": true, "result": ...}` or
+    `{"id": ..., "ok": false, "error": "<exception name>", "message": ...}`. A connection
+    may pipeline up to `max_pending` requests; responses to commands on different games
+    can come back out of order, so pipelining clients should set `id`. Once that many are
+    in flight the server stops reading from the connection until one completes.
+
+    After `watch`, a connection is also sent the game's turns as they are played, as lines
+    `{"watch": "<game>", "type": ...}` carrying no `id` (see spectators), starting with a
+    snapshot of the game. A watcher that falls too far behind is dropped and can watch again.
+    Closing a game sends its watchers a last `closed` message and stops watching it.
+
+    Every game shares the server's lexicon and settings manager, which must not be changed
+    while games are hosted. Move generation and endgame search run in `executor` (a thread
+    pool by default) while the game's lock is held, at most `max_analysis` at a time.
+    """
+
+    def __init__(self, lexicon: Lexicon, settings_dict: Optional[dict] = None, executor: Optional[Executor] = None,
+                 max_games: int = 10000, max_pending: int = 16, max_analysis: int = 4) -> None:
+        self.settings_manager = SettingsManager(lexicon, settings_dict)
+        self.generator = MoveGenerator(self.settings_manager)
+        self.executor = executor or ThreadPoolExecutor(max_analysis)
+        self.max_games = max_games
+        self.max_pending = max_pending
+        self.games: Dict[str, HostedGame] = {}
+        self._analysis = asyncio.Semaphore(max_analysis)
+        self._ids = count(1)
+        self._commands: Dict[str, Callable[[dict], Awaitable[Any]]] = {
+            'new': self._new,
+            'state': self._state,
+            'move': self._move,
+            'exchange': self._exchange,
+            'pass': self._pass,
+            'resign': self._resign,
+            'hint': self._hint,
+            'solve': self._solve,
+            'snapshot': self._snapshot,
+            'restore': self._restore,
+            'close': self._close,
+            'stats': self._stats,
+            'judge': self._judge,
+            'anagram': self._anagram,
+            'pattern': self._pattern,
+        }
+        # Commands that act on the connection they arrive on
+        self._connection_commands: Dict[str, Callable[[dict, _Connection], Awaitable[Any]]] = {
+            'watch': self._watch,
+            'unwatch': self._unwatch,
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on `path` as a Unix socket if given, on `host`:`port` otherwise. Port 0 picks a free port."""
+        if path is not None:
+            return await asyncio.start_unix_server(self._serve_connection, path, limit=MAX_LINE)
+        return await asyncio.start_server(self._serve_connection, host, port, limit=MAX_LINE)
+
+    async def handle(self, request: Any, connection: Optional[_Connection] = None) -> dict:
+        """Run one decoded request, received on `connection` if any, and return its response."""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ProtocolError('Requests must be JSON objects')
+            name = request.get('command')
+            if name in self._connection_commands:
+                if connection is None:
+                    raise ProtocolError(f'{name!r} needs a connection')
+                result = await self._connection_commands[name](request, connection)
+            else:
+                command = self._commands.get(name)
+                if command is None:
+                    raise ProtocolError(f'Unknown command {name!r}')
+                result = await command(request)
+        except (ScrabbleError, ValueError) as e:
+            return {'id': request_id, 'ok': False, 'error': type(e).__name__, 'message': str(e)}
+        except Exception as e:
+            # Every request gets an answer, even when a command fails in a way it did not foresee
+            return {'id': request_id, 'ok': False, 'error': type(e).__name__, 'message': f'Internal error: {e}'}
+        return {'id': request_id, 'ok': True, 'result': result}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending = asyncio.Semaphore(self.max_pending)
+        write_lock = asyncio.Lock()
+        connection = _Connection(writer)
+        tasks: Set[asyncio.Task] = set()
+
+        async def respond(response: dict) -> None:
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        async def run(line: bytes) -> None:
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {'id': None, 'ok': False, 'error': ProtocolError.__name__, 'message': 'Invalid JSON'}
+                else:
+                    response = await self.handle(request, connection)
+                await respond(response)
+            except ConnectionError:
+                pass
+            finally:
+                pending.release()
+
+        try:
+            while True:
+                await pending.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await respond({'id': None, 'ok': False, 'error': ProtocolError.__name__,
+                                   'message': f'Requests are limited to {MAX_LINE} bytes'})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    pending.release()
+                    continue
+                task = asyncio.create_task(run(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for hosted in list(connection.watching):
+                hosted.unwatch(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _hosted(self, request: dict) -> HostedGame:
+        game_id = _param(request, 'game', str)
+        hosted = self.games.get(game_id)
+        if hosted is None:
+            raise UnknownGameError(f"No game '{game_id}'")
+        return hosted
+
+    @staticmethod
+    def _player(game: Game, request: dict) -> Player:
+        """The player to move, after checking that it is the one the request names, if any."""
+        name = _param(request, 'player', str, None)
+        if name is not None and name != game.current_player.name:
+            raise NotPlayersTurnError(f"It is {game.current_player.name}'s turn, not {name}'s")
+        return game.current_player
+
+    @staticmethod
+    def _finish(hosted: HostedGame) -> dict:
+        """Apply the end of game penalties once the game is over, and return its state."""
+        if hosted.game.is_over and not hosted.finished:
+            hosted.game.apply_end_game_penalties()
+            hosted.finished = True
+        hosted.broadcaster.publish()
+        return game_state(hosted.game)
+
+    async def _analyse(self, hosted: HostedGame, function: Callable[[], Any]) -> Any:
+        """Run `function` in the executor with the game locked, so no command changes it meanwhile."""
+        async with hosted.lock, self._analysis:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+    async def _look_up(self, function: Callable[[], Any]) -> Any:
+        """Run a word query in the executor. The first anagram query also builds the index there."""
+        async with self._analysis:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+    def _host(self, game: Game) -> HostedGame:
+        game_id = str(next(self._ids))
+        hosted = self.games[game_id] = HostedGame(game_id, game)
+        return hosted
+
+    def _check_capacity(self) -> None:
+        if len(self.games) >= self.max_games:
+            raise ProtocolError(f'The server already hosts {self.max_games} games')
+
+    def _check_players(self, players: list) -> None:
+        count = self.settings_manager.ruleset.player_count
+        if len(players) != count:
+            raise ProtocolError(f"'players' must name {count} players")
+        for name in players:
+            if not name.strip() or len(name) > MAX_NAME_LENGTH:
+                raise ProtocolError(f'Player names must be 1 to {MAX_NAME_LENGTH} characters')
+        if len(set(players)) != len(players):
+            raise ProtocolError('Player names must be different')
+
+    async def _new(self, request: dict) -> dict:
+        self._check_capacity()
+        players = _param(request, 'players', list, None, str)
+        if players is not None:
+            self._check_players(players)
+        seed = _param(request, 'seed', int, None)
+        game = Game(None, player_names=players, rng=random.Random(seed), settings_manager=self.settings_manager)
+        hosted = self._host(game)
+        return {'game': hosted.id, 'state': self._finish(hosted)}
+
+    async def _state(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            return game_state(hosted.game)
+
+    async def _move(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        row = _param(request, 'row', int)
+        col = _param(request, 'col', int)
+        word = _param(request, 'word', str)
+        direction = Direction(_param(request, 'direction', str))
+        blanks = _param(request, 'blanks', list, [], int)
+        async with hosted.lock:
+            game = hosted.game
+            if game.is_over:
+                raise ProtocolError('The game is over')
+            result = game.make_move(row, col, word, direction, self._player(game, request), blanks)
+            return {'move': _result_data(result), 'state': self._finish(hosted)}
+
+    async def _exchange(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        tiles = _param(request, 'tiles', str)
+        async with hosted.lock:
+            game = hosted.game
+            if game.is_over:
+                raise ProtocolError('The game is over')
+            game.exchange_tiles(tiles, self._player(game, request))
+            return self._finish(hosted)
+
+    async def _pass(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            game = hosted.game
+            if game.is_over:
+                raise ProtocolError('The game is over')
+            game.pass_turn(self._player(game, request))
+            return self._finish(hosted)
+
+    async def _resign(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            game = hosted.game
+            if game.is_over:
+                raise ProtocolError('The game is over')
+            game.resign(self._player(game, request))
+            return self._finish(hosted)
+
+    async def _hint(self, request: dict) -> list:
+        """The `limit` highest scoring placements for the player to move."""
+        hosted = self._hosted(request)
+        limit = self._limit(request, 10)
+        game = hosted.game
+
+        def best_placements():
+            placements = self.generator.generate(game.board, game.current_player.rack)
+            return sorted(placements, key=lambda placement: placement.score, reverse=True)[:limit]
+        return [_placement_data(placement) for placement in await self._analyse(hosted, best_placements)]
+
+    async def _solve(self, request: dict) -> dict:
+        """Solve the endgame for the player to move, within `time_limit` seconds."""
+        hosted = self._hosted(request)
+        time_limit = _param(request, 'time_limit', (int, float), 5.0)
+        if isinstance(time_limit, bool) or not 0 < time_limit <= MAX_TIME:
+            raise ProtocolError(f"'time_limit' must be more than 0 and at most {MAX_TIME:g} seconds")
+        max_depth = _param(request, 'max_depth', int, None)
+        result = await self._analyse(hosted, lambda: solve_endgame(hosted.game, time_limit, max_depth))
+        return {'spread': result.spread, 'moves': [_placement_data(move) for move in result.moves],
+                'depth': result.depth, 'complete': result.complete, 'nodes': result.nodes}
+
+    async def _snapshot(self, request: dict) -> str:
+        """The game as a base64 encoded snapshot, which `restore` on this or another server takes back."""
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            return base64.b64encode(snapshot(hosted.game)).decode()
+
+    async def _restore(self, request: dict) -> dict:
+        """Host a game from a snapshot taken with the same lexicon and settings."""
+        self._check_capacity()
+        try:
+            data = base64.b64decode(_param(request, 'snapshot', str), validate=True)
+        except binascii.Error:
+            raise ProtocolError("'snapshot' must be base64 encoded") from None
+        game = restore(data, self.settings_manager.lexicon, settings_manager=self.settings_manager)
+        hosted = self._host(game)
+        return {'game': hosted.id, 'state': game_state(game)}
+
+    async def _close(self, request: dict) -> dict:
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            del self.games[hosted.id]
+            hosted.close()
+            return game_state(hosted.game)
+
+    async def _stats(self, request: dict) -> dict:
+        return {'games': len(self.games), 'finished': sum(hosted.finished for hosted in self.games.values())}
+
+    async def _watch(self, request: dict, connection: _Connection) -> dict:
+        """Start sending the game's turns to this connection, beginning with a snapshot."""
+        hosted = self._hosted(request)
+        async with hosted.lock:
+            if connection not in hosted.watchers:
+                # Written with the game locked, so the snapshot comes before any turn pushed after it
+                connection.writer.write(hosted.watch_line(snapshot_message(hosted.game)))
+                hosted.watchers.add(connection)
+                connection.watching.add(hosted)
+            return {'watching': hosted.id, 'spectators': len(hosted.watchers)}
+
+    async def _unwatch(self, request: dict, connection: _Connection) -> dict:
+        hosted = self._hosted(request)
+        hosted.unwatch(connection)
+        return {'watching': None, 'spectators': len(hosted.watchers)}
+
+    async def _judge(self, request: dict) -> dict:
+        """Which of `words` are in the lexicon."""
+        words = _param(request, 'words', list, item=str)
+        return {word: self.settings_manager.is_valid_word(word) for word in words}
+
+    @staticmethod
+    def _limit(request: dict, default: int = 100) -> int:
+        limit = _param(request, 'limit', int, default)
+        if isinstance(limit, bool) or not 0 <= limit <= MAX_WORDS:
+            raise ProtocolError(f"'limit' must be between 0 and {MAX_WORDS}")
+        return limit
+
+    @staticmethod
+    def _query(request: dict, name: str, default: Any = _REQUIRED, max_length: int = MAX_QUERY_LETTERS,
+               max_blanks: int = MAX_QUERY_BLANKS) -> Any:
+        """The letters, rack or pattern `name` of a word query, checked not to be too costly to search."""
+        value = _param(request, name, str, default)
+        if value is default:
+            return value
+        if len(value) > max_length:
+            raise ProtocolError(f"'{name}' must be at most {max_length} characters")
+        if value.count(BLANK) > max_blanks:
+            raise ProtocolError(f"'{name}' may hold at most {max_blanks} blanks")
+        return value
+
+    async def _anagram(self, request: dict) -> list:
+        """Words spelt by `letters` ('#' for blanks), or with `partial` by some of them, longest first."""
+        partial = _param(request, 'partial', bool, False)
+        letters = self._query(request, 'letters', max_length=MAX_PARTIAL_LETTERS if partial else MAX_QUERY_LETTERS)
+        limit = self._limit(request)
+        lexicon = self.settings_manager.lexicon
+        return await self._look_up(lambda: list(AnagramIndex.for_lexicon(lexicon).anagrams(letters, limit, partial)))
+
+    async def _pattern(self, request: dict) -> list:
+        """Words matching `pattern`, optionally playable from `rack`, in alphabetical order."""
+        pattern = self._query(request, 'pattern', max_blanks=MAX_QUERY_LETTERS)  # Only the rack's blanks multiply the search
+        rack = self._query(request, 'rack', None)
+        limit = self._limit(request)
+        lexicon = self.settings_manager.lexicon
+        return await self._look_up(lambda: list(match_pattern(lexicon, pattern, rack, limit)))
+
+
+class GameClient:
+    """
+    A connection to a GameServer. Requests may be issued concurrently; each gets its own
+    `id` and its response is matched to it. Error responses are raised as the exception
+    they name, or ScrabbleError when it is not one of the game's exceptions. Turns of
+    watched games are put on the `spectating` queue as they arrive.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = count(1)
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self.spectating: asyncio.Queue = asyncio.Queue()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None) -> 'GameClient':
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def request(self, command: str, **params) -> Any:
+        """Send `command` with `params` and return the result of its response."""
+        request_id = next(self._ids)
+        future = self._waiting[request_id] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps({'id': request_id, 'command': command, **params}).encode() + b'\n')
+        await self._writer.drain()
+        response = await future
+        if not response['ok']:
+            error = getattr(exceptions, response['error'], None)
+            if not (isinstance(error, type) and issubclass(error, ScrabbleError)):
+                error = ScrabbleError
+            raise error(response['message'])
+        return response['result']
+
+    async def _receive(self) -> None:
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                if 'watch' in response:
+                    self.spectating.put_nowait(response)
+                    continue
+                future = self._waiting.pop(response['id'], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection to the server closed'))
+            self._waiting.clear()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def __aenter__(self) -> 'GameClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def serve(lexicon: Lexicon, settings_dict: Optional[dict] = None, host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT, path: Optional[str] = None, **options) -> None:
+    """Serve games until cancelled."""
+    server = await GameServer(lexicon, settings_dict, **options).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Host Scrabble games over a JSON-lines socket protocol')
+    parser.add_argument('--lexicon', default='enable.txt', help='word list, one word per line, or a compiled .lex file')
+    parser.add_argument('--settings', help='JSON settings file')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--max-games', type=int, default=10000)
+    parser.add_argument('--analysis-workers', type=int, default=os.cpu_count() or 1,
+                        help='threads for move generation and endgame search')
+    args = parser.parse_args(argv)
+
+    settings_dict = None
+    if args.settings:
+        with open(args.settings) as f:
+            settings_dict = json.load(f)
+    try:
+        asyncio.run(serve(load_lexicon(args.lexicon), settings_dict, args.host, args.port, args.unix,
+                          max_games=args.max_games, max_analysis=args.analysis_workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
-from typing import Any, Dict, List, Optional, Set
+import json
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple, Union
 
+from enums import LETTER_MULTIPLIERS, WORD_MULTIPLIERS, SquareType
 from exceptions import InvalidSettingTypeError
+from lexicon import Lexicon
+from tile import TILE_LETTERS
 
 DEFAULT_SETTINGS = {
     "player_count": 2,
@@ -86,11 +92,62 @@ DEFAULT_SETTINGS = {
     }    
 }
 
+Grid = Tuple[Tuple[int, ...], ...]
+
+
+class Ruleset(NamedTuple):
+    """
+    The game settings compiled into plain values for the hot paths: scalars, letter scores and tile
+    counts indexed like TILE_LETTERS, and the board's square types and multipliers by row and column.
+    Immutable and hashable, so games with the same settings share one and caches can be keyed on it.
+    """
+    player_count: int
+    bingo_bonus: int
+    max_rack_size: int
+    zero_score_turns_before_game_end: int
+    board_size: int
+    square_types: Tuple[Tuple[SquareType, ...], ...]
+    letter_multipliers: Grid
+    word_multipliers: Grid
+    letter_scores: Tuple[int, ...]
+    tile_distribution: Tuple[int, ...]
+
+
+def _by_letter(values: Dict[str, int]) -> Tuple[int, ...]:
+    values = {letter.upper(): value for letter, value in values.items()}
+    return tuple(values.get(letter, 0) for letter in TILE_LETTERS)
+
+
+@lru_cache(maxsize=32)
+def _compile_ruleset(encoded: str) -> Ruleset:
+    settings = json.loads(encoded)
+    square_types = tuple(tuple(SquareType(square) for square in row) for row in settings["default_board_layout"])
+    return Ruleset(
+        player_count=settings["player_count"],
+        bingo_bonus=settings["bingo_bonus"],
+        max_rack_size=settings["max_rack_size"],
+        zero_score_turns_before_game_end=settings["zero_score_turns_before_game_end"],
+        board_size=settings["board_size"],
+        square_types=square_types,
+        letter_multipliers=tuple(tuple(LETTER_MULTIPLIERS.get(square, 1) for square in row) for row in square_types),
+        word_multipliers=tuple(tuple(WORD_MULTIPLIERS.get(square, 1) for square in row) for row in square_types),
+        letter_scores=_by_letter(settings["letter_scores"]),
+        tile_distribution=_by_letter(settings["tile_distribution"]),
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_lexicon(words: FrozenSet[str]) -> Lexicon:
+    # Building the GADDAG of a full word list takes seconds, so managers given the same words share it
+    return Lexicon.from_words(words)
 
 
 class SettingsManager:
-    def __init__(self, word_set: set, settings_dict: Optional[Dict[str, Any]] = None) -> None:
+    def __init__(self, word_set: Union[Set[str], Lexicon, 'Future[Lexicon]'], settings_dict: Optional[Dict[str, Any]] = None) -> None:
         self._settings = settings_dict or {}
+        self._lexicon: Optional[Lexicon] = None
+        self._pending_lexicon: Optional['Future[Lexicon]'] = None
+        self._ruleset: Optional[Ruleset] = None
         self.game_mechanics = self.GameMechanics(self)
         self.board_settings = self.BoardSettings(self)
         self.tile_scoring = self.TileScoring(self)
@@ -104,6 +161,7 @@ class SettingsManager:
         """Set a setting value after type validation."""
         self._validate_types(key, value, expected_types)
         self._settings[key] = value
+        self._ruleset = None
 
     def _validate_types(self, key: str, value: Any, expected_types: tuple) -> None:
         """Validates types of provided value against expected types."""
@@ -200,11 +258,48 @@ class SettingsManager:
     @word_set.setter
     def word_set(self, value: Set[str]) -> None:
         self._set_setting_with_validation("word_set", value, set)
+        self._lexicon = None
+        self._pending_lexicon = None
 
-    def load_word_set(self, word_set: set) -> None:
-        """Loads the word set into the game settings."""
+    @property
+    def lexicon(self) -> Lexicon:
+        """Returns the lexicon for the game, building it from the word set or waiting for it to load on first use."""
+        if self._lexicon is None:
+            if self._pending_lexicon is not None:
+                self._lexicon = self._pending_lexicon.result()
+                self._pending_lexicon = None
+            else:
+                self._lexicon = _build_lexicon(frozenset(self.word_set))
+        return self._lexicon
+
+    @property
+    def lexicon_loading(self) -> bool:
+        """Whether the lexicon is still being loaded in the background."""
+        return self._pending_lexicon is not None and not self._pending_lexicon.done()
+
+    def load_word_set(self, word_set: Union[Set[str], Lexicon, 'Future[Lexicon]']) -> None:
+        """Loads the word set, a prebuilt lexicon or the Future of one being loaded into the game settings."""
+        self._pending_lexicon = None
+        if isinstance(word_set, Lexicon):
+            self._lexicon = word_set
+            return
+        if isinstance(word_set, Future):
+            self._lexicon = None
+            self._pending_lexicon = word_set
+            return
         self.word_set = word_set
 
+    def to_dict(self) -> Dict[str, Any]:
+        """All game settings, defaults filled in, without the word set."""
+        return {key: self._get_setting(key) for key in DEFAULT_SETTINGS}
+
+    @property
+    def ruleset(self) -> Ruleset:
+        """The settings compiled into a Ruleset, shared with every manager holding the same settings."""
+        if self._ruleset is None:
+            self._ruleset = _compile_ruleset(json.dumps(self.to_dict(), sort_keys=True))
+        return self._ruleset
+
     def is_valid_word(self, word: str) -> bool:
         """Checks if a word is valid."""
-        return word.lower() in self.word_set
\ No newline at end of file
+        return self.lexicon.contains(word)
@@ -0,0 +1,218 @@
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from game import Game
+from gcg import write_gcg
+from lexicon import Lexicon
+from move import Move
+from move_generator import MoveGenerator, Placement
+from packed_lexicon import SharedLexicon, load_lexicon
+
+Policy = Callable[[Game, Iterator[Placement], random.Random], Optional[Placement]]
+Observer = Callable[[Game, Optional[Placement]], None]
+
+
+def greedy_policy(game: Game, placements: Iterator[Placement], rng: random.Random) -> Optional[Placement]:
+    """Play the highest scoring placement."""
+    return max(placements, key=lambda placement: placement.score, default=None)
+
+
+def random_policy(game: Game, placements: Iterator[Placement], rng: random.Random) -> Optional[Placement]:
+    """Play a uniformly random legal placement."""
+    placements = list(placements)
+    return rng.choice(placements) if placements else None
+
+
+def pass_policy(game: Game, placements: Iterator[Placement], rng: random.Random) -> Optional[Placement]:
+    """Always pass."""
+    return None
+
+
+POLICIES: Dict[str, Policy] = {
+    'greedy': greedy_policy,
+    'random': random_policy,
+    'pass': pass_policy,
+}
+
+
+def resolve_policy(name: str) -> Policy:
+    """Look up a policy by its name in POLICIES, or import it from a 'module:function' path."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f"Unknown policy '{name}'")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def game_seed(seed: int, index: int) -> int:
+    """The seed of game `index` in a run started with `seed`. Independent of worker count and order."""
+    digest = hashlib.sha256(f'{seed}:{index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def play_game(lexicon: Lexicon, policies: List[str], seed: int, settings_dict: Optional[dict] = None,
+              observe: Optional[Observer] = None, gcg_path: Optional[str] = None) -> dict:
+    """
+    Play one complete game between `policies` (one per seat) and return its result record.
+    `observe` is called with the game and the chosen placement (None for a pass) before each turn is played.
+    With `gcg_path`, the game record is written there in GCG.
+    """
+    rng = random.Random(seed)
+    names = [f'Player {seat + 1}' for seat in range(len(policies))]
+    seats = {name: seat for seat, name in enumerate(names)}
+    chosen = [resolve_policy(policy) for policy in policies]
+    start = time.perf_counter()
+    game = Game(lexicon, dict(settings_dict or {}), names, rng=random.Random(rng.getrandbits(64)))
+    generator = MoveGenerator(game.settings_manager)
+    move_seconds = [0.0] * len(policies)
+    turns = moves = bingos = 0
+    while not game.is_over:
+        player = game.current_player
+        seat = seats[player.name]
+        thinking = time.perf_counter()
+        placement = chosen[seat](game, generator.generate(game.board, player.rack), rng)
+        move_seconds[seat] += time.perf_counter() - thinking
+        if observe is not None:
+            observe(game, placement)
+        if placement is None:
+            game.pass_turn()
+        else:
+            result = game.make(Move.from_placement(placement, player))
+            moves += 1
+            bingos += result.bingo_bonus > 0
+        turns += 1
+    game.apply_end_game_penalties()
+    if gcg_path is not None:
+        write_gcg(game, gcg_path)
+
+    scores = [0] * len(policies)
+    for player in game.players:
+        scores[seats[player.name]] = player.score
+    best = max(scores)
+    return {
+        'seed': seed,
+        'policies': list(policies),
+        'scores': scores,
+        'winners': [seat for seat, score in enumerate(scores) if score == best],
+        'turns': turns,
+        'moves': moves,
+        'bingos': bingos,
+        'tiles_left': len(game.bag),
+        'move_seconds': [round(seconds, 6) for seconds in move_seconds],
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+
+_worker_lexicon: Optional[Lexicon] = None
+
+
+def _init_worker(lexicon: SharedLexicon) -> None:
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _play(index: int, policies: List[str], seed: int, settings_dict: Optional[dict],
+          records: Optional[str]) -> dict:
+    record = {'game': index}
+    gcg_path = os.path.join(records, f'game-{index:07d}.gcg') if records else None
+    record.update(play_game(_worker_lexicon, policies, seed, settings_dict, gcg_path=gcg_path))
+    return record
+
+
+def completed_games(path: str, seed: int) -> Set[int]:
+    """
+    Indices of the games already recorded in the JSONL file at `path`. A partly written
+    last line, left by an interrupted run, is cut off so that new records can be appended.
+    """
+    done: Set[int] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+    for line in data[:complete].splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record['seed'] != game_seed(seed, record['game']):
+            raise ValueError(f'{path} was written by a run with a different seed')
+        done.add(record['game'])
+    return done
+
+
+def run(games: int, policies: List[str], output: str, lexicon_path: str = 'enable.txt',
+        settings_dict: Optional[dict] = None, seed: int = 0, workers: Optional[int] = None,
+        resume: bool = False, records: Optional[str] = None) -> int:
+    """
+    Play `games` games across a process pool and append one JSON line per finished game
+    to `output`, in completion order. With `resume`, games already in `output` are skipped.
+    With `records`, the GCG record of every game is written to that directory.
+    Returns the number of games played by this call.
+    """
+    for policy in policies:
+        resolve_policy(policy)
+    if records:
+        os.makedirs(records, exist_ok=True)
+    done = completed_games(output, seed) if resume else set()
+    pending: Iterable[int] = (index for index in range(games) if index not in done)
+    workers = workers or os.cpu_count() or 1
+    played = 0
+    # Workers attach to one shared copy of the lexicon rather than each loading their own
+    with SharedLexicon.publish(load_lexicon(lexicon_path)) as lexicon, open(output, 'a' if resume else 'w') as out, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(lexicon,)) as executor:
+        running = set()
+        for index in pending:
+            running.add(executor.submit(_play, index, policies, game_seed(seed, index), settings_dict, records))
+            if len(running) >= workers * 4:
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                played += _write(out, finished)
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            played += _write(out, finished)
+    return played
+
+
+def _write(out, finished) -> int:
+    for future in finished:
+        out.write(json.dumps(future.result()) + '\n')
+    out.flush()
+    return len(finished)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Play Scrabble games between move policies without a UI')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--policies', nargs='+', default=['greedy', 'greedy'],
+                        help=f"one policy per seat: {', '.join(POLICIES)} or module:function")
+    parser.add_argument('--output', default='games.jsonl', help='JSONL file to write results to')
+    parser.add_argument('--lexicon', default='enable.txt', help='word list, one word per line')
+    parser.add_argument('--settings', help='JSON settings file')
+    parser.add_argument('--seed', type=int, default=0, help='seed the per-game seeds are derived from')
+    parser.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    parser.add_argument('--resume', action='store_true', help='skip games already recorded in the output')
+    parser.add_argument('--records', help='directory to write the GCG record of every game to')
+    args = parser.parse_args(argv)
+
+    settings_dict = {}
+    if args.settings:
+        with open(args.settings) as f:
+            settings_dict = json.load(f)
+    settings_dict['player_count'] = len(args.policies)
+    start = time.perf_counter()
+    played = run(args.games, args.policies, args.output, args.lexicon, settings_dict,
+                 args.seed, args.workers, args.resume, args.records)
+    print(f'Played {played} games in {time.perf_counter() - start:.1f}s, results in {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import random
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+from bag import ScrabbleBag
+from board import ScrabbleBoard
+from exceptions import SnapshotFormatError, SnapshotMismatchError
+from game import Game
+from lexicon import Lexicon
+from player import Player
+from rack import tile_code
+from settings_manager import SettingsManager
+from tile import BLANK, LETTER_CODES, TILE_LETTERS, ScrabbleTile, intern_tile
+
+MAGIC = b'SGAM'
+FORMAT_VERSION = 2
+
+# magic, version, header size, sha256 of the lexicon's compiled form, sha256 of the settings
+HEADER = struct.Struct('<4sHH32s32s')
+HEADER_SIZE = HEADER.size
+
+# rows, columns, player count, player to move, zero-score streak, tiles in the bag
+POSITION = struct.Struct('<BBBBBH')
+# score, name length in bytes, rack size
+PLAYER = struct.Struct('<iHH')
+MAX_FIELD = 0xFFFF
+# Mersenne Twister state (624 words and the position in them), whether a Gaussian is cached, the cached Gaussian
+RNG_STATE = struct.Struct('<625I?d')
+CHECKSUM = struct.Struct('<I')
+
+# Board squares hold 0 when empty, otherwise the letter code plus one, with BLANK_BIT set for blanks
+BLANK_BIT = 0x80
+
+
+def settings_digest(settings_manager: SettingsManager) -> bytes:
+    """SHA-256 of the game settings (the word set aside), which identifies them."""
+    encoded = json.dumps(settings_manager.to_dict(), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).digest()
+
+
+def snapshot(game: Game) -> bytes:
+    """
+    Serialize the position of `game`: the board, the racks, scores and turn order, the player to move,
+    the zero-score streak, the bag in drawing order and its random generator. The lexicon and the
+    settings are recorded by digest only; `restore` needs the same ones at hand. Turns that `unmake`
+    could take back are not kept.
+    """
+    squares = game.board.board
+    body = bytearray(POSITION.pack(len(squares), len(squares[0]), len(game.players),
+                                   game.players.index(game.current_player), game.zero_score_streak, len(game.bag)))
+    for row in squares:
+        for square in row:
+            tile = square.tile
+            if tile is None:
+                body.append(0)
+            elif tile.value == 0:
+                body.append(LETTER_CODES[tile.letter.upper()] + 1 | BLANK_BIT)
+            else:
+                body.append(LETTER_CODES[tile.letter.upper()] + 1)
+    for player in game.players:
+        name = player.name.encode()
+        if len(name) > MAX_FIELD or len(player.rack) > MAX_FIELD:
+            raise ValueError(f'The name or rack of player {player.name[:20]!r} is too long to snapshot')
+        body += PLAYER.pack(player.score, len(name), len(player.rack))
+        body += name
+        body += bytes(tile_code(tile) for tile in player.rack)
+    body += bytes(tile_code(tile) for tile in game.bag.tiles)
+    _, state, gauss_next = game.bag.rng.getstate()
+    body += RNG_STATE.pack(*state, gauss_next is not None, gauss_next or 0.0)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, HEADER_SIZE, game.settings_manager.lexicon.digest,
+                         settings_digest(game.settings_manager))
+    data = header + body
+    return data + CHECKSUM.pack(zlib.crc32(data))
+
+
+def snapshot_digests(data: bytes) -> Tuple[bytes, bytes]:
+    """The lexicon and settings digests a snapshot was taken with, to pick what to restore it with."""
+    return _header(data)[3:5]
+
+
+def _header(data: bytes) -> tuple:
+    if len(data) < HEADER_SIZE + CHECKSUM.size:
+        raise SnapshotFormatError('Snapshot is truncated')
+    header = HEADER.unpack_from(data)
+    if header[0] != MAGIC:
+        raise SnapshotFormatError('Not a game snapshot')
+    if header[1] != FORMAT_VERSION:
+        raise SnapshotFormatError(f'Unsupported snapshot format version {header[1]}')
+    return header
+
+
+def restore(data: bytes, lexicon: Lexicon, settings_dict: Optional[dict] = None,
+            settings_manager: Optional[SettingsManager] = None) -> Game:
+    """
+    Rebuild the game `snapshot` serialized, with `lexicon` and the settings in `settings_dict` (or the
+    existing `settings_manager`, which the game then shares). Raises SnapshotMismatchError when
+    they are not the ones the snapshot was taken with and SnapshotFormatError when it is damaged.
+    """
+    header = _header(data)
+    (checksum,) = CHECKSUM.unpack_from(data, len(data) - CHECKSUM.size)
+    if zlib.crc32(memoryview(data)[:-CHECKSUM.size]) != checksum:
+        raise SnapshotFormatError('Snapshot checksum mismatch')
+    settings_manager = settings_manager or SettingsManager(lexicon, settings_dict)
+    if header[3] != lexicon.digest:
+        raise SnapshotMismatchError('The snapshot was taken with a different lexicon')
+    if header[4] != settings_digest(settings_manager):
+        raise SnapshotMismatchError('The snapshot was taken with different settings')
+
+    try:
+        return _restore_body(memoryview(data)[header[2]:-CHECKSUM.size], settings_manager)
+    except (struct.error, IndexError, ValueError) as e:
+        raise SnapshotFormatError(f'Snapshot is corrupt: {e}') from None
+
+
+def _restore_body(body: memoryview, settings_manager: SettingsManager) -> Game:
+    letter_scores = settings_manager.tile_scoring.letter_scores
+
+    def new_tiles(codes) -> List[ScrabbleTile]:
+        return [intern_tile(TILE_LETTERS[code], letter_scores[TILE_LETTERS[code]]) for code in codes]
+
+    rows, cols, player_count, current, streak, bag_size = POSITION.unpack_from(body)
+    offset = POSITION.size
+    layout = settings_manager.board_settings.default_board_layout
+    if (rows, cols) != (len(layout), len(layout[0])):
+        raise ValueError('board size does not match the settings')
+    board = ScrabbleBoard(layout, settings_manager.lexicon)
+    squares = body[offset:offset + rows * cols]
+    offset += rows * cols
+    for index, value in enumerate(squares):
+        if not value:
+            continue
+        code = (value & ~BLANK_BIT) - 1
+        if value & BLANK_BIT:
+            tile = ScrabbleTile(BLANK, 0)
+            tile.letter = TILE_LETTERS[code]
+        else:
+            tile = new_tiles((code,))[0]
+        board.get_square(*divmod(index, cols)).tile = tile
+
+    rng = random.Random()
+    bag = ScrabbleBag(settings_manager, rng)
+    bag.replace_tiles([])
+    players = []
+    for _ in range(player_count):
+        score, name_size, rack_size = PLAYER.unpack_from(body, offset)
+        offset += PLAYER.size
+        name = bytes(body[offset:offset + name_size]).decode()
+        offset += name_size
+        player = Player(name, bag, settings_manager)
+        player.rack.replace_tiles(new_tiles(body[offset:offset + rack_size]))
+        offset += rack_size
+        player.score = score
+        players.append(player)
+    bag.replace_tiles(new_tiles(body[offset:offset + bag_size]))
+    offset += bag_size
+    *state, has_gauss, gauss_next = RNG_STATE.unpack_from(body, offset)
+    offset += RNG_STATE.size
+    if offset != len(body):
+        raise ValueError('unexpected trailing data')
+    rng.setstate((3, tuple(state), gauss_next if has_gauss else None))
+    return Game.from_state(settings_manager, board, bag, players, players[current], streak)
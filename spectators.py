@@ -0,0 +1,129 @@
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from enums import EventType
+from game import Game, GameEvent
+
+# What spectators of a game are sent, as plain data:
+#
+#   {"type": "snapshot", "seq": 12, "rows": 15, "cols": 15, "cells": [[7, 7, "C", false], ...],
+#    "players": [{"name": ..., "score": ...}, ...], "current_player": ..., "bag": 61, "is_over": false}
+#   {"type": "turn", "seq": 13, "event": "move", "player": ..., "cells": [[7, 8, "A", false], ...],
+#    "score": 14, "total": 52, "exchanged": 0, "current_player": ..., "bag": 58, "is_over": false}
+#   {"type": "closed", "seq": 13}
+#
+# `seq` counts the game's history entries. A turn only lists the squares it changed, so sending it
+# costs the same on any board. Racks stay hidden: an exchange tells how many tiles were swapped.
+# When turns are taken back the next message is a fresh snapshot. Nothing follows `closed`, sent when
+# the game stops being hosted.
+
+Listener = Callable[[dict], None]
+
+
+class CellChange(NamedTuple):
+    """A square a turn put a tile on. Sent as a four-element array."""
+    row: int
+    col: int
+    letter: str
+    blank: bool
+
+
+def board_cells(game: Game) -> List[CellChange]:
+    """Every tile on the board, row by row."""
+    cells = []
+    for row, squares in enumerate(game.board.board):
+        for col, square in enumerate(squares):
+            tile = square.tile
+            if tile is not None:
+                cells.append(CellChange(row, col, tile.letter.upper(), tile.value == 0))
+    return cells
+
+
+def snapshot_message(game: Game) -> dict:
+    """The full position as spectators see it."""
+    squares = game.board.board
+    return {
+        'type': 'snapshot',
+        'seq': len(game.history),
+        'rows': len(squares),
+        'cols': len(squares[0]),
+        'cells': board_cells(game),
+        'players': [{'name': player.name, 'score': player.score} for player in game.players],
+        'current_player': game.current_player.name,
+        'bag': len(game.bag),
+        'is_over': game.is_over,
+    }
+
+
+def turn_message(game: Game, seq: int, event: GameEvent) -> dict:
+    """The delta of history entry `seq`. The fields describing the game after it are read from `game` as it is now."""
+    cells = []
+    if event.type == EventType.MOVE:
+        cells = [CellChange(tile.row, tile.col, tile.letter, tile.blank) for tile in event.result.tiles]
+    return {
+        'type': 'turn',
+        'seq': seq + 1,
+        'event': event.type.value,
+        'player': event.player,
+        'cells': cells,
+        'score': event.score,
+        'total': event.total,
+        'exchanged': len(event.exchanged),
+        'current_player': game.current_player.name,
+        'bag': len(game.bag),
+        'is_over': game.is_over,
+    }
+
+
+def closed_message(game: Game) -> dict:
+    """The last message spectators are sent: the game is no longer hosted."""
+    return {'type': 'closed', 'seq': len(game.history)}
+
+
+class GameBroadcaster:
+    """
+    Fans the turns of one game out to any number of listeners. A listener is sent a snapshot
+    when it subscribes and then, on every `publish`, one message per history entry added
+    since the last one. Each message is built once and handed to every listener as is, so
+    a turn costs O(tiles it placed) to build plus one call per listener. A listener that
+    raises is unsubscribed.
+    """
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self._listeners: Dict[int, Listener] = {}
+        self._next_id = 0
+        self._published = len(game.history)
+        self._last: Optional[GameEvent] = game.history[-1] if game.history else None
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Send `listener` a snapshot and then every turn published. Returns a function that unsubscribes it."""
+        self.publish()
+        listener_id = self._next_id
+        self._next_id += 1
+        self._listeners[listener_id] = listener
+        self._send(listener_id, listener, snapshot_message(self.game))
+        return lambda: self._listeners.pop(listener_id, None)
+
+    def publish(self) -> int:
+        """Send the turns played since the last call. Returns the number of messages sent to each listener."""
+        history = self.game.history
+        published = self._published
+        if len(history) < published or (published and history[published - 1] is not self._last):
+            messages = [snapshot_message(self.game)]  # Turns were taken back
+        else:
+            messages = [turn_message(self.game, seq, history[seq]) for seq in range(published, len(history))]
+        self._published = len(history)
+        self._last = history[-1] if history else None
+        for message in messages:
+            for listener_id, listener in list(self._listeners.items()):
+                self._send(listener_id, listener, message)
+        return len(messages)
+
+    def _send(self, listener_id: int, listener: Listener, message: dict) -> None:
+        try:
+            listener(message)
+        except Exception:
+            self._listeners.pop(listener_id, None)
+
+    def __len__(self) -> int:
+        return len(self._listeners)
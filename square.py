@@ -31,15 +31,15 @@ class ScrabbleSquare:
         """Return the type of the square."""
         return self._square_type
 
-    def calculate_score(self) -> int:
-        """Calculate and return the score of the tile considering the square type."""
+    def calculate_score(self, placed_this_turn: bool = False) -> int:
+        """Calculate and return the score of the tile, counting the square type if the tile was placed this turn."""
         if self.tile is None:
             raise NoTileError()
 
         score = self.tile.value
         multiplier = 1
 
-        if self.tile.placed_this_turn:
+        if placed_this_turn:
             if self._square_type == SquareType.DOUBLE_LETTER:
                 score *= 2
             elif self._square_type == SquareType.TRIPLE_LETTER:
@@ -0,0 +1,40 @@
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game import Game  # noqa: E402
+from move import Move  # noqa: E402
+from move_generator import MoveGenerator  # noqa: E402
+from packed_lexicon import load_lexicon  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def lexicon():
+    """The ENABLE word list, compiled to enable.lex on the first run."""
+    return load_lexicon(os.path.join(ROOT, 'enable.txt'))
+
+
+def play_greedy(game: Game, turns: int = 1000) -> Game:
+    """Play the highest scoring placement (or pass) for up to `turns` turns."""
+    generator = MoveGenerator(game.settings_manager)
+    for _ in range(turns):
+        if game.is_over:
+            break
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if placements:
+            game.make(Move.from_placement(max(placements, key=lambda placement: placement.score), game.current_player))
+        else:
+            game.pass_turn()
+    return game
+
+
+@pytest.fixture
+def new_game(lexicon):
+    def create(seed: int = 1, **kwargs) -> Game:
+        return Game(lexicon, rng=random.Random(seed), **kwargs)
+    return create
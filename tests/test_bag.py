@@ -0,0 +1,47 @@
+import random
+
+from bag import ScrabbleBag
+from settings_manager import SettingsManager
+
+
+def new_bag(lexicon, seed=1):
+    return ScrabbleBag(SettingsManager(lexicon), random.Random(seed))
+
+
+def drawn(bag, count):
+    return [bag.draw_tile().letter for _ in range(count)]
+
+
+def test_seeded_bags_deal_the_same_tiles(lexicon):
+    assert drawn(new_bag(lexicon, 3), 100) == drawn(new_bag(lexicon, 3), 100)
+    assert drawn(new_bag(lexicon, 3), 20) != drawn(new_bag(lexicon, 4), 20)
+    bag = new_bag(lexicon)
+    assert sum(bag.counts.values()) == len(bag) == 100
+    drawn(bag, 40)
+    assert sum(bag.counts.values()) == len(bag) == 60
+
+
+def test_clone_deals_like_the_original_and_stays_apart(lexicon):
+    bag = new_bag(lexicon, 7)
+    drawn(bag, 10)
+    before = (bag.counts, sorted(tile.letter for tile in bag.tiles))
+    clone = bag.clone()
+    assert drawn(clone, 30) == drawn(bag.clone(), 30)
+
+    clone = bag.clone()
+    while clone.count('#'):
+        clone.take_tile('#').letter = 'E'
+    assert (bag.counts, sorted(tile.letter for tile in bag.tiles)) == before
+    assert all(tile.letter == '#' for tile in bag.tiles if tile.value == 0)
+
+
+def test_blanks_given_a_letter_count_as_blanks(lexicon):
+    bag = new_bag(lexicon)
+    blank = bag.take_tile('#')
+    blank.letter = 'Q'
+    queens = bag.count('Q')
+    bag.deposit_tile(blank)
+    assert bag.count('#') == 2 and bag.count('Q') == queens
+    assert bag.take_tile('#') is not None and bag.take_tile('#') is not None
+    bag.replace_tiles(bag.tiles + [blank])
+    assert bag.count('#') == 1 and bag.count('Q') == queens
@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from game import Game
+from move import Move
+from move_generator import MoveGenerator
+
+np = pytest.importorskip('numpy')
+from batch_scoring import score_placements  # noqa: E402
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_batch_scores_match_the_generator_and_move(lexicon, seed):
+    game = Game(lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(seed)
+    for _ in range(12):
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if game.is_over or not placements:
+            break
+        scores = score_placements(placements, game.board, game.settings_manager)
+        assert scores.total.tolist() == [placement.score for placement in placements]
+        for index in rng.sample(range(len(placements)), min(10, len(placements))):
+            result = Move.from_placement(placements[index], game.current_player).evaluate(game.board, game.settings_manager)
+            assert scores.main[index] == result.main_word.score
+            assert scores.cross[index] == sum(word.score for word in result.words[1:])
+            assert scores.bingo[index] == result.bingo_bonus
+        game.make(Move.from_placement(rng.choice(placements), game.current_player))
@@ -0,0 +1,118 @@
+import random
+import string
+
+import pytest
+
+from array_board import ArrayBoard
+from board import ScrabbleBoard
+from enums import Direction
+from game import Game
+from move import Move
+from move_generator import MoveGenerator
+from tile import intern_tile
+
+
+def naive_entries(board, lexicon):
+    """Cross-checks and cross-sums of every empty square, worked out from the tiles around it."""
+    size = len(board.board)
+    entries = {}
+    for direction in Direction:
+        # A play in one direction forms perpendicular words in the other
+        step_r, step_c = (1, 0) if direction == Direction.HORIZONTAL else (0, 1)
+        for row in range(size):
+            for col in range(size):
+                if board.has_tile(row, col):
+                    continue
+                before, after, total = '', '', 0
+                r, c = row - step_r, col - step_c
+                while board.has_tile(r, c):
+                    before = board.get_square(r, c).tile.letter.lower() + before
+                    total += board.get_square(r, c).tile.value
+                    r, c = r - step_r, c - step_c
+                r, c = row + step_r, col + step_c
+                while board.has_tile(r, c):
+                    after += board.get_square(r, c).tile.letter.lower()
+                    total += board.get_square(r, c).tile.value
+                    r, c = r + step_r, c + step_c
+                checks = None
+                if before or after:
+                    checks = frozenset(letter for letter in string.ascii_lowercase if before + letter + after in lexicon)
+                entries[direction, row, col] = (checks, total)
+    return entries
+
+
+def cached_entries(board):
+    size = len(board.board)
+    return {(direction, row, col): (board.cross_check(row, col, direction), board.cross_sum(row, col, direction))
+            for direction in Direction for row in range(size) for col in range(size) if not board.has_tile(row, col)}
+
+
+def anchors(board):
+    size = len(board.board)
+    return {(direction, row, col) for direction in Direction for row in range(size) for col in range(size)
+            if not board.has_tile(row, col) and board.is_anchor(row, col, direction)}
+
+
+def rebuilt(board, lexicon):
+    """A board with the same tiles whose caches are computed from scratch."""
+    fresh = ScrabbleBoard([[square.square_type.value for square in row] for row in board.board], lexicon)
+    for row, squares in enumerate(board.board):
+        for col, square in enumerate(squares):
+            if square.tile is not None:
+                fresh.get_square(row, col).tile = square.tile
+    return fresh
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_cross_checks_match_a_recompute(lexicon, seed):
+    game = Game(lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(seed)
+    turn = 0
+    while not game.is_over:
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if not placements:
+            game.pass_turn()
+            continue
+        game.make(Move.from_placement(rng.choice(placements), game.current_player))
+        if rng.random() < 0.3:
+            game.unmake()
+            game.make(Move.from_placement(max(placements, key=lambda placement: placement.score), game.current_player))
+        turn += 1
+        if turn % 4 == 0 or game.is_over:
+            board = game.board
+            assert cached_entries(board) == cached_entries(rebuilt(board, lexicon))
+            assert anchors(board) == anchors(rebuilt(board, lexicon))
+            assert str(board) == str(rebuilt(board, lexicon))
+    assert cached_entries(game.board) == naive_entries(game.board, lexicon)
+
+
+def test_array_board_updates_its_caches_the_same_way(lexicon):
+    layout = Game(lexicon).settings_manager.board_settings.default_board_layout
+    game = Game(lexicon, board=ArrayBoard(layout), rng=random.Random(7))
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(7)
+    for _ in range(16):
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if game.is_over or not placements:
+            break
+        game.make(Move.from_placement(rng.choice(placements), game.current_player))
+        if rng.random() < 0.3:
+            game.unmake()
+            continue
+        assert cached_entries(game.board) == cached_entries(rebuilt(game.board, lexicon))
+        assert anchors(game.board) == anchors(rebuilt(game.board, lexicon))
+
+
+@pytest.mark.parametrize('board_kind', [ScrabbleBoard, ArrayBoard])
+def test_printing_follows_direct_square_writes(lexicon, board_kind):
+    layout = Game(lexicon).settings_manager.board_settings.default_board_layout
+    board = board_kind(layout)
+    str(board)
+    board.get_square(3, 4).tile = intern_tile('Q', 10)
+    assert 'Q' in str(board).splitlines()[2 + 2 * 3]
+    copy = board.copy() if board_kind is ArrayBoard else None
+    board.get_square(3, 4).remove_tile()
+    assert 'Q' not in str(board)
+    if copy is not None:
+        assert 'Q' in str(copy)
@@ -0,0 +1,89 @@
+import random
+import time
+
+import pytest
+
+from endgame import EndgameSolver, solve_endgame
+from game import Game
+from move import Move
+from move_generator import MoveGenerator
+
+
+def endgame(lexicon, seed, tiles=None):
+    """A game of seed `seed` played on until the bag is empty and, if given, at most `tiles` are left on the racks."""
+    game = Game(lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    while not game.is_over:
+        if not len(game.bag) and (tiles is None or sum(len(player.rack) for player in game.players) <= tiles):
+            return game
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if placements:
+            # Short plays keep tiles on the racks for the endgame
+            best = max(placements, key=lambda placement: placement.score - 3 * len(placement.tiles))
+            game.make(Move.from_placement(best, game.current_player))
+        else:
+            game.pass_turn()
+    pytest.skip('The game ended before the endgame')
+
+
+def minimax(game, solver, memo):
+    """The exact value of the position for the player to move, by trying every line."""
+    if game.is_over:
+        return solver._rack_spread()
+    key = game.position_hash
+    if key not in memo:
+        best = None
+        for placement in list(solver.generator.generate(game.board, game.current_player.rack)) + [None]:
+            move = None if placement is None else Move.from_placement(placement, game.current_player)
+            result = game.make(move)
+            try:
+                value = (result.score if result else 0) - minimax(game, solver, memo)
+            finally:
+                game.unmake()
+            best = value if best is None else max(best, value)
+        memo[key] = best
+    return memo[key]
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3, 6, 11])
+def test_small_endgames_are_solved_exactly(lexicon, seed):
+    game = endgame(lexicon, seed, tiles=4)
+    solver = EndgameSolver(game)
+    spread = game.current_player.score - solver._opponent().score
+    result = solver.solve(time_limit=30)
+    assert result.complete
+    assert result.spread == spread + minimax(game, solver, {})
+
+
+def test_search_leaves_the_game_as_it_was(lexicon):
+    game = endgame(lexicon, 1)
+    key, board, racks = game.position_hash, str(game.board), [str(player.rack) for player in game.players]
+    solve_endgame(game, time_limit=1)
+    assert (game.position_hash, str(game.board), [str(player.rack) for player in game.players]) == (key, board, racks)
+
+
+def test_time_limit_returns_the_deepest_finished_iteration(lexicon):
+    game = endgame(lexicon, 1)
+    started = time.perf_counter()
+    result = solve_endgame(game, time_limit=0.5)
+    assert time.perf_counter() - started < 2
+    assert not result.complete and result.moves and result.moves[0] is not None
+
+
+def test_full_bag_is_refused(lexicon):
+    with pytest.raises(ValueError):
+        solve_endgame(Game(lexicon, rng=random.Random(1)))
+
+
+def test_line_cache_gives_the_same_plays(lexicon):
+    game = endgame(lexicon, 2)
+    generator = MoveGenerator(game.settings_manager)
+    cache = {}
+    for _ in range(3):
+        rack = game.current_player.rack
+        plays = list(generator.generate(game.board, rack))
+        assert list(generator.generate(game.board, rack, cache)) == plays
+        assert list(generator.generate(game.board, rack, cache)) == plays
+        if game.is_over or not plays:
+            break
+        game.make(Move.from_placement(plays[len(plays) // 2], game.current_player))
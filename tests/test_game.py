@@ -0,0 +1,64 @@
+import random
+from concurrent.futures import Future
+
+import pytest
+
+from enums import Direction
+from exceptions import InsufficientTilesError, InvalidLetterError, RackSizeError, TileNotInRackError
+from game import Game
+from move_generator import MoveGenerator
+from zobrist import position_hash
+
+
+def state(game):
+    player = game.current_player
+    return (player.rack.counts, [tile.letter for tile in player.rack],
+            sorted(tile.letter for tile in game.bag.tiles), game.position_hash, len(game.history))
+
+
+def test_exchange_keeps_rack_counts_and_hash(new_game):
+    game = new_game(4)
+    rack = game.current_player.rack
+    tiles = ''.join(tile.letter for tile in rack.tiles[:3])
+    game.exchange_tiles(tiles)
+    assert game.position_hash == position_hash(game, game.zobrist)
+    for player in game.players:
+        assert sum(player.rack.counts) == len(player.rack) == player.rack.max_rack_size
+
+
+@pytest.mark.parametrize('tiles, error', [
+    ('{held}Q{held}', TileNotInRackError),
+    ('{held}' * 8, RackSizeError),
+    ('{held}1', InvalidLetterError),
+])
+def test_failed_exchange_changes_nothing(new_game, tiles, error):
+    game = new_game(6)
+    rack = game.current_player.rack
+    held = rack[0].letter
+    if 'Q' in tiles and rack.count('Q'):
+        pytest.skip('rack holds a Q')
+    before = state(game)
+    with pytest.raises(error):
+        game.exchange_tiles(tiles.format(held=held))
+    assert state(game) == before
+    assert game.position_hash == position_hash(game, game.zobrist)
+
+
+def test_exchange_needs_tiles_in_the_bag(new_game):
+    game = new_game(8)
+    rack = game.current_player.rack
+    game.bag.replace_tiles(game.bag.tiles[:2])
+    before = state(game)
+    with pytest.raises(InsufficientTilesError):
+        game.exchange_tiles(''.join(tile.letter for tile in rack.tiles[:3]))
+    assert state(game) == before
+
+
+def test_lexicon_is_attached_on_first_use(lexicon):
+    pending = Future()
+    game = Game(pending, rng=random.Random(1))
+    assert game.board._lexicon is None and not pending.done()
+    pending.set_result(lexicon)
+    assert game.board.cross_check(7, 7, Direction.HORIZONTAL) is None
+    assert game.board.lexicon is lexicon
+    assert list(MoveGenerator(game.settings_manager).generate(game.board, game.current_player.rack))
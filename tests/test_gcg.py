@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import play_greedy
+from enums import EventType
+from gcg import GcgTurn, _played_word, nickname, parse_gcg, to_gcg
+
+
+def test_record_round_trips(new_game):
+    game = new_game(4, player_names=['Ada Lovelace', 'Bob'])
+    play_greedy(game, 3)
+    game.exchange_tiles(game.current_player.rack.tiles[0].letter)
+    game.pass_turn()
+    play_greedy(game)
+    game.apply_end_game_penalties()
+    record = parse_gcg(to_gcg(game).splitlines())
+    assert sorted(record.players) == [('Ada_Lovelace', 'Ada Lovelace'), ('Bob', 'Bob')]
+    assert len(record.turns) == len(game.history)
+    for turn, event in zip(record.turns, game.history):
+        assert (turn.type, turn.nick, turn.rack, turn.score, turn.total) == \
+            (event.type, nickname(event.player), event.rack, event.score, event.total)
+        assert turn.exchanged == event.exchanged
+        if event.type == EventType.MOVE:
+            word = event.result.main_word
+            assert (turn.row, turn.col, turn.direction, turn.word) == \
+                (word.row, word.col, word.direction, _played_word(event))
+    assert {EventType.MOVE, EventType.EXCHANGE, EventType.PASS, EventType.PENALTY} <= {turn.type for turn in record.turns}
+
+
+def test_resignation_is_a_pragma(new_game):
+    game = new_game(2)
+    game.resign()
+    lines = to_gcg(game).splitlines()
+    assert lines[-1].startswith('#resign ')
+    assert parse_gcg(lines).turns[-1].type == EventType.RESIGN
+
+
+def test_parses_hand_written_turns():
+    record = parse_gcg(['#player1 a Ann', '', '>a: ?ABCDEF 8D bAD +12 12', '>a: ABC D8 .a +3 15',
+                        '>a: AB?C -?A +0 15', '>a: (Q?) -10 5'])
+    move, down, exchange, penalty = record.turns
+    assert move == GcgTurn(3, EventType.MOVE, 'a', '#ABCDEF', 12, 12, 7, 3, move.direction, 'bAD')
+    assert (down.row, down.col, down.direction.name) == (7, 3, 'VERTICAL')
+    assert exchange.exchanged == '#A' and penalty.rack == 'Q#' and penalty.score == -10
+
+
+@pytest.mark.parametrize('line, message', [
+    ('>a: ABC 8D CAB', 'bad score'),
+    ('>a: +3 3', 'no rack'),
+    ('>a: ABC 8D CAB X +3 3', 'unsupported'),
+    ('>a: ABC 99 CAB +3 3', 'Bad position'),
+    ('a: ABC 8D CAB +3 3', 'not a turn'),
+])
+def test_bad_lines_are_named(line, message):
+    with pytest.raises(ValueError, match=f'Line 2: .*{message}'):
+        parse_gcg(['#player1 a Ann', line])
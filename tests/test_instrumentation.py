@@ -0,0 +1,49 @@
+import pytest
+
+import game as game_module
+import instrumentation
+import move as move_module
+from conftest import play_greedy
+
+TURN_PHASES = {instrumentation.WORD_LOOKUP, instrumentation.PLACEMENT_VALIDATION, instrumentation.CROSS_WORDS,
+               instrumentation.SCORING, instrumentation.BOARD_UPDATE, instrumentation.RACK_REFILL,
+               instrumentation.END_OF_TURN}
+
+
+def test_phases_accumulate_while_collecting(new_game):
+    with instrumentation.collecting() as collector:
+        play_greedy(new_game(1), 4)
+        counts = {name: stats.count for name, stats in collector.phases.items()}
+        play_greedy(new_game(2), 4)
+    assert instrumentation.collector is None
+    assert set(collector.phases) == TURN_PHASES
+    for name, stats in collector.phases.items():
+        assert stats.count > counts[name]
+        assert stats.count == sum(stats.buckets)
+        assert 0 <= stats.minimum <= stats.maximum <= stats.total
+    snapshot = collector.snapshot()
+    assert snapshot[instrumentation.END_OF_TURN]['count'] == 8
+
+
+def test_runs_start_from_zero(new_game):
+    with instrumentation.collecting() as first:
+        play_greedy(new_game(1), 2)
+    with instrumentation.collecting() as second:
+        play_greedy(new_game(1), 2)
+    assert first is not second
+    assert first.snapshot().keys() == second.snapshot().keys()
+    assert all(first.phases[name].count == second.phases[name].count for name in first.phases)
+    second.reset()
+    assert second.snapshot() == {}
+
+
+def test_nothing_is_timed_without_a_collector(new_game, monkeypatch):
+    def no_clock():
+        raise AssertionError('timed without a collector')
+    monkeypatch.setattr(move_module, 'perf_counter', no_clock)
+    monkeypatch.setattr(game_module, 'perf_counter', no_clock)
+    assert instrumentation.collector is None
+    game = play_greedy(new_game(3), 6)
+    assert len(game.history) == 6
+    with pytest.raises(AssertionError, match='without a collector'), instrumentation.collecting():
+        play_greedy(game, 1)
@@ -0,0 +1,53 @@
+import random
+from array import array
+
+import pytest
+
+from exceptions import LeaveTableFormatError
+from leaves import SYMBOLS, LeaveIndex, LeaveTable, pack_leave_table
+
+
+def test_rank_and_unrank_are_a_bijection():
+    index = LeaveIndex(SYMBOLS, 3)
+    leaves = [index.unrank(rank) for rank in range(len(index))]
+    assert sorted(leaves) == sorted(index.leaves())
+    for rank, codes in enumerate(leaves):
+        counts = [codes.count(code) for code in range(SYMBOLS)]
+        assert index.rank_codes(codes) == index.rank(counts) == rank
+    with pytest.raises(ValueError):
+        index.unrank(len(index))
+
+
+def test_leaves_larger_than_the_index_are_refused():
+    index = LeaveIndex()
+    with pytest.raises(ValueError, match='larger'):
+        index.rank([7] + [0] * 26)
+    with pytest.raises(ValueError, match='larger'):
+        index.rank_codes([0] * 7)
+    assert index.rank([6] + [0] * 26) < len(index)
+
+
+def test_table_saves_and_loads_back_unchanged(tmp_path):
+    index = LeaveIndex(SYMBOLS, 2)
+    rng = random.Random(1)
+    values = array('f', (rng.uniform(-20, 20) for _ in range(len(index))))
+    path = tmp_path / 'leaves.lvt'
+    path.write_bytes(pack_leave_table(values, 2, 1234))
+    with LeaveTable.open(str(path)) as table:
+        assert (len(table), table.max_size, table.sample_count) == (len(index), 2, 1234)
+        for codes in index.leaves():
+            counts = [codes.count(code) for code in range(SYMBOLS)]
+            assert table.value(counts) == values[index.rank_codes(codes)]
+        assert table['Q#'] == values[index.key_rank('#Q')]
+        assert table['QUA'] == 0.0
+
+
+def test_damaged_tables_are_refused():
+    data = bytearray(pack_leave_table([0.5] * len(LeaveIndex(SYMBOLS, 1)), 1))
+    with pytest.raises(LeaveTableFormatError, match='truncated'):
+        LeaveTable(bytes(data[:-1]))
+    data[-1] ^= 0xFF
+    with pytest.raises(LeaveTableFormatError, match='checksum'):
+        LeaveTable(bytes(data))
+    with pytest.raises(ValueError):
+        pack_leave_table([0.5], 1)
@@ -0,0 +1,118 @@
+import os
+import random
+
+import pytest
+
+from conftest import ROOT
+from exceptions import LexiconFormatError
+from lexicon import Lexicon
+from packed_lexicon import HEADER_SIZE, PackedLexicon, SharedLexicon, load_lexicon, pack_lexicon
+
+WORDS = ['a', 'ab', 'aba', 'abs', 'bas', 'cab', 'cabs', 'scab', 'scaba', 'ba', 'bab', 'abba', 'sab']
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+
+@pytest.fixture(scope='module')
+def small_lexicon():
+    return Lexicon.from_words(WORDS + ['  CAB ', ''])
+
+
+def test_membership_prefixes_and_suffixes(small_lexicon):
+    strings = {word[i:j] for word in WORDS for i in range(len(word)) for j in range(i, len(word) + 1)} | {'abc', 'sabs'}
+    for string in strings:
+        assert (string in small_lexicon) == (string in WORDS)
+        assert small_lexicon.contains(string.upper()) == (string in WORDS)
+        assert small_lexicon.has_prefix(string) == any(word.startswith(string) for word in WORDS)
+        assert small_lexicon.has_suffix(string) == any(word.endswith(string) for word in WORDS)
+    assert len(small_lexicon) == len(WORDS)
+    assert list(small_lexicon.words()) == sorted(WORDS)
+
+
+def test_hooks_match_a_naive_search(small_lexicon):
+    parts = {''} | {word[i:j] for word in WORDS for i in range(len(word)) for j in range(i + 1, len(word) + 1)}
+    for before in parts:
+        for after in parts:
+            expected = ''.join(letter for letter in ALPHABET if before + letter + after in WORDS)
+            assert small_lexicon.hooks(before, after) == expected
+
+
+def test_dawg_view_walks_words_left_to_right(small_lexicon):
+    dawg = small_lexicon.dawg
+    assert dawg is small_lexicon.dawg
+    for word in WORDS:
+        assert dawg.contains(word) and dawg.is_terminal(dawg.follow(dawg.root, word))
+    assert not dawg.contains('sca') and dawg.has_prefix('sca')
+    assert [letter for letter, _ in dawg.children(dawg.follow(dawg.root, 'ab'))] == ['a', 'b', 's']
+
+
+def test_packed_lexicon_answers_like_the_built_one(small_lexicon):
+    packed = PackedLexicon(pack_lexicon(small_lexicon))
+    assert (len(packed), packed.node_count, packed.edge_count) == \
+        (len(small_lexicon), small_lexicon.node_count, small_lexicon.edge_count)
+    assert list(packed.words()) == list(small_lexicon.words())
+    assert packed.digest == small_lexicon.digest
+    for before in ['', 'a', 'ab', 'sc']:
+        for after in ['', 'b', 'ab', 's']:
+            assert packed.hooks(before, after) == small_lexicon.hooks(before, after)
+
+
+def test_packed_lexicon_rejects_damaged_files(small_lexicon):
+    data = bytearray(pack_lexicon(small_lexicon))
+    with pytest.raises(LexiconFormatError, match='truncated'):
+        PackedLexicon(bytes(data[:-4]))
+    with pytest.raises(LexiconFormatError, match='Not a compiled'):
+        PackedLexicon(b'XXXX' + bytes(data[4:]))
+    data[HEADER_SIZE] ^= 1
+    with pytest.raises(LexiconFormatError, match='checksum'):
+        PackedLexicon(bytes(data))
+    PackedLexicon(bytes(data), verify=False)
+
+
+def test_load_lexicon_compiles_and_reuses_the_packed_file(tmp_path):
+    source = tmp_path / 'words.txt'
+    source.write_text('\n'.join(WORDS))
+    compiled = tmp_path / 'words.lex'
+    first = load_lexicon(str(source))
+    assert isinstance(first, PackedLexicon) and compiled.exists()
+    assert list(first.words()) == sorted(WORDS)
+    first.close()
+    compiled.write_bytes(b'damaged')
+    os.utime(compiled, (os.path.getmtime(source) + 10,) * 2)
+    rebuilt = load_lexicon(str(source))
+    assert list(rebuilt.words()) == sorted(WORDS)
+    rebuilt.close()
+
+
+def test_full_word_list_round_trips(lexicon):
+    with open(os.path.join(ROOT, 'enable.txt')) as f:
+        words = sorted({line.strip().lower() for line in f if line.strip()})
+    known = set(words)
+    assert len(lexicon) == len(words)
+    for word in random.Random(1).sample(words, 2000):
+        assert word in lexicon
+        assert (word + 's' in lexicon) == (word + 's' in known)
+        assert (word[1:] in lexicon) == (word[1:] in known)
+    assert list(lexicon.words()) == words
+
+
+def _shared_answers(lexicon):
+    """What a worker process sees of a shared lexicon."""
+    return list(lexicon.words()), [lexicon.hooks('', 'b'), lexicon.hooks('sc', '')], 'scab' in lexicon
+
+
+def test_shared_lexicon_is_seen_by_other_processes_and_unlinked(small_lexicon):
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+    packed = PackedLexicon(pack_lexicon(small_lexicon))
+    expected = _shared_answers(packed)
+    with SharedLexicon.publish(packed) as shared:
+        name = shared.name
+        attached = SharedLexicon.attach(name, verify=True)
+        assert _shared_answers(attached) == _shared_answers(shared) == expected
+        attached.close()
+        with ProcessPoolExecutor(1) as executor:
+            assert executor.submit(_shared_answers, shared).result() == expected
+        assert 'scab' in shared
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name)
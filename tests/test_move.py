@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from array_board import ArrayBoard
+from enums import Direction
+from exceptions import InsufficientTilesError, InvalidWordError, TilesNotConnectedError
+from game import Game
+from move import Move
+from move_generator import MoveGenerator
+from settings_manager import DEFAULT_SETTINGS
+from tile import intern_tile
+from word import Word
+
+
+def state(game):
+    # Draws are random, so a move taken back leaves the bag holding the same tiles in another order
+    board = game.board
+    size = len(board.board)
+    return (str(board), [(player.name, player.score, [repr(tile) for tile in player.rack]) for player in game.players],
+            sorted(repr(tile) for tile in game.bag.tiles), game.current_player.name,
+            game.zero_score_streak, game.is_over, game.position_hash, len(game.history),
+            [(board.cross_check(row, col, direction), board.cross_sum(row, col, direction), board.is_anchor(row, col, direction))
+             for direction in Direction for row in range(size) for col in range(size)])
+
+
+@pytest.mark.parametrize('array', [False, True])
+def test_unmake_restores_the_position(lexicon, array):
+    board = ArrayBoard(DEFAULT_SETTINGS['default_board_layout']) if array else None
+    game = Game(lexicon, board=board, rng=random.Random(7))
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(7)
+    for _ in range(15):
+        if game.is_over:
+            break
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        before = state(game)
+        for placement in rng.sample(placements, min(4, len(placements))) + [None]:
+            game.make(None if placement is None else Move.from_placement(placement, game.current_player))
+            game.unmake()
+            assert state(game) == before
+        if placements:
+            game.make(Move.from_placement(max(placements, key=lambda placement: placement.score), game.current_player))
+        else:
+            game.pass_turn()
+
+
+def test_unmake_takes_back_several_turns(lexicon):
+    game = Game(lexicon, rng=random.Random(3))
+    generator = MoveGenerator(game.settings_manager)
+    before = state(game)
+    for _ in range(5):
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        game.make(Move.from_placement(placements[0], game.current_player) if placements else None)
+    for _ in range(5):
+        game.unmake()
+    assert state(game) == before
+
+
+@pytest.mark.parametrize('seed', [2, 5])
+def test_single_pass_scores_match_word_scoring(lexicon, seed):
+    game = Game(lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    for _ in range(10):
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if game.is_over or not placements:
+            break
+        move = Move.from_placement(random.Random(seed).choice(placements), game.current_player)
+        result = game.make(move)
+        placed = [(tile.row, tile.col) for tile in result.tiles]
+        for word_score in result.words:
+            word = Word(word_score.row, word_score.col, word_score.direction, game.board, game.settings_manager)
+            assert word.word == word_score.word
+            assert word.calculate_score(game.board, placed) == word_score.score
+        assert result.score == sum(word.score for word in result.words) + result.bingo_bonus
+
+
+@pytest.mark.parametrize('row, col, word, direction, error', [
+    (7, 7, 'QXZ', Direction.HORIZONTAL, InvalidWordError),
+    (0, 0, 'AT', Direction.HORIZONTAL, TilesNotConnectedError),
+    (7, 7, 'TEXTS', Direction.VERTICAL, InsufficientTilesError),
+])
+def test_rejected_moves_change_nothing(lexicon, row, col, word, direction, error):
+    game = Game(lexicon, rng=random.Random(1))
+    player = game.current_player
+    player.rack.replace_tiles([intern_tile(letter, 1) for letter in 'AETQXZS'])
+    before = state(game)
+    with pytest.raises(error):
+        game.make_move(row, col, word, direction, player)
+    assert state(game) == before
@@ -0,0 +1,99 @@
+import os
+import random
+
+import pytest
+
+from array_board import ArrayBoard
+from conftest import ROOT
+from enums import Direction
+from exceptions import ScrabbleError
+from game import Game
+from move import Move
+from move_generator import MoveGenerator
+
+SMALL_ALPHABET = set('aeilnorst')
+
+
+@pytest.fixture(scope='module')
+def small_words():
+    """The words of up to five letters spelt from a few common letters, small enough to try them all."""
+    with open(os.path.join(ROOT, 'enable.txt')) as f:
+        return {word for word in f.read().split() if 2 <= len(word) <= 5 and set(word) <= SMALL_ALPHABET}
+
+
+def played_game(lexicon, seed, turns, words=None):
+    game = Game(set(words) if words else lexicon, rng=random.Random(seed))
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(seed)
+    for _ in range(turns):
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        if game.is_over or not placements:
+            break
+        game.make(Move.from_placement(rng.choice(placements), game.current_player))
+    return game, generator
+
+
+def brute_force(game, words):
+    """Every play of a word from `words` the rack can make, found by trying each word at each square."""
+    board, player, settings_manager = game.board, game.current_player, game.settings_manager
+    size = len(board.board)
+    plays = set()
+    for direction in Direction:
+        step_r, step_c = (1, 0) if direction == Direction.VERTICAL else (0, 1)
+        for row in range(size):
+            for col in range(size):
+                for word in words:
+                    end_r, end_c = row + step_r * (len(word) - 1), col + step_c * (len(word) - 1)
+                    if end_r >= size or end_c >= size:
+                        continue
+                    needed = []
+                    for index, letter in enumerate(word):
+                        tile = board.get_square(row + step_r * index, col + step_c * index).tile
+                        if tile is None:
+                            needed.append(letter)
+                        elif tile.letter.lower() != letter:
+                            break
+                    else:
+                        if not needed or not player.rack.can_make(''.join(needed)):
+                            continue
+                        move = Move(row, col, word.upper(), direction, player)
+                        try:
+                            result = move.evaluate(board, settings_manager)
+                        except ScrabbleError:
+                            continue
+                        plays.add(play_key(result))
+    return plays
+
+
+def play_key(result):
+    """A play as the tiles it puts down and its score: a single tile forming words both ways is one play."""
+    return frozenset(result.tiles), result.score
+
+
+@pytest.mark.parametrize('seed, turns', [(1, 0), (2, 3), (3, 6)])
+def test_generator_finds_every_play(lexicon, small_words, seed, turns):
+    game, generator = played_game(lexicon, seed, turns, small_words)
+    if game.current_player.rack.count('#'):
+        pytest.skip('the brute force tries no blanks')
+    placements = list(generator.generate(game.board, game.current_player.rack))
+    generated = {play_key(Move.from_placement(placement, game.current_player).evaluate(game.board, game.settings_manager))
+                 for placement in placements}
+    assert len(generated) == len(placements)
+    assert generated == brute_force(game, small_words)
+
+
+@pytest.mark.parametrize('seed', [1, 4])
+def test_generated_plays_are_legal_and_scored(lexicon, seed):
+    game, generator = played_game(lexicon, seed, 8)
+    placements = list(generator.generate(game.board, game.current_player.rack))
+    assert placements
+    for placement in random.Random(seed).sample(placements, min(60, len(placements))):
+        result = Move.from_placement(placement, game.current_player).evaluate(game.board, game.settings_manager)
+        assert result.score == placement.score
+        assert all(word.word.lower() in lexicon for word in result.words)
+
+
+def test_array_board_generates_the_same_plays(lexicon):
+    game, generator = played_game(lexicon, 5, 6)
+    rack = game.current_player.rack
+    assert list(generator.generate(ArrayBoard.from_board(game.board), rack)) == list(generator.generate(game.board, rack))
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+import pytest
+
+from bag import ScrabbleBag
+from exceptions import InvalidLetterError, RackSizeError, TileNotInRackError
+from rack import Rack
+from settings_manager import SettingsManager
+from tile import BLANK, TILE_LETTERS, intern_tile
+
+
+@pytest.fixture
+def settings_manager(lexicon):
+    return SettingsManager(lexicon)
+
+
+def rack_of(settings_manager, letters):
+    rack = Rack(ScrabbleBag(settings_manager, random.Random(1)), settings_manager)
+    rack.replace_tiles([intern_tile(letter, 0 if letter == BLANK else 1) for letter in letters])
+    return rack
+
+
+def test_counts_follow_every_change(settings_manager):
+    bag = ScrabbleBag(settings_manager, random.Random(4))
+    rack = Rack(bag, settings_manager)
+    rng = random.Random(4)
+    for _ in range(40):
+        held = ''.join(tile.letter for tile in rack)
+        assert rack.counts == [held.count(letter) for letter in TILE_LETTERS]
+        if len(bag) < len(held):
+            break
+        rack.exchange_tiles(''.join(rng.sample(held, rng.randint(1, len(held)))), bag)
+        rack.pop(rng.randrange(len(rack)))
+        rack.refill(bag)
+
+
+@pytest.mark.parametrize('letters, word, expected', [
+    ('AEINRST', 'STAINER', True),
+    ('AEINRST', 'STAINERS', False),
+    ('AEIN#RT', 'TRAINEES', False),
+    ('AEIN#RT', 'RETAINS', True),
+    ('A##', 'ZZA', True),
+    ('A#', 'ZZ', False),
+    ('AB#', '#B', True),
+])
+def test_can_make(settings_manager, letters, word, expected):
+    assert rack_of(settings_manager, letters).can_make(word) is expected
+
+
+def test_leave_keys_are_canonical(settings_manager):
+    rack = rack_of(settings_manager, 'TEA#SEA')
+    assert rack.leave_key() == 'AAEEST#'
+    assert rack.leave_key('SEAT') == 'AE#'
+    assert rack.leave_key('#') == rack_of(settings_manager, 'SEATEA').leave_key()
+    with pytest.raises(TileNotInRackError):
+        rack.leave_key('Z')
+    with pytest.raises(InvalidLetterError):
+        rack.leave_key('1')
+
+
+def test_tile_queries(settings_manager):
+    rack = rack_of(settings_manager, 'QUIZ#')
+    assert rack.count('Z') == 1 and rack.count(BLANK) == 1 and rack.count('A') == 0
+    assert rack.has_tile('A') and not rack.has_exact_tile('A')
+    assert rack.get_tile('Q').letter == 'Q'
+    blank = rack.get_tile('X')
+    assert blank.letter == 'X' and blank.value == 0
+    with pytest.raises(RackSizeError):
+        rack.replace_tiles([intern_tile('A', 1)] * 8)
+
+
+def test_exchange_draws_as_many_tiles(settings_manager):
+    bag = ScrabbleBag(settings_manager, random.Random(2))
+    rack = Rack(bag, settings_manager)
+    total = Counter(tile.letter for tile in rack) + Counter(tile.letter for tile in bag.tiles)
+    rack.exchange_tiles(''.join(tile.letter for tile in rack.tiles[:4]), bag)
+    assert len(rack) == rack.max_rack_size
+    assert Counter(tile.letter for tile in rack) + Counter(tile.letter for tile in bag.tiles) == total
@@ -0,0 +1,55 @@
+import random
+import re
+
+import pytest
+
+from conftest import play_greedy
+from game import Game
+from gcg import parse_gcg, to_gcg
+from replay import replay_record
+
+
+@pytest.fixture(scope='module')
+def record_lines(lexicon):
+    """The GCG lines of a finished greedy game in which a blank was played."""
+    for seed in range(1, 30):
+        lines = to_gcg(play_greedy(Game(lexicon, rng=random.Random(seed)))).splitlines()
+        if any(re.match(r'>\S+: \S+ \S+ \S*[a-z]', line) for line in lines):
+            return lines
+    pytest.fail('No game played a blank')
+
+
+def replay(lines, lexicon):
+    return replay_record(parse_gcg(lines), lexicon)
+
+
+def tampered(lines, pattern, change):
+    """The lines with the first line matching `pattern` changed, and its (one-based) number."""
+    for number, line in enumerate(lines):
+        if re.match(pattern, line):
+            return lines[:number] + [change(line)] + lines[number + 1:], number + 1
+    pytest.fail(f'No line matches {pattern}')
+
+
+def test_recorded_game_checks_out(record_lines, lexicon):
+    turns, divergence = replay(record_lines, lexicon)
+    assert divergence is None
+    assert turns == sum(line.startswith('>') for line in record_lines)
+
+
+def test_blank_played_as_a_letter_diverges(record_lines, lexicon):
+    def unmark(line):
+        nick, rack, position, word, rest = line.split(' ', 4)
+        return ' '.join((nick, rack, position, word.upper(), rest))
+    lines, number = tampered(record_lines, r'>\S+: \S+ \S+ \S*[a-z]', unmark)
+    _, divergence = replay(lines, lexicon)
+    assert divergence is not None
+    assert divergence.line == number
+
+
+def test_wrong_score_diverges(record_lines, lexicon):
+    lines, number = tampered(record_lines, r'>\S+: \S+ \S+ \S+ \+[1-9]',
+                             lambda line: re.sub(r'\+(\d+)', lambda m: f'+{int(m.group(1)) + 1}', line, count=1))
+    _, divergence = replay(lines, lexicon)
+    assert divergence is not None and divergence.line == number
+    assert 'Score' in divergence.message
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from server import MAX_WORDS, GameServer
+
+
+def run(lexicon, *requests):
+    """The responses of a fresh server to `requests`; '$game' in a request stands for the game made first."""
+    async def session():
+        server = GameServer(lexicon)
+        game = (await server.handle({'command': 'new', 'seed': 1}))['result']['game']
+        responses = []
+        for request in requests:
+            responses.append(await server.handle({key: game if value == '$game' else value
+                                                   for key, value in request.items()}))
+        return responses
+    return asyncio.run(session())
+
+
+@pytest.mark.parametrize('players, message', [
+    (['x' * 300, 'b'], '1 to 64 characters'),
+    (['a'], 'player'),
+    (['a', 'a'], 'different'),
+    ([' ', 'b'], '1 to 64 characters'),
+])
+def test_new_rejects_bad_players(lexicon, players, message):
+    response, = run(lexicon, {'command': 'new', 'players': players})
+    assert not response['ok'] and response['error'] == 'ProtocolError'
+    assert message in response['message']
+
+
+@pytest.mark.parametrize('limit', [-1, 2.5, '3', True, MAX_WORDS + 1])
+def test_hint_rejects_bad_limits(lexicon, limit):
+    response, = run(lexicon, {'command': 'hint', 'game': '$game', 'limit': limit})
+    assert not response['ok'] and response['error'] == 'ProtocolError'
+
+
+def test_hint_returns_the_best_placements(lexicon):
+    response, = run(lexicon, {'command': 'hint', 'game': '$game', 'limit': 3})
+    scores = [placement['score'] for placement in response['result']]
+    assert len(scores) == 3 and scores == sorted(scores, reverse=True)
+
+
+def test_failed_exchange_answers_and_keeps_the_game(lexicon):
+    state, exchange, after = run(lexicon, {'command': 'state', 'game': '$game'},
+                                 {'command': 'exchange', 'game': '$game', 'tiles': 'QQQZZ'},
+                                 {'command': 'state', 'game': '$game'})
+    assert not exchange['ok'] and exchange['error'] in ('TileNotInRackError', 'InvalidLetterError')
+    assert after == state
+
+
+@pytest.mark.parametrize('request_, message', [
+    ({'command': 'anagram', 'letters': 'a' * 16}, 'at most 15 characters'),
+    ({'command': 'anagram', 'letters': 'abcdefghijklm', 'partial': True}, 'at most 12 characters'),
+    ({'command': 'anagram', 'letters': 'ab###'}, 'at most 2 blanks'),
+    ({'command': 'pattern', 'pattern': '?' * 16}, 'at most 15 characters'),
+    ({'command': 'pattern', 'pattern': '*', 'rack': 'abc###'}, 'at most 2 blanks'),
+    ({'command': 'solve', 'game': '$game', 'time_limit': 1e9}, 'time_limit'),
+    ({'command': 'solve', 'game': '$game', 'time_limit': 0}, 'time_limit'),
+    ({'command': 'solve', 'game': '$game', 'time_limit': float('nan')}, 'time_limit'),
+])
+def test_costly_queries_are_refused(lexicon, request_, message):
+    response, = run(lexicon, request_)
+    assert not response['ok'] and response['error'] == 'ProtocolError'
+    assert message in response['message']
+
+
+def test_queries_within_the_bounds_are_answered(lexicon):
+    anagram, pattern = run(lexicon, {'command': 'anagram', 'letters': 'retains##', 'limit': 5},
+                           {'command': 'pattern', 'pattern': '#?#?#', 'rack': 'qu##', 'limit': 5})
+    assert anagram['ok'] and len(anagram['result']) == 5
+    assert pattern['ok']
@@ -0,0 +1,51 @@
+import pytest
+
+from game import Game
+from packed_lexicon import load_lexicon_in_background
+from settings_manager import SettingsManager
+
+
+def test_managers_with_the_same_words_share_the_lexicon():
+    words = {'cat', 'cats', 'act', 'scat'}
+    first = SettingsManager(set(words))
+    second = SettingsManager(set(words), {'bingo_bonus': 35})
+    assert first.lexicon is second.lexicon
+    assert first.is_valid_word('scat') and not first.is_valid_word('tac')
+    assert SettingsManager(words | {'tac'}).lexicon is not first.lexicon
+
+
+def test_managers_share_the_ruleset_of_equal_settings(lexicon):
+    first = SettingsManager(lexicon, {'bingo_bonus': 35})
+    assert first.ruleset is SettingsManager(lexicon, {'bingo_bonus': 35}).ruleset
+    first.game_mechanics.bingo_bonus = 40
+    assert first.ruleset.bingo_bonus == 40
+
+
+def test_setting_the_word_set_replaces_the_lexicon(lexicon):
+    manager = SettingsManager({'cat', 'cats'})
+    assert manager.is_valid_word('cat')
+    manager.word_set = {'dog', 'dogs'}
+    assert manager.is_valid_word('dog') and not manager.is_valid_word('cat')
+
+    manager = SettingsManager(lexicon)
+    manager.word_set = {'zzz'}
+    assert manager.lexicon is not lexicon and manager.is_valid_word('zzz')
+
+
+def test_background_load_resolves_to_the_word_list(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('cat\ncats\nact\n')
+    manager = SettingsManager(load_lexicon_in_background(str(path)))
+    game = Game(None, settings_manager=manager)
+    assert manager.is_valid_word('cats') and not manager.is_valid_word('tac')
+    assert not manager.lexicon_loading
+    assert list(manager.lexicon.words()) == ['act', 'cat', 'cats']
+    assert game.board.lexicon is manager.lexicon
+
+
+def test_background_load_errors_reach_the_first_lexicon_use(tmp_path):
+    future = load_lexicon_in_background(str(tmp_path / 'missing.txt'))
+    manager = SettingsManager(future)
+    with pytest.raises(FileNotFoundError):
+        manager.lexicon
+    assert isinstance(future.exception(), FileNotFoundError)
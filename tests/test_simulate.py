@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+from simulate import completed_games, game_seed, run
+
+LEXICON = os.path.join(ROOT, 'enable.txt')
+TIMINGS = ('seconds', 'move_seconds')
+
+
+def records(path):
+    """The records of `path` by game, without their timings."""
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    games = {record['game']: {key: value for key, value in record.items() if key not in TIMINGS} for record in lines}
+    assert len(games) == len(lines)
+    return games
+
+
+def test_seeded_runs_write_the_same_records(tmp_path):
+    first, second = tmp_path / 'first.jsonl', tmp_path / 'second.jsonl'
+    assert run(4, ['greedy', 'random'], str(first), LEXICON, seed=5, workers=2) == 4
+    assert run(4, ['greedy', 'random'], str(second), LEXICON, seed=5, workers=1) == 4
+    assert records(first) == records(second)
+    assert sorted(records(first)) == [0, 1, 2, 3]
+    assert all(record['seed'] == game_seed(5, index) for index, record in records(first).items())
+
+
+def test_resume_skips_finished_games_and_reruns_a_cut_off_one(tmp_path):
+    output = tmp_path / 'games.jsonl'
+    run(3, ['greedy', 'greedy'], str(output), LEXICON, seed=2, workers=2)
+    complete = records(output)
+    assert run(3, ['greedy', 'greedy'], str(output), LEXICON, seed=2, workers=2, resume=True) == 0
+
+    lines = output.read_text().splitlines(keepends=True)
+    cut = json.loads(lines[-1])['game']
+    output.write_text(''.join(lines[:-1]) + lines[-1][:20])
+    assert completed_games(str(output), 2) == set(complete) - {cut}
+    assert run(5, ['greedy', 'greedy'], str(output), LEXICON, seed=2, workers=2, resume=True) == 3
+    resumed = records(output)
+    assert sorted(resumed) == [0, 1, 2, 3, 4]
+    assert all(resumed[index] == record for index, record in complete.items())
+
+
+def test_resume_refuses_a_file_from_another_seed(tmp_path):
+    output = tmp_path / 'games.jsonl'
+    run(1, ['pass', 'pass'], str(output), LEXICON, seed=1, workers=1)
+    with pytest.raises(ValueError, match='different seed'):
+        run(2, ['pass', 'pass'], str(output), LEXICON, seed=2, workers=1, resume=True)
@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import play_greedy
+from exceptions import SnapshotFormatError, SnapshotMismatchError
+from snapshot import restore, snapshot
+
+
+def position(game):
+    return (str(game.board),
+            [(player.name, player.score, [(tile.letter, tile.value) for tile in player.rack]) for player in game.players],
+            game.current_player.name, [(tile.letter, tile.value) for tile in game.bag.tiles],
+            game.bag.rng.getstate(), game.zero_score_streak, game.is_over, game.position_hash)
+
+
+def test_round_trip_every_turn(new_game):
+    game = new_game(3)
+    generator_states = []
+    while not game.is_over and len(generator_states) < 12:
+        generator_states.append((snapshot(game), position(game)))
+        play_greedy(game, 1)
+    for data, expected in generator_states:
+        assert position(restore(data, game.settings_manager.lexicon, settings_manager=game.settings_manager)) == expected
+
+
+def test_restored_game_continues_identically(new_game, lexicon):
+    game = play_greedy(new_game(5), 6)
+    restored = restore(snapshot(game), lexicon)
+    assert position(play_greedy(restored)) == position(play_greedy(game))
+
+
+def test_long_player_names_round_trip(new_game, lexicon):
+    names = ['é' * 300, 'Player ' + 'b' * 1000]
+    game = play_greedy(new_game(2, player_names=names), 3)
+    restored = restore(snapshot(game), lexicon)
+    assert sorted(player.name for player in restored.players) == sorted(names)
+    assert position(restored) == position(game)
+
+
+def test_rejects_other_settings_and_damage(new_game, lexicon):
+    data = snapshot(play_greedy(new_game(1), 2))
+    with pytest.raises(SnapshotMismatchError):
+        restore(data, lexicon, {'bingo_bonus': 40})
+    damaged = bytearray(data)
+    damaged[100] ^= 1
+    with pytest.raises(SnapshotFormatError):
+        restore(bytes(damaged), lexicon)
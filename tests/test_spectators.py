@@ -0,0 +1,77 @@
+import asyncio
+import random
+
+from conftest import play_greedy
+from game import Game
+from server import GameClient, GameServer
+from spectators import GameBroadcaster, board_cells
+
+
+class Spectator:
+    """Rebuilds the board from the messages it is sent."""
+
+    def __init__(self) -> None:
+        self.cells = {}
+        self.seq = None
+
+    def __call__(self, message: dict) -> None:
+        if message['type'] == 'snapshot':
+            self.cells = {}
+        else:
+            assert message['seq'] == self.seq + 1
+        self.seq = message['seq']
+        for row, col, letter, blank in message['cells']:
+            self.cells[row, col] = (letter, blank)
+
+
+def test_turn_deltas_rebuild_the_board(lexicon):
+    game = Game(lexicon, rng=random.Random(3))
+    broadcaster = GameBroadcaster(game)
+    early, late = Spectator(), Spectator()
+    broadcaster.subscribe(early)
+    for turn in range(40):
+        if game.is_over:
+            break
+        play_greedy(game, 1)
+        if turn == 4:
+            broadcaster.subscribe(late)
+        if turn == 7:
+            game.unmake()
+            play_greedy(game, 1)
+        broadcaster.publish()
+    truth = {(row, col): (letter, blank) for row, col, letter, blank in board_cells(game)}
+    assert early.cells == truth and late.cells == truth
+    assert early.seq == late.seq == len(game.history)
+
+
+def test_listener_that_raises_is_dropped(lexicon):
+    def broken(message):
+        raise RuntimeError
+    broadcaster = GameBroadcaster(Game(lexicon, rng=random.Random(1)))
+    broadcaster.subscribe(broken)
+    assert len(broadcaster) == 0
+
+
+def test_closing_a_game_notifies_its_watchers(lexicon):
+    async def session():
+        server = GameServer(lexicon)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        player = await GameClient.connect(port=port)
+        spectator = await GameClient.connect(port=port)
+        try:
+            game = (await player.request('new', seed=5))['game']
+            assert (await spectator.request('watch', game=game))['spectators'] == 1
+            assert (await spectator.spectating.get())['type'] == 'snapshot'
+            await player.request('pass', game=game)
+            assert (await spectator.spectating.get())['event'] == 'pass'
+            hosted = server.games[game]
+            await player.request('close', game=game)
+            closed = await asyncio.wait_for(spectator.spectating.get(), 5)
+            assert closed == {'watch': game, 'type': 'closed', 'seq': 1}
+            assert not server.games and not hosted.watchers
+        finally:
+            await player.close()
+            await spectator.close()
+            listener.close()
+    asyncio.run(session())
@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+from collections import Counter
+
+import pytest
+
+from exceptions import InvalidLetterError
+from lexicon import Lexicon
+from server import GameServer
+from word_search import ALPHABET, AnagramIndex, fixed_pattern, match_pattern
+
+WORDS = sorted({''.join(letters) for size in range(2, 6) for letters in itertools.product('aelst', repeat=size)
+                if sum(map(ord, letters)) % 7 < 2} | {'least', 'slate', 'stale', 'steal', 'tales', 'teals', 'at', 'eat'})
+
+
+@pytest.fixture(scope='module')
+def small_lexicon():
+    return Lexicon.from_words(WORDS)
+
+
+def spellable(word, letters):
+    """Whether `word` can be spelt from `letters`, '#' standing for any one letter."""
+    missing = Counter(word) - Counter(letter for letter in letters if letter != '#')
+    return sum(missing.values()) <= letters.count('#')
+
+
+@pytest.mark.parametrize('letters', ['aelst', 'tae', 'ta#', 'a#s#e', 'xyz', '##'])
+def test_anagrams_match_a_brute_force(small_lexicon, letters):
+    index = AnagramIndex.for_lexicon(small_lexicon)
+    exact = list(index.anagrams(letters))
+    assert sorted(exact) == [word for word in WORDS if len(word) == len(letters) and spellable(word, letters)]
+    partial = list(index.anagrams(letters, partial=True, min_length=3))
+    assert sorted(partial) == [word for word in WORDS if 3 <= len(word) <= len(letters) and spellable(word, letters)]
+    assert [len(word) for word in partial] == sorted(map(len, partial), reverse=True)
+    assert list(index.anagrams(letters, limit=2, partial=True)) == list(index.anagrams(letters, partial=True))[:2]
+
+
+def test_anagram_index_is_shared_and_checks_letters(small_lexicon):
+    assert AnagramIndex.for_lexicon(small_lexicon) is AnagramIndex.for_lexicon(small_lexicon)
+    assert len(AnagramIndex.for_lexicon(small_lexicon)) == len(WORDS)
+    with pytest.raises(InvalidLetterError):
+        list(AnagramIndex.for_lexicon(small_lexicon).anagrams('a1'))
+
+
+def matches(word, pattern, rack):
+    """Brute force: try every way of matching `word` against `pattern`, spending tiles from `rack`."""
+    if not pattern:
+        return not word
+    token, rest = pattern[0], pattern[1:]
+    if not word:
+        return token == '*' and matches(word, rest, rack)
+    if token == '*':
+        if matches(word, rest, rack):
+            return True
+        if rack is None:
+            return matches(word[1:], pattern, None)
+        return any(matches(word[1:], pattern, left) for left in spend(word[0], rack, False))
+    if token in ALPHABET:
+        return token == word[0] and matches(word[1:], rest, rack)
+    if rack is None:
+        return matches(word[1:], rest, None)
+    return any(matches(word[1:], rest, left) for left in spend(word[0], rack, token == '#'))
+
+
+def spend(letter, rack, blank):
+    """The racks left after playing `letter`, from the letter itself (unless `blank`) or a blank."""
+    left = []
+    if not blank and letter in rack:
+        left.append(rack.replace(letter, '', 1))
+    if '#' in rack:
+        left.append(rack.replace('#', '', 1))
+    return left
+
+
+@pytest.mark.parametrize('pattern', ['s*', '*s', '?a?', 'st#?e', '*a*e*', '*', 's??*t'])
+@pytest.mark.parametrize('rack', [None, 'aelt', 'te#', 'l#', ''])
+def test_patterns_match_a_brute_force(small_lexicon, pattern, rack):
+    assert list(match_pattern(small_lexicon, pattern, rack)) == [word for word in WORDS if matches(word, pattern, rack)]
+
+
+def test_pattern_limit_and_fixed_positions(small_lexicon):
+    assert list(match_pattern(small_lexicon, '*', limit=3)) == WORDS[:3]
+    assert fixed_pattern(5, {0: 's', 4: 'e'}) == 's???e'
+    assert list(match_pattern(small_lexicon, 's???e')) == [word for word in WORDS if len(word) == 5 and word[0] == 's' and word[4] == 'e']
+    with pytest.raises(ValueError):
+        fixed_pattern(3, {3: 'a'})
+
+
+def test_server_word_queries(small_lexicon):
+    async def session():
+        server = GameServer(small_lexicon)
+        return [await server.handle(request) for request in (
+            {'command': 'judge', 'words': ['slate', 'slatex']},
+            {'command': 'anagram', 'letters': 'tae', 'partial': True},
+            {'command': 'pattern', 'pattern': 's*e', 'rack': 'aelt#'},
+            {'command': 'pattern', 'pattern': '?', 'limit': -1},
+        )]
+    judge, anagram, pattern, bad = asyncio.run(session())
+    assert judge['result'] == {'slate': True, 'slatex': False}
+    assert anagram['result'] == list(AnagramIndex.for_lexicon(small_lexicon).anagrams('tae', 100, True))
+    assert pattern['result'] == list(match_pattern(small_lexicon, 's*e', 'aelt#'))
+    assert not bad['ok'] and bad['error'] == 'ProtocolError'
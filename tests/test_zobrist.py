@@ -0,0 +1,45 @@
+import random
+
+from move import Move
+from move_generator import MoveGenerator
+from zobrist import ZobristKeys, position_hash
+
+
+def test_incremental_hash_matches_a_recompute(new_game):
+    game = new_game(9)
+    generator = MoveGenerator(game.settings_manager)
+    rng = random.Random(9)
+    while not game.is_over:
+        assert game.position_hash == position_hash(game, game.zobrist)
+        placements = list(generator.generate(game.board, game.current_player.rack))
+        choice = rng.random()
+        if choice < 0.1 or not placements:
+            game.pass_turn()
+        elif choice < 0.2 and len(game.bag) >= 7:
+            game.exchange_tiles(''.join(tile.letter for tile in game.current_player.rack.tiles[:2]))
+        else:
+            before = game.position_hash
+            game.make(Move.from_placement(rng.choice(placements), game.current_player))
+            assert game.position_hash == position_hash(game, game.zobrist)
+            if rng.random() < 0.3:
+                game.unmake()
+                assert game.position_hash == before
+                game.make(Move.from_placement(rng.choice(placements), game.current_player))
+    assert game.position_hash == position_hash(game, game.zobrist)
+
+
+def test_passes_only_change_the_turn_and_streak_keys(new_game):
+    game = new_game(2)
+    keys = game.zobrist
+    start = game.position_hash
+    game.pass_turn()
+    game.pass_turn()
+    assert game.position_hash == start ^ keys.streak(0) ^ keys.streak(2)
+    game.unmake()
+    game.unmake()
+    assert game.position_hash == start
+
+
+def test_games_of_the_same_shape_share_keys(new_game):
+    assert new_game(1).zobrist is new_game(2).zobrist is ZobristKeys.for_game(new_game(3))
+    assert new_game(1, settings_dict={"player_count": 3}).zobrist is not new_game(1).zobrist
@@ -1,8 +1,20 @@
-from typing import Union
+from typing import Dict, Tuple, Union
 
 from exceptions import InvalidLetterError, InvalidValueError, NonBlankTileError
 
+BLANK = '#'
+TILE_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' + BLANK
+LETTER_CODES = {letter: code for code, letter in enumerate(TILE_LETTERS)}
+BLANK_CODE = LETTER_CODES[BLANK]
+
 class ScrabbleTile:
+    """
+    A tile: its letter and value, and `code`, its index in TILE_LETTERS. Blanks keep BLANK_CODE
+    after a letter is assigned to them. Only blanks change, so every other tile of a letter and
+    value can be one shared object; `intern_tile` hands those out.
+    """
+    __slots__ = ('_letter', '_value', 'code')
+
     def __init__(self, letter: str, value: int):
         if not isinstance(letter, str) or len(letter) != 1:
             raise InvalidLetterError()
@@ -11,7 +23,7 @@ class ScrabbleTile:
 
         self._letter = letter
         self._value = value
-        self.placed_this_turn = False
+        self.code = BLANK_CODE if value == 0 else LETTER_CODES.get(letter.upper(), BLANK_CODE)
 
     @property
     def letter(self) -> str:
@@ -29,13 +41,22 @@ class ScrabbleTile:
     def value(self) -> int:
         return self._value
 
-    def place_on_board(self) -> None:
-        """Method to indicate that the tile has been placed on the board this turn."""
-        self.placed_this_turn = True
-    
-    def reset_placement_status(self) -> None:
-        """Method to reset the placed_this_turn attribute after processing the move."""
-        self.placed_this_turn = False
+    def reset_blank(self) -> None:
+        """Method to return a blank tile whose letter was assigned to the unassigned state."""
+        if self._value != 0:
+            raise NonBlankTileError()
+        self._letter = '#'
+
+    def __copy__(self) -> 'ScrabbleTile':
+        if self.code != BLANK_CODE:
+            return self
+        tile = ScrabbleTile(BLANK, self._value)
+        tile._letter = self._letter
+        return tile
+
+    def __deepcopy__(self, memo: dict) -> 'ScrabbleTile':
+        """Only blanks change, so copies of anything else share the tile."""
+        return self.__copy__()
 
     def __repr__(self) -> str:
         return f'ScrabbleTile({self.letter}, {self.value})'
@@ -45,16 +66,31 @@ class ScrabbleTile:
     
     def __lt__(self, other: 'ScrabbleTile') -> bool:
         """Tiles are sorted based on their letters."""
-        return self.letter < other.letter
+        return self._letter < other._letter
     
     def __gt__(self, other: 'ScrabbleTile') -> bool:
         """Tiles are sorted based on their letters."""
-        return self.letter > other.letter
+        return self._letter > other._letter
     
     def __eq__(self, other: Union['ScrabbleTile', str]) -> bool:
         """Tiles are equal if their letters (case insensitive) and values match. Also allows comparison with a string."""
+        if self is other:
+            return True
         if isinstance(other, str):
-            return self.letter.upper() == other.upper()
+            return self._letter == other or self._letter.upper() == other.upper()
         if not isinstance(other, ScrabbleTile):
             return False
-        return self.letter == other.letter and self.value == other.value
\ No newline at end of file
+        return self._letter == other._letter and self._value == other._value
+
+
+_interned: Dict[Tuple[str, int], ScrabbleTile] = {}
+
+
+def intern_tile(letter: str, value: int) -> ScrabbleTile:
+    """The shared tile for `letter` and `value`. Blanks get a tile of their own, as their letter changes in play."""
+    if letter == BLANK or value == 0:
+        return ScrabbleTile(letter, value)
+    tile = _interned.get((letter, value))
+    if tile is None:
+        tile = _interned[letter, value] = ScrabbleTile(letter, value)
+    return tile
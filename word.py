@@ -1,3 +1,5 @@
+from typing import Iterable, Tuple
+
 from enums import Direction
 from settings_manager import SettingsManager
 from board import ScrabbleBoard
@@ -19,7 +21,7 @@ class Word:
         row_offset = self.direction == Direction.VERTICAL
         col_offset = self.direction == Direction.HORIZONTAL
 
-        while board.get_square(self.row - row_offset, self.column - col_offset).tile:
+        while board.has_tile(self.row - row_offset, self.column - col_offset):
             if row_offset:
                 self.row -= 1
             if col_offset:
@@ -32,11 +34,9 @@ class Word:
         row_offset = (self.direction == Direction.VERTICAL)
         col_offset = (self.direction == Direction.HORIZONTAL)
 
-        current_square = board.get_square(self.row + row_offset * offset, self.column + col_offset * offset)
-        while current_square.tile:
-            self.word += current_square.tile.letter
+        while board.has_tile(self.row + row_offset * offset, self.column + col_offset * offset):
+            self.word += board.get_square(self.row + row_offset * offset, self.column + col_offset * offset).tile.letter
             offset += 1
-            current_square = board.get_square(self.row + row_offset * offset, self.column + col_offset * offset)
         self.word = self.word.upper()
 
     def calculate_word(self, board: ScrabbleBoard, settings_manager: SettingsManager) -> None:
@@ -46,8 +46,10 @@ class Word:
         if not settings_manager.is_valid_word(self.word):
             raise InvalidWordError(f'Invalid word: {self.word}')
 
-    def calculate_score(self, board: ScrabbleBoard) -> int:
-        """Calculates and returns the score of the word."""
+    def calculate_score(self, board: ScrabbleBoard, placed_positions: Iterable[Tuple[int, int]] = ()) -> int:
+        """Calculates and returns the score of the word. Premium squares count under the tiles at `placed_positions`,
+        the squares a move has just covered."""
+        placed = set(placed_positions)
         self.score = 0
         self.multiplier = 1
         current_row = self.row
@@ -55,7 +57,7 @@ class Word:
 
         for _ in self.word:
             square = board.get_square(current_row, current_column)
-            tile_score, tile_multiplier = square.calculate_score()
+            tile_score, tile_multiplier = square.calculate_score((current_row, current_column) in placed)
             self.score += tile_score
             self.multiplier *= tile_multiplier
             if self.direction == Direction.HORIZONTAL:
@@ -0,0 +1,189 @@
+from itertools import combinations_with_replacement, islice
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from exceptions import InvalidLetterError
+from lexicon import Lexicon
+from tile import BLANK
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+ANY_LETTER = '?'
+ANY_LETTERS = '*'
+TILE_CHARS = ALPHABET + BLANK
+BLANK_INDEX = len(ALPHABET)
+
+# A place in a pattern and, when matching against a rack, the count of each tile left on it
+State = Tuple[int, Optional[Tuple[int, ...]]]
+
+_indexes: 'WeakKeyDictionary[Lexicon, AnagramIndex]' = WeakKeyDictionary()
+
+
+def _letters(letters: str, allowed: str) -> str:
+    letters = letters.lower()
+    for char in letters:
+        if char not in ALPHABET and char not in allowed:
+            raise InvalidLetterError(f"'{char}' is not a letter")
+    return letters
+
+
+class AnagramIndex:
+    """
+    The words of a lexicon grouped by their letters, sorted: 'aelst' -> least, slate, stale, steal, ...
+    An anagram query is then a dictionary lookup per letter multiset the rack can spell, blanks
+    (written '#') standing for any letter.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        groups: Dict[str, List[str]] = {}
+        for word in words:
+            word = word.lower()
+            groups.setdefault(''.join(sorted(word)), []).append(word)
+        self._groups = {key: tuple(sorted(group)) for key, group in groups.items()}
+
+    @classmethod
+    def for_lexicon(cls, lexicon: Lexicon) -> 'AnagramIndex':
+        """The index of `lexicon`'s words, built on first use and shared while the lexicon lives."""
+        index = _indexes.get(lexicon)
+        if index is None:
+            index = _indexes[lexicon] = cls(lexicon.words())
+        return index
+
+    def anagrams(self, letters: str, limit: Optional[int] = None, partial: bool = False,
+                 min_length: int = 2) -> Iterator[str]:
+        """
+        Words using exactly `letters`, or with `partial` any `min_length` or more of them, longest
+        first. '#' is a blank. Words are yielded lazily, at most `limit` of them.
+        """
+        letters = _letters(letters, BLANK)
+        return islice(self._anagrams(letters, partial, min_length), limit)
+
+    def _anagrams(self, letters: str, partial: bool, min_length: int) -> Iterator[str]:
+        blanks = letters.count(BLANK)
+        counts = sorted((letter, letters.count(letter)) for letter in set(letters) if letter != BLANK)
+        sizes = range(len(letters), max(min_length, 1) - 1, -1) if partial else (len(letters),)
+        for size in sizes:
+            seen = set()
+            for used_blanks in range(min(blanks, size) if partial else blanks, -1, -1):
+                if not partial and used_blanks != blanks:
+                    break
+                for fixed in _sub_multisets(counts, size - used_blanks):
+                    for fill in combinations_with_replacement(ALPHABET, used_blanks):
+                        key = ''.join(sorted(fixed + ''.join(fill)))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        yield from self._groups.get(key, ())
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._groups.values())
+
+
+def _sub_multisets(counts: List[Tuple[str, int]], size: int, start: int = 0) -> Iterator[str]:
+    """Every multiset of `size` letters drawn from `counts`, as a sorted string."""
+    if size == 0:
+        yield ''
+        return
+    if start == len(counts) or size > sum(count for _, count in counts[start:]):
+        return
+    letter, count = counts[start]
+    for taken in range(min(count, size), -1, -1):
+        for rest in _sub_multisets(counts, size - taken, start + 1):
+            yield letter * taken + rest
+
+
+def fixed_pattern(length: int, letters: Dict[int, str]) -> str:
+    """The pattern of `length`-letter words with the given letters at the given (zero-based) positions."""
+    squares = [ANY_LETTER] * length
+    for position, letter in letters.items():
+        if not 0 <= position < length:
+            raise ValueError(f'Position {position} is outside a {length} letter word')
+        squares[position] = letter
+    return ''.join(squares)
+
+
+def match_pattern(lexicon: Lexicon, pattern: str, rack: Optional[str] = None,
+                  limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Words matching `pattern`, in alphabetical order: letters stand for themselves, '?' for any
+    one letter, '#' for a letter played with a blank and '*' for any number of letters. With a
+    `rack` ('#' for blanks), the letters matched by '?', '#' and '*' must be played from it;
+    fixed letters are taken to be on the board already. Words are yielded lazily, at most `limit`.
+    """
+    pattern = _letters(pattern, ANY_LETTER + BLANK + ANY_LETTERS)
+    counts = None
+    if rack is not None:
+        rack = _letters(rack, BLANK)
+        counts = tuple(rack.count(letter) for letter in TILE_CHARS)
+    matches = _PatternSearch(lexicon, pattern).words(counts)
+    return islice(matches, limit)
+
+
+class _PatternSearch:
+    """
+    Walks the lexicon's DAWG view in alphabetical order, carrying the set of places in the pattern
+    (and, with a rack, the tiles left) each prefix can have reached, and pruning it where none remain.
+    Every word is reached once however many ways its letters can be split between stars.
+    """
+
+    def __init__(self, lexicon: Lexicon, pattern: str) -> None:
+        self.dawg = lexicon.dawg
+        self.pattern = pattern
+        # The same few sets of states recur all over the lexicon
+        self.steps: Dict[Tuple[FrozenSet[State], str], FrozenSet[State]] = {}
+
+    def words(self, counts: Optional[Tuple[int, ...]]) -> Iterator[str]:
+        dawg = self.dawg
+        end = len(self.pattern)
+        steps = self.steps
+        stack = [(dawg.root, '', self.closure({(0, counts)}))]
+        while stack:
+            node, prefix, states = stack.pop()
+            if dawg.is_terminal(node) and any(position == end for position, _ in states):
+                yield prefix
+            branches = []
+            for letter, child in dawg.children(node):
+                following = steps.get((states, letter))
+                if following is None:
+                    following = steps[states, letter] = self.step(states, letter)
+                if following:
+                    branches.append((child, prefix + letter, following))
+            stack.extend(reversed(branches))
+
+    def closure(self, states: Set[State]) -> FrozenSet[State]:
+        """`states` plus those reached by letting stars match nothing."""
+        pattern = self.pattern
+        pending = list(states)
+        while pending:
+            position, counts = pending.pop()
+            if position < len(pattern) and pattern[position] == ANY_LETTERS and (position + 1, counts) not in states:
+                states.add((position + 1, counts))
+                pending.append((position + 1, counts))
+        return frozenset(states)
+
+    def step(self, states: FrozenSet[State], letter: str) -> FrozenSet[State]:
+        pattern = self.pattern
+        following = set()
+        for position, counts in states:
+            if position == len(pattern):
+                continue
+            token = pattern[position]
+            if token in ALPHABET:
+                if token == letter:
+                    following.add((position + 1, counts))
+                continue
+            if counts is not None:
+                counts = _spend(counts, letter, token == BLANK)
+                if counts is None:
+                    continue
+            following.add((position if token == ANY_LETTERS else position + 1, counts))
+        return self.closure(following) if following else frozenset()
+
+
+def _spend(counts: Tuple[int, ...], letter: str, blank: bool) -> Optional[Tuple[int, ...]]:
+    """The rack left after playing `letter`: the letter itself if held (unless `blank`), else a blank."""
+    index = TILE_CHARS.index(letter)
+    if blank or not counts[index]:
+        index = BLANK_INDEX
+        if not counts[index]:
+            return None
+    return counts[:index] + (counts[index] - 1,) + counts[index + 1:]
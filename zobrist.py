@@ -0,0 +1,88 @@
+import random
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+from move import PlacedTile
+from tile import BLANK_CODE, LETTER_CODES, TILE_LETTERS
+
+ZOBRIST_SEED = 0x5C4AB81E
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for the parts of a position: a letter (played with a blank or
+    not) on a square, how many copies of a letter each player's rack holds, the
+    player to move and the zero-score streak. A position's hash is the XOR of the
+    keys of its parts, so a turn updates it with the keys of what the turn changed.
+    """
+
+    def __init__(self, rows: int, cols: int, players: int, max_rack_size: int, max_streak: int,
+                 seed: int = ZOBRIST_SEED) -> None:
+        rng = random.Random(seed)
+        self.cols = cols
+        self._squares = [rng.getrandbits(64) for _ in range(rows * cols * BLANK_CODE * 2)]
+        self._racks = [[[0] + [rng.getrandbits(64) for _ in range(max_rack_size)] for _ in TILE_LETTERS]
+                       for _ in range(players)]
+        self._turns = [rng.getrandbits(64) for _ in range(players)]
+        self._streaks = [rng.getrandbits(64) for _ in range(max_streak + 1)]
+
+    def square(self, row: int, col: int, letter: str, blank: bool) -> int:
+        """Key of `letter` on the square at row and column."""
+        return self._squares[((row * self.cols + col) * BLANK_CODE + LETTER_CODES[letter.upper()]) * 2 + blank]
+
+    def tiles(self, tiles: Iterable[PlacedTile]) -> int:
+        """Combined key of tiles put on the board."""
+        key = 0
+        for tile in tiles:
+            key ^= self.square(tile.row, tile.col, tile.letter, tile.blank)
+        return key
+
+    def rack(self, player: int, counts: Sequence[int]) -> int:
+        """Key of a rack holding `counts[code]` tiles of each letter code."""
+        keys = self._racks[player]
+        key = 0
+        for code, count in enumerate(counts):
+            key ^= keys[code][count]
+        return key
+
+    def rack_change(self, player: int, before: Sequence[int], after: Sequence[int]) -> int:
+        """Key turning the hash of a rack holding `before` into that of a rack holding `after`."""
+        keys = self._racks[player]
+        key = 0
+        for code, (old, new) in enumerate(zip(before, after)):
+            if old != new:
+                key ^= keys[code][old] ^ keys[code][new]
+        return key
+
+    def turn(self, player: int) -> int:
+        """Key of `player` being the one to move."""
+        return self._turns[player]
+
+    def streak(self, streak: int) -> int:
+        """Key of the zero-score streak. Streaks past the limit share the last key."""
+        return self._streaks[min(streak, len(self._streaks) - 1)]
+
+    @classmethod
+    def for_game(cls, game) -> 'ZobristKeys':
+        """Keys sized for `game`'s board, players, rack size and zero-score limit. Games of the same shape share them."""
+        rules = game.settings_manager.ruleset
+        return _shared_keys(len(game.board.board), len(game.board.board[0]), len(game.players),
+                            rules.max_rack_size, rules.zero_score_turns_before_game_end)
+
+
+@lru_cache(maxsize=16)
+def _shared_keys(rows: int, cols: int, players: int, max_rack_size: int, max_streak: int) -> ZobristKeys:
+    return ZobristKeys(rows, cols, players, max_rack_size, max_streak)
+
+
+def position_hash(game, keys: ZobristKeys) -> int:
+    """Hash `game`'s position from scratch."""
+    key = keys.turn(game.players.index(game.current_player)) ^ keys.streak(game.zero_score_streak)
+    for row, squares in enumerate(game.board.board):
+        for col, square in enumerate(squares):
+            tile = square.tile
+            if tile is not None:
+                key ^= keys.square(row, col, tile.letter, tile.value == 0)
+    for index, player in enumerate(game.players):
+        key ^= keys.rack(index, player.rack.counts)
+    return key